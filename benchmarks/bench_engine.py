@@ -0,0 +1,178 @@
+"""
+Phase 30: Engine Scaling Benchmarks.
+
+Runs standard scenarios at increasing scale and records, per case:
+ticks/sec and decisions/sec (headless), mean time per tick stage, peak traced
+memory and event-log bytes per tick. Results are written as JSON and compared
+against a stored baseline; the exit code is 1 when any case regresses.
+
+    python -m benchmarks.bench_engine --preset smoke
+    python -m benchmarks.bench_engine --preset standard --output bench.json
+    python -m benchmarks.bench_engine --preset smoke --update-baseline
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+import platform
+from typing import Dict, List, Any, Optional
+from src.scenarios import Scenarios
+from src.profiler import StageProfiler
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# name -> (factory, factory kwargs, ticks)
+PRESETS: Dict[str, Dict[str, Any]] = {
+    "smoke": {
+        "agents_10": (Scenarios.scaling, {"agents": 10, "locations": 100, "objects": 20}, 20),
+        "locations_1k": (Scenarios.scaling, {"agents": 5, "locations": 1000, "objects": 50}, 20),
+        "social_30": (Scenarios.social, {"agents": 30}, 10),
+    },
+    "standard": {
+        "agents_10": (Scenarios.scaling, {"agents": 10, "locations": 1000, "objects": 200}, 100),
+        "agents_100": (Scenarios.scaling, {"agents": 100, "locations": 1000, "objects": 200}, 50),
+        "agents_1k": (Scenarios.scaling, {"agents": 1000, "locations": 1000, "objects": 200}, 10),
+        "locations_10": (Scenarios.scaling, {"agents": 10, "locations": 10, "objects": 5}, 100),
+        "locations_10k": (Scenarios.scaling, {"agents": 10, "locations": 10_000, "objects": 500}, 100),
+        "locations_100k": (Scenarios.scaling, {"agents": 10, "locations": 100_000, "objects": 2000}, 50),
+        "objects_10k": (Scenarios.scaling, {"agents": 10, "locations": 1000, "objects": 10_000}, 50),
+        "social_200": (Scenarios.social, {"agents": 200}, 20),
+    },
+    "large": {
+        "agents_10k": (Scenarios.scaling, {"agents": 10_000, "locations": 10_000, "objects": 2000}, 5),
+        "locations_1m": (Scenarios.scaling, {"agents": 10, "locations": 1_000_000, "objects": 10_000}, 20),
+        "social_1k": (Scenarios.social, {"agents": 1000, "width": 10, "height": 10}, 10),
+    },
+}
+
+# metric -> +1 if bigger is better, -1 if smaller is better
+COMPARED_METRICS = {"ticks_per_sec": +1, "peak_memory_bytes": -1, "log_bytes_per_tick": -1}
+
+def run_case(factory, params: Dict[str, Any], ticks: int, seed: int = 42,
+             measure_memory: bool = True, measure_log: bool = True) -> Dict[str, Any]:
+    """Runs one case in three passes so the instruments don't skew each other."""
+    result: Dict[str, Any] = {"params": params, "ticks": ticks}
+
+    # 1. Throughput + per-stage time (headless, profiler only)
+    profiler = StageProfiler()
+    sim = factory(seed=seed, log_path=os.devnull, headless=True, profiler=profiler, **params)
+    start = time.perf_counter()
+    for _ in range(ticks):
+        sim.tick()
+    elapsed = time.perf_counter() - start
+    result["ticks_run"] = sim.tick_count
+    result["ticks_per_sec"] = sim.tick_count / elapsed if elapsed > 0 else 0.0
+    result["decisions_per_sec"] = sim.metrics["decisions"] / elapsed if elapsed > 0 else 0.0
+    result["stage_mean_us"] = {stage: st["mean_us"] for stage, st in profiler.stats().items()}
+    result["stage_total_s"] = {stage: st["total_s"] for stage, st in profiler.stats().items()}
+    sim.close()
+
+    # 2. Peak memory (scenario build + ticks)
+    if measure_memory:
+        tracemalloc.start()
+        sim = factory(seed=seed, log_path=os.devnull, headless=True, **params)
+        for _ in range(ticks):
+            sim.tick()
+        result["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        sim.close()
+
+    # 3. Event-log volume
+    if measure_log:
+        fd, log_path = tempfile.mkstemp(suffix=".jsonl")
+        os.close(fd)
+        try:
+            sim = factory(seed=seed, log_path=log_path, **params)
+            for _ in range(ticks):
+                sim.tick()
+            result["log_bytes_per_tick"] = os.path.getsize(log_path) / max(1, sim.tick_count)
+            sim.close()
+        finally:
+            os.remove(log_path)
+    return result
+
+def run_preset(preset: str, cases: Optional[List[str]] = None, ticks: Optional[int] = None,
+               measure_memory: bool = True, measure_log: bool = True, out=sys.stdout) -> Dict[str, Any]:
+    results = {}
+    for name, (factory, params, default_ticks) in PRESETS[preset].items():
+        if cases and name not in cases:
+            continue
+        results[name] = run_case(factory, params, ticks or default_ticks,
+                                 measure_memory=measure_memory, measure_log=measure_log)
+        if out:
+            r = results[name]
+            out.write(f"{name:<16}{r['ticks_per_sec']:>10.1f} ticks/s {r['decisions_per_sec']:>10.1f} dec/s"
+                      f"{r.get('peak_memory_bytes', 0) / 1e6:>9.1f} MB {r.get('log_bytes_per_tick', 0):>10.0f} log B/tick\n")
+    return {
+        "preset": preset,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cases": results,
+    }
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.25) -> List[str]:
+    """Returns one message per metric that is worse than baseline by more than tolerance."""
+    regressions = []
+    base_cases = baseline.get("cases", {})
+    for name, current in results["cases"].items():
+        base = base_cases.get(name)
+        if not base:
+            continue
+        for metric, direction in COMPARED_METRICS.items():
+            if metric not in current or not base.get(metric):
+                continue
+            ratio = current[metric] / base[metric]
+            worse = ratio < 1 - tolerance if direction > 0 else ratio > 1 + tolerance
+            if worse:
+                regressions.append(f"{name}.{metric}: {current[metric]:.1f} vs baseline {base[metric]:.1f} ({ratio:.2f}x)")
+    return regressions
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Simulation engine scaling benchmarks")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="smoke")
+    parser.add_argument("--cases", nargs="*", help="Run only these case names")
+    parser.add_argument("--ticks", type=int, help="Override ticks per case")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--update-baseline", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass")
+    parser.add_argument("--no-log", action="store_true", help="Skip the event-log pass")
+    args = parser.parse_args(argv)
+
+    results = run_preset(args.preset, args.cases, args.ticks,
+                         measure_memory=not args.no_memory, measure_log=not args.no_log)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline.setdefault("presets", {})[args.preset] = results
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2)
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline found; skipping comparison.")
+        return 0
+    with open(args.baseline) as f:
+        stored = json.load(f).get("presets", {}).get(args.preset)
+    if not stored:
+        print(f"No baseline for preset '{args.preset}'; skipping comparison.")
+        return 0
+    regressions = compare(results, stored, args.tolerance)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    if not regressions:
+        print("No regressions against baseline.")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,47 @@
+"""
+Planner debugging & microbenchmark CLI (Phase 31).
+
+    python debug_planner.py                       # original 5-room demo
+    python debug_planner.py bench --kind grid --nodes 10000 --calls 50
+    python debug_planner.py bench --kind random --nodes 100000 --food 0.001 --stale 0.1 --json out.json
+
+Generates synthetic cognitive maps (chain, grid, random graph) with configurable
+densities of FOOD, COOP_FOOD, OBSTACLE, TOOL and stale entries, times
+AgentPlanner.generate_plan per call (percentiles + peak memory; "warm" repeats the
+call on the same agent, i.e. a plan-cache hit) and checks every
+plan against a reference BFS: each step must follow a known edge and the plan
+must be a shortest path to the room it ends in.
+
+Phase 37: --mode weighted benches the Dijkstra planner (--hazard sets the density
+of known HAZARD rooms); plans are then checked against a reference Dijkstra over
+AgentPlanner.step_cost instead of hop counts.
+
+Phase 38: --mode hierarchical benches region planning; its plans only have to be
+valid walks (they may be longer than the shortest), and "stretch" reports how much
+longer they are. "moved" times a call after the same agent stepped to a neighboring
+room (plan cache miss, map-side caches kept).
+
+Cold calls (p50/p90/p99) are plan-cache misses of an agent whose MapIndex is in
+place, as in a simulation, where the index grows with the map one room at a time.
+A map handed over whole has to be indexed once first (O(rooms)); "index" reports
+that build (with the RegionMap in hierarchical mode) on its own.
+
+Phase 40: --budget N caps the rooms settled per call (AgentPlanner.BUDGET). Each
+plan is then resumed call by call until it completes; p50/p90/p99 cover all calls
+of a plan, "slices" is the mean number of calls and "slice max" the longest one.
+"""
+import sys
+import json
+import heapq
+import time
+import random
+import argparse
+import tracemalloc
+from collections import deque
+from typing import Dict, List, Any, Optional
 from src.agent_planner import AgentPlanner
+from src.map_index import MapIndex
+from src.region_map import RegionMap
 from src.entity import Agent
 from src.physics import ActionType
 
@@ -11,7 +54,7 @@ def test():
         "D": {"neighbors": ["C", "E"]},
         "E": {"neighbors": ["D"], "objects": ["FOOD"]}
     }
-    
+
     print("Testing Planner...")
     plan = AgentPlanner.generate_plan(agent)
     print(f"Plan Result: {plan}")
@@ -20,5 +63,259 @@ def test():
     else:
         print("Plan is empty.")
 
+# --- Synthetic maps ---
+
+def make_edges(kind: str, nodes: int, rng: random.Random, degree: float = 3.0) -> Dict[str, List[str]]:
+    """Undirected room graph as adjacency lists. Room IDs are L0..L{n-1}."""
+    adj: Dict[str, List[str]] = {f"L{i}": [] for i in range(nodes)}
+    def link(a: int, b: int):
+        adj[f"L{a}"].append(f"L{b}")
+        adj[f"L{b}"].append(f"L{a}")
+
+    if kind == "chain":
+        for i in range(nodes - 1):
+            link(i, i + 1)
+    elif kind == "grid":
+        width = max(1, int(nodes ** 0.5))
+        for i in range(nodes):
+            if (i + 1) % width and i + 1 < nodes:
+                link(i, i + 1)
+            if i + width < nodes:
+                link(i, i + width)
+    elif kind == "random":
+        # Random spanning tree keeps it connected, then extra edges up to the target degree
+        for i in range(1, nodes):
+            link(i, rng.randrange(i))
+        extra = int(max(0.0, degree / 2 - 1) * nodes)
+        for _ in range(extra):
+            a, b = rng.randrange(nodes), rng.randrange(nodes)
+            if a != b and f"L{b}" not in adj[f"L{a}"]:
+                link(a, b)
+    else:
+        raise ValueError(f"Unknown map kind: {kind}")
+    return adj
+
+def make_map(kind: str, nodes: int, seed: int = 0, food: float = 0.01, coop_food: float = 0.002,
+             obstacle: float = 0.002, tool: float = 0.002, stale: float = 0.0, degree: float = 3.0,
+             unexplored: float = 0.0, hazard: float = 0.0, now: int = 1000) -> Dict[str, Dict[str, Any]]:
+    """
+    Cognitive map over a synthetic graph. Densities are per-room probabilities.
+    unexplored: fraction of rooms left out of the map (they become frontiers).
+    """
+    rng = random.Random(seed)
+    adj = make_edges(kind, nodes, rng, degree)
+    cmap: Dict[str, Dict[str, Any]] = {}
+    for loc, neighbors in adj.items():
+        if loc != "L0" and unexplored and rng.random() < unexplored:
+            continue
+        objects, tools, obstacles = [], [], []
+        if rng.random() < food: objects.append("FOOD")
+        if rng.random() < coop_food: objects.append("COOP_FOOD")
+        if rng.random() < tool:
+            objects.append("TOOL")
+            tools.append({"id": f"Tool_{loc}", "tool_type": rng.choice(["KEY", "LEVER"])})
+        if rng.random() < obstacle:
+            objects.append("OBSTACLE")
+            obstacles.append({"id": f"Gate_{loc}", "tool_required": rng.choice(["KEY", "LEVER", None]), "required_agents": 1})
+        if hazard and rng.random() < hazard: objects.append("HAZARD")
+        cmap[loc] = {
+            "neighbors": list(neighbors), "objects": objects,
+            "metadata": {"tools": tools, "obstacles": obstacles},
+            "last_tick": 0 if rng.random() < stale else now,
+        }
+    return cmap
+
+# --- Reference check ---
+
+def reference_distances(agent: Agent) -> Dict[str, int]:
+    """Plain BFS hop distances over the agent's map with the planner's safety filter."""
+    cmap = agent.cognitive_map
+    dist = {agent.location_id: 0}
+    queue = deque([agent.location_id])
+    while queue:
+        cur = queue.popleft()
+        for n in cmap.get(cur, {}).get("neighbors", []):
+            if n not in dist and agent.reflection_score.get(n, 0.0) >= -0.5:
+                dist[n] = dist[cur] + 1
+                queue.append(n)
+    return dist
+
+def reference_costs(agent: Agent) -> Dict[str, float]:
+    """Plain Dijkstra over AgentPlanner.step_cost with the planner's safety filter."""
+    cmap = agent.cognitive_map
+    dist: Dict[str, float] = {}
+    heap = [(0.0, agent.location_id)]
+    while heap:
+        d, cur = heapq.heappop(heap)
+        if cur in dist:
+            continue
+        dist[cur] = d
+        for n in cmap.get(cur, {}).get("neighbors", []):
+            if n not in dist and agent.reflection_score.get(n, 0.0) >= -0.5:
+                heapq.heappush(heap, (d + AgentPlanner.step_cost(agent, n), n))
+    return dist
+
+def check_plan(agent: Agent, plan: List[Any], dist: Dict[str, float], weighted: bool = False,
+               exact: bool = True) -> Optional[str]:
+    """
+    Returns None if the plan is a valid shortest (cheapest, if weighted) path to its end,
+    else a reason. exact=False only checks that it is a valid walk.
+    """
+    if not plan:
+        return None
+    cmap = agent.cognitive_map
+    here = agent.location_id
+    cost = 0.0
+    for action in plan:
+        if action.type != ActionType.MOVE:
+            return f"non-MOVE step {action.type.name}"
+        if action.target_id not in cmap.get(here, {}).get("neighbors", []):
+            return f"no known edge {here}->{action.target_id}"
+        here = action.target_id
+        cost += AgentPlanner.step_cost(agent, here) if weighted else 1
+    if here not in dist or (exact and abs(dist[here] - cost) > 1e-9):
+        if weighted:
+            return f"cost {cost:g} to {here}, cheapest is {dist.get(here)}"
+        return f"length {len(plan)} to {here}, shortest is {dist.get(here)}"
+    return None
+
+# --- Benchmark ---
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+def bench(kind: str, nodes: int, calls: int = 20, seed: int = 0, check: bool = True, mode: str = "bfs",
+          budget: Optional[int] = None, **densities) -> Dict[str, Any]:
+    previous_mode, AgentPlanner.MODE = AgentPlanner.MODE, mode
+    previous_budget, AgentPlanner.BUDGET = AgentPlanner.BUDGET, budget
+    build_start = time.perf_counter()
+    cmap = make_map(kind, nodes, seed=seed, **densities)
+    build_time = time.perf_counter() - build_start
+    rng = random.Random(seed + 1)
+    starts = [rng.choice(list(cmap)) for _ in range(calls)]
+
+    def make_agent(start: str) -> Agent:
+        agent = Agent(id="Bench", location_id=start, energy=100)
+        agent.cognitive_map = cmap
+        agent.last_tick_updated = densities.get("now", 1000)
+        return agent
+
+    # 1. Timing
+    timings, warm_timings, moved_timings, plan_lengths, stretches, failures = [], [], [], [], [], []
+    index_timings, slices, slice_max = [], [], 0.0
+    for start in starts:
+        agent = make_agent(start)
+        t0 = time.perf_counter()
+        MapIndex.get(agent) # One-time build for a map that arrived whole
+        if mode == "hierarchical":
+            RegionMap.get(agent, set())
+        index_timings.append(time.perf_counter() - t0)
+        total, count = 0.0, 0
+        while True:
+            t0 = time.perf_counter()
+            plan = AgentPlanner.generate_plan(agent)
+            elapsed = time.perf_counter() - t0
+            total, count, slice_max = total + elapsed, count + 1, max(slice_max, elapsed)
+            if not AgentPlanner.pending(agent): # Phase 40: resume until the search completes
+                break
+        timings.append(total)
+        slices.append(count)
+        plan_lengths.append(len(plan))
+        # Phase 35: Same agent, same map version -> plan cache hit
+        t0 = time.perf_counter()
+        AgentPlanner.generate_plan(agent)
+        warm_timings.append(time.perf_counter() - t0)
+        if check:
+            dist = reference_costs(agent) if mode == "weighted" else reference_distances(agent)
+            reason = check_plan(agent, plan, dist, weighted=mode == "weighted", exact=mode != "hierarchical")
+            if reason:
+                failures.append({"start": start, "reason": reason})
+            elif plan:
+                stretches.append(len(plan) / max(1, dist[plan[-1].target_id]))
+        # Phase 38: Same agent, one step on -> plan cache miss, map-side caches kept
+        agent.location_id = (cmap[start]["neighbors"] or [start])[0]
+        t0 = time.perf_counter()
+        AgentPlanner.generate_plan(agent)
+        moved_timings.append(time.perf_counter() - t0)
+
+    # 2. Peak memory of a single call
+    agent = make_agent(starts[0])
+    tracemalloc.start()
+    AgentPlanner.generate_plan(agent)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    AgentPlanner.MODE = previous_mode
+    AgentPlanner.BUDGET = previous_budget
+
+    timings.sort()
+    warm_timings.sort()
+    moved_timings.sort()
+    index_timings.sort()
+    return {
+        "kind": kind, "mode": mode, "budget": budget, "nodes": nodes, "map_entries": len(cmap), "calls": calls,
+        "build_s": build_time,
+        "p50_ms": percentile(timings, 0.50) * 1e3,
+        "p90_ms": percentile(timings, 0.90) * 1e3,
+        "p99_ms": percentile(timings, 0.99) * 1e3,
+        "max_ms": timings[-1] * 1e3,
+        "warm_p50_ms": percentile(warm_timings, 0.50) * 1e3,
+        "mean_slices": sum(slices) / len(slices),
+        "slice_max_ms": slice_max * 1e3,
+        "moved_p50_ms": percentile(moved_timings, 0.50) * 1e3,
+        "index_p50_ms": percentile(index_timings, 0.50) * 1e3,
+        "mean_stretch": sum(stretches) / len(stretches) if stretches else 1.0,
+        "mean_plan_length": sum(plan_lengths) / len(plan_lengths),
+        "peak_memory_bytes": peak,
+        "checked": check, "failures": failures,
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="AgentPlanner debugging and microbenchmarks")
+    sub = parser.add_subparsers(dest="command")
+    sub.add_parser("demo", help="Original 5-room example (default)")
+    b = sub.add_parser("bench", help="Time generate_plan on synthetic maps")
+    b.add_argument("--kind", choices=["chain", "grid", "random"], default="grid")
+    b.add_argument("--nodes", type=int, nargs="+", default=[1000])
+    b.add_argument("--calls", type=int, default=20)
+    b.add_argument("--seed", type=int, default=0)
+    b.add_argument("--degree", type=float, default=3.0, help="Average degree for random graphs")
+    b.add_argument("--food", type=float, default=0.01)
+    b.add_argument("--coop-food", type=float, default=0.002)
+    b.add_argument("--obstacle", type=float, default=0.002)
+    b.add_argument("--tool", type=float, default=0.002)
+    b.add_argument("--stale", type=float, default=0.0)
+    b.add_argument("--unexplored", type=float, default=0.0)
+    b.add_argument("--hazard", type=float, default=0.0)
+    b.add_argument("--budget", type=int, help="AgentPlanner.BUDGET (rooms settled per call)")
+    b.add_argument("--mode", choices=["bfs", "weighted", "hierarchical"], default="bfs", help="AgentPlanner.MODE")
+    b.add_argument("--no-check", action="store_true", help="Skip the reference shortest-path check")
+    b.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args(argv)
+
+    if args.command != "bench":
+        test()
+        return 0
+
+    results = []
+    for n in args.nodes:
+        r = bench(args.kind, n, calls=args.calls, seed=args.seed, check=not args.no_check, mode=args.mode,
+                  budget=args.budget,
+                  food=args.food, coop_food=args.coop_food, obstacle=args.obstacle, tool=args.tool,
+                  stale=args.stale, degree=args.degree, unexplored=args.unexplored, hazard=args.hazard)
+        results.append(r)
+        print(f"{r['kind']:<7}{r['nodes']:>8} nodes | p50 {r['p50_ms']:8.2f} ms | p90 {r['p90_ms']:8.2f} ms | "
+              f"p99 {r['p99_ms']:8.2f} ms | warm p50 {r['warm_p50_ms']:7.2f} ms | moved p50 {r['moved_p50_ms']:7.2f} ms | index p50 {r['index_p50_ms']:7.2f} ms | peak {r['peak_memory_bytes'] / 1e6:7.2f} MB | "
+              f"plan {r['mean_plan_length']:6.1f} (stretch {r['mean_stretch']:.2f}) | check failures {len(r['failures'])}")
+        if r["budget"] is not None:
+            print(f"    budget {r['budget']}: {r['mean_slices']:.1f} calls per plan, slice max {r['slice_max_ms']:.2f} ms")
+        for failure in r["failures"][:5]:
+            print(f"    {failure['start']}: {failure['reason']}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    return 1 if any(r["failures"] for r in results) else 0
+
 if __name__ == "__main__":
-    test()
+    sys.exit(main())
@@ -1,14 +1,21 @@
 import time
-from typing import List, Dict, Any, Optional
+from collections.abc import Mapping
+from typing import List, Dict, Any, Optional, Tuple
 from src.entity import Agent
 from src.world import World
 from src.agent_social import AgentSocial
 from src.agent_meta import AgentMeta
+from src.cognitive_map import CognitiveMap
+from src.shared_map import SharedCognitiveMap
 
 class AgentCommunication:
     """
     Handles message passing and cognitive map updates.
+    Phase 46: Map updates are deltas: each sender remembers its map_version when it last
+    sent to a peer and next time sends only the rooms changed since (see share_map).
     """
+
+    DELTA_SYNC = True # False: every MAP_UPDATE carries the whole map
     
     @staticmethod
     def broadcast(world: World, sender: Agent, receivers: List[Agent], payload: Dict[str, Any], msg_type: str = "MAP_UPDATE"):
@@ -26,6 +33,48 @@ class AgentCommunication:
              if receiver.id != sender.id:
                  receiver.message_queue.append(message)
 
+    @staticmethod
+    def share_map(world: World, sender: Agent, receivers: List[Agent]) -> Tuple[int, int]:
+        """
+        Phase 46: Sends each receiver a MAP_UPDATE with the rooms the sender changed since
+        it last sent to that receiver; the whole map on first contact (or with DELTA_SYNC
+        off). Receivers last sent to at the same version share one payload.
+        Returns (rooms sent, rooms full-map sends would have carried).
+        """
+        cmap = sender.cognitive_map
+        payloads = {}
+        sent = full = 0
+        for receiver in receivers:
+            if receiver.id == sender.id:
+                continue
+            since = sender.map_sent.get(receiver.id) if AgentCommunication.DELTA_SYNC else None
+            payload = payloads.get(since)
+            if payload is None:
+                payload = payloads[since] = cmap if since is None else AgentCommunication.map_delta(sender, since)
+            AgentCommunication.broadcast(world, sender, [receiver], payload)
+            sender.map_sent[receiver.id] = sender.map_version
+            sent += len(payload)
+            full += len(cmap)
+        sender.map_rooms_sent += sent
+        return sent, full
+
+    @staticmethod
+    def map_delta(agent: Agent, since: int) -> Dict[str, Any]:
+        """Phase 46: The agent's rooms changed after map_version `since`, in change order."""
+        changed = []
+        for loc_id, version in reversed(agent.map_changes.items()):
+            if version <= since:
+                break
+            changed.append(loc_id)
+        changed.reverse()
+        cmap = agent.cognitive_map
+        if isinstance(cmap, SharedCognitiveMap): # Entries travel by reference, frozen (Phase 45)
+            delta = SharedCognitiveMap()
+            for loc_id in changed:
+                delta.adopt(loc_id, cmap.share(loc_id))
+            return delta
+        return {loc_id: cmap[loc_id] for loc_id in changed}
+
     @staticmethod
     def process_messages(agent: Agent) -> int:
         """
@@ -54,13 +103,10 @@ class AgentCommunication:
                 trust = agent.trust_scores.get(sender_id, AgentSocial.INITIAL_TRUST)
                 if trust >= AgentSocial.INITIAL_TRUST and loc:
                     # Update map to know food is there
-                    if loc not in agent.cognitive_map:
-                         agent.cognitive_map[loc] = {"neighbors": [], "objects": []}
-                    if "COOP_FOOD" not in agent.cognitive_map[loc]["objects"]:
-                         agent.cognitive_map[loc]["objects"].append("COOP_FOOD")
+                    CognitiveMap.add_object(agent, loc, "COOP_FOOD")
                     
                     # Phase 16: Remember who requested help
-                    agent.cognitive_map[loc]["requester_id"] = sender_id
+                    CognitiveMap.set_field(agent, loc, "requester_id", sender_id)
                     
                     # Also boost reflection score to encourage going there
                     AgentMeta.update_score(agent, loc, 1.0)
@@ -71,15 +117,12 @@ class AgentCommunication:
                 trust = agent.trust_scores.get(sender_id, AgentSocial.INITIAL_TRUST)
                 if trust >= AgentSocial.INITIAL_TRUST and loc:
                     # Update map to know obstacle is there
-                    if loc not in agent.cognitive_map:
-                         agent.cognitive_map[loc] = {"neighbors": [], "objects": []}
-                    if "OBSTACLE" not in agent.cognitive_map[loc]["objects"]:
-                         agent.cognitive_map[loc]["objects"].append("OBSTACLE")
+                    CognitiveMap.add_object(agent, loc, "OBSTACLE")
                     
                     # Store requester and metadata (if any)
-                    agent.cognitive_map[loc]["requester_id"] = sender_id
+                    CognitiveMap.set_field(agent, loc, "requester_id", sender_id)
                     if "metadata" in payload:
-                         agent.cognitive_map[loc]["metadata"] = payload["metadata"]
+                         CognitiveMap.set_field(agent, loc, "metadata", payload["metadata"])
                     
                     # Boost score to entice social goal
                     AgentMeta.update_score(agent, loc, 1.5) # Even higher than food!
@@ -98,18 +141,12 @@ class AgentCommunication:
                         # Mark location as dangerous in Meta
                         AgentMeta.update_score(agent, loc, -1.5) # Strong penalty
                         # Update map if possible (add 'HAZARD' tag if not present)
-                        if loc not in agent.cognitive_map:
-                             agent.cognitive_map[loc] = {"neighbors": [], "objects": []}
-                        if "HAZARD" not in agent.cognitive_map[loc]["objects"]:
-                             agent.cognitive_map[loc]["objects"].append("HAZARD")
+                        CognitiveMap.add_object(agent, loc, "HAZARD")
                              
                     elif topic == "FOOD":
                         # Mark location as good
                         AgentMeta.update_score(agent, loc, 0.5)
-                        if loc not in agent.cognitive_map:
-                             agent.cognitive_map[loc] = {"neighbors": [], "objects": []}
-                        if "FOOD" not in agent.cognitive_map[loc]["objects"]:
-                             agent.cognitive_map[loc]["objects"].append("FOOD")
+                        CognitiveMap.add_object(agent, loc, "FOOD")
 
                     # Retain story as Hearsay (prevent loops? check if we have it)
                     # We accept it as our own truth to retell
@@ -122,7 +159,7 @@ class AgentCommunication:
                 trust_boost = 0.05
                 # Phase 11: Reward high-value info (Food discovery)
                 for loc_id, info in payload.items():
-                    if isinstance(info, dict):
+                    if isinstance(info, Mapping): # Phase 44: entries of a CompactCognitiveMap too
                         objs = info.get("objects", [])
                         if "FOOD" in objs or "ObjectType.FOOD" in objs:
                             known_objs = agent.cognitive_map.get(loc_id, {}).get("objects", [])
@@ -133,7 +170,10 @@ class AgentCommunication:
             
             # Map merging logic (Only if type is MAP_UPDATE)
             if msg_type == "MAP_UPDATE":
+                start = time.perf_counter()
                 AgentCommunication._merge_map(agent, payload)
+                agent.map_merge_seconds += time.perf_counter() - start
+                agent.map_rooms_merged += len(payload)
         
         agent.message_queue.clear()
         return count
@@ -145,22 +185,42 @@ class AgentCommunication:
         Strategy: Additive merge. Unknown locations are added.
         Known locations are updated if info seems richer (e.g. has objects).
         """
-        for loc_id, info in new_data.items():
-            if loc_id not in agent.cognitive_map:
-                agent.cognitive_map[loc_id] = info
+        cmap = agent.cognitive_map
+        # Phase 45: Between shared maps, entries move by reference (frozen on both sides)
+        shared = isinstance(cmap, SharedCognitiveMap) and isinstance(new_data, SharedCognitiveMap)
+        for loc_id, info in (new_data.entries if shared else new_data).items():
+            if loc_id not in cmap:
+                if shared:
+                    cmap.adopt(loc_id, new_data.share(loc_id))
+                else:
+                    # Phase 36: Copy, never alias the sender's entry (its later writes would
+                    # change this map behind its version counter and index)
+                    cmap[loc_id] = CognitiveMap.copy_entry(info)
+                CognitiveMap.touch(agent, loc_id)
             else:
                 # Merge logic
                 # For now, simplistic: Union of neighbors
-                current = agent.cognitive_map[loc_id]
+                current = cmap.entries[loc_id] if shared else cmap[loc_id]
+                if current is info:
+                    continue # Same shared entry: nothing to learn
                 
-                # Update neighbors
+                # Update neighbors (only rewritten when the union actually grows)
+                # Known neighbors keep their order, new ones follow in the sender's order
                 new_neighbors = info.get("neighbors", [])
                 if new_neighbors:
-                    current_neighbors = set(current.get("neighbors", []))
-                    current_neighbors.update(new_neighbors)
-                    current["neighbors"] = list(current_neighbors)
+                    current_neighbors = current.get("neighbors", [])
+                    known = set(current_neighbors)
+                    added = [n for n in dict.fromkeys(new_neighbors) if n not in known]
+                    if added:
+                        CognitiveMap.writable(agent, loc_id)["neighbors"] = list(current_neighbors) + added
+                        CognitiveMap.touch(agent, loc_id)
                 
                 # Update objects (overwrite if present in update)
                 # Note: This is imperfect (what if object removed?), but consistent with "sharing what I see"
-                if "objects" in info:
-                    current["objects"] = info["objects"]
+                if "objects" in info and current.get("objects") != info["objects"]:
+                    CognitiveMap.writable(agent, loc_id)["objects"] = list(info["objects"])
+                    CognitiveMap.touch(agent, loc_id)
+
+                # Phase 45: Now equal to the sender's entry: keep one copy between us
+                if shared and cmap.entries[loc_id] == info:
+                    cmap.adopt(loc_id, new_data.share(loc_id))
@@ -2,6 +2,7 @@ from enum import Enum, auto
 from dataclasses import dataclass
 from typing import List, Optional, Dict, Any
 from src.entity import Agent
+from src.profiler import StageProfiler
 
 class GoalType(Enum):
     SURVIVAL = auto()
@@ -58,6 +59,7 @@ class GoalManager:
         return goals
 
     @staticmethod
+    @StageProfiler.timed("decide.goal")
     def select_top_goal(agent: Agent, perception: Dict[str, Any]) -> Goal:
         goals = GoalManager.evaluate_goals(agent, perception)
         return goals[0] if goals else Goal(GoalType.EXPLORE, 0)
@@ -1,6 +1,12 @@
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 from src.physics import Physics, Action, ActionType
+from src.profiler import StageProfiler
+
+try:
+    import numpy as np
+except ImportError: # Batches fall back to plain lists
+    np = None
 
 @dataclass
 class SimulatedState:
@@ -8,11 +14,63 @@ class SimulatedState:
     location_id: str
     alive: bool
 
+@dataclass
+class BatchImagination:
+    """
+    Phase 43: Outcomes of a batch of imagined plans, one row per plan.
+    energy[i][t] is the energy after t steps of plan i (held once it stops);
+    NumPy arrays when NumPy is in use, else lists.
+    """
+    energy: Any
+    final: Any
+    dead: Any
+    stalled: Any
+    lengths: Any
+
+    def safe(self, survival_threshold: float = 5.0) -> List[bool]:
+        """Per plan, the is_plan_safe verdict (empty plans are always safe)."""
+        return [length == 0 or (not dead and final >= survival_threshold)
+                for length, dead, final in zip(self.lengths, self.dead, self.final)]
+
+class PlanProfile:
+    """
+    Phase 42: Energy profile of a plan, relative to its start.
+    prefix[t] is the energy change after t steps; low[t] / move_low[t] are the lowest
+    point reached and the lowest energy before a MOVE over steps t+1..n. Any suffix
+    plan[t:] is then judged in O(1) from the energy the agent has when it starts it.
+    """
+    __slots__ = ("plan", "steps", "prefix", "low", "move_low")
+
+    def __init__(self, plan: List[Action]):
+        self.plan = plan # The list this was built for (plan_queue pops from its front)
+        self.steps = list(plan)
+        n = len(plan)
+        self.prefix = [0.0] * (n + 1)
+        for t, action in enumerate(plan):
+            self.prefix[t + 1] = self.prefix[t] - Physics.METABOLISM_COST + ForwardModel._delta(action)
+        self.low = [float("inf")] * (n + 1)
+        self.move_low = [float("inf")] * (n + 1)
+        for t in range(n - 1, -1, -1):
+            before = self.prefix[t] - Physics.METABOLISM_COST
+            self.low[t] = min(self.low[t + 1], before, self.prefix[t + 1])
+            self.move_low[t] = min(self.move_low[t + 1], before) if plan[t].type == ActionType.MOVE else self.move_low[t + 1]
+
+    def offset(self, plan: List[Action]) -> Optional[int]:
+        """Index where plan starts within the profiled one, if plan is still a suffix of it."""
+        skipped = len(self.steps) - len(plan)
+        if plan is not self.plan or skipped < 0 or not plan:
+            return None
+        if plan[0] is not self.steps[skipped] or plan[-1] is not self.steps[-1]:
+            return None
+        return skipped
+
 class ForwardModel:
     """
     Phase 9: Internal Simulation & Forward Modeling.
     Allows an agent to predict outcomes of action sequences locally.
     """
+
+    CONSUME_GAIN = 50 # Imagined energy from eating (average food value)
     
     @staticmethod
     def simulate_plan(agent, plan: List[Action]) -> List[SimulatedState]:
@@ -47,7 +105,7 @@ class ForwardModel:
                 # or look up the specific object if possible.
                 # For simplicity in 'imagination', we assume successful consumption
                 # if the agent has it in its plan.
-                current_energy += 50 
+                current_energy += ForwardModel.CONSUME_GAIN
             elif action.type == ActionType.COMMUNICATE:
                 current_energy -= Physics.COMM_COST
                 
@@ -58,13 +116,55 @@ class ForwardModel:
         return states
 
     @staticmethod
+    def _delta(action: Action) -> float:
+        """Imagined energy change of an action, metabolism excluded."""
+        if action.type == ActionType.MOVE:
+            return -Physics.MOVE_COST
+        if action.type == ActionType.CONSUME:
+            return ForwardModel.CONSUME_GAIN
+        if action.type == ActionType.COMMUNICATE:
+            return -Physics.COMM_COST
+        return 0
+
+    @staticmethod
+    @StageProfiler.timed("decide.imagine")
     def is_plan_safe(agent, plan: List[Action], survival_threshold: float = 5.0) -> bool:
         """
         Heuristic: Is the plan likely to kill the agent or leave it critically weak?
+        Phase 42: Judged from energy sums rather than a simulated trace. Multi-step plans
+        keep their profile on the agent, so re-checking the executing plan each tick is
+        O(1). Plans where a MOVE would stall for lack of energy take the traced path.
         """
         if not plan:
             return True
-            
+        if not agent.is_alive:
+            return False
+        energy = agent.energy
+        if len(plan) == 1: # Single steps (e.g. each neighbor in _choose_move): nothing to memoize
+            energy -= Physics.METABOLISM_COST
+            if energy <= 0:
+                return False
+            delta = ForwardModel._delta(plan[0])
+            if plan[0].type == ActionType.MOVE and energy < Physics.MOVE_COST:
+                delta = 0 # Stalls in place
+            energy += delta
+            return energy > 0 and energy >= survival_threshold
+
+        profile = agent.plan_profile
+        start = profile.offset(plan) if profile else None
+        if start is None:
+            profile = agent.plan_profile = PlanProfile(plan)
+            start = 0
+        base = energy - profile.prefix[start]
+        if base + profile.move_low[start] < Physics.MOVE_COST:
+            return ForwardModel._traced_safety(agent, plan, survival_threshold)
+        if base + profile.low[start] <= 0:
+            return False
+        return base + profile.prefix[-1] >= survival_threshold
+
+    @staticmethod
+    def _traced_safety(agent, plan: List[Action], survival_threshold: float) -> bool:
+        """Phase 9 check over the full simulate_plan trace."""
         results = ForwardModel.simulate_plan(agent, plan)
         
         # Check if any step leads to death
@@ -77,3 +177,118 @@ class ForwardModel:
             return False
             
         return True
+
+    # --- Phase 43: Batched Imagination ---
+
+    PAD = -1 # Action code past the end of a plan
+    ACTION_CODES = {action_type: code for code, action_type in enumerate(ActionType)}
+    USE_NUMPY = np is not None
+    NUMPY_MIN_ROWS = 128 # Smaller batches run faster as pure-Python rows
+
+    @staticmethod
+    def encode(plans: List[List[Action]], width: Optional[int] = None):
+        """Padded action-code matrix for a batch of plans (rows padded with PAD)."""
+        width = max((len(p) for p in plans), default=0) if width is None else width
+        codes = [[ForwardModel.ACTION_CODES[a.type] for a in plan[:width]] + [ForwardModel.PAD] * (width - len(plan))
+                 for plan in plans]
+        if ForwardModel.USE_NUMPY and len(plans) >= ForwardModel.NUMPY_MIN_ROWS:
+            return np.array(codes, dtype=np.int64).reshape(len(plans), width)
+        return codes
+
+    @staticmethod
+    def _delta_table() -> List[float]:
+        return [ForwardModel._delta(Action(action_type)) for action_type in ActionType]
+
+    @staticmethod
+    def imagine_batch(energies: List[float], codes, alive: Optional[List[bool]] = None) -> BatchImagination:
+        """
+        Runs simulate_plan's rules over every row of an encoded batch at once: rows may
+        belong to different agents (one starting energy each). Steps are taken column by
+        column across all rows; a row stops at its padding, on death or on a stalled MOVE.
+        """
+        alive = [True] * len(energies) if alive is None else alive
+        if ForwardModel.USE_NUMPY and len(energies) >= ForwardModel.NUMPY_MIN_ROWS:
+            return ForwardModel._imagine_arrays(energies, codes, alive)
+        return ForwardModel._imagine_rows(energies, codes, alive)
+
+    @staticmethod
+    def _imagine_arrays(energies, codes, alive) -> BatchImagination:
+        codes = np.asarray(codes, dtype=np.int64).reshape(len(energies), -1)
+        rows, width = codes.shape
+        delta = np.asarray(ForwardModel._delta_table(), dtype=float)[np.maximum(codes, 0)]
+        is_move = codes == ForwardModel.ACTION_CODES[ActionType.MOVE]
+        energy = np.empty((rows, width + 1))
+        energy[:, 0] = e = np.asarray(energies, dtype=float)
+        active = np.ones(rows, dtype=bool)
+        dead = ~np.asarray(alive, dtype=bool)
+        stalled = np.zeros(rows, dtype=bool)
+        for t in range(width):
+            step = active & (codes[:, t] != ForwardModel.PAD)
+            before = np.where(step, e - Physics.METABOLISM_COST, e)
+            died = step & (before <= 0)
+            stall = step & ~died & is_move[:, t] & (before < Physics.MOVE_COST)
+            go = step & ~died & ~stall
+            e = np.where(go, before + delta[:, t], before)
+            died |= go & (e <= 0)
+            dead |= died
+            stalled |= stall
+            active = go & ~died
+            energy[:, t + 1] = e
+        lengths = (codes != ForwardModel.PAD).sum(axis=1)
+        return BatchImagination(energy=energy, final=e, dead=dead, stalled=stalled, lengths=lengths)
+
+    @staticmethod
+    def _imagine_rows(energies, codes, alive) -> BatchImagination:
+        table = ForwardModel._delta_table()
+        move = ForwardModel.ACTION_CODES[ActionType.MOVE]
+        trajectories, finals, deads, stalls, lengths = [], [], [], [], []
+        for e, row, ok in zip(energies, codes, alive):
+            trajectory, dead, stalled = [e], not ok, False # Dead agents still imagine, like simulate_plan
+            for code in row:
+                if code == ForwardModel.PAD:
+                    break
+                e -= Physics.METABOLISM_COST
+                trajectory.append(e)
+                if e <= 0:
+                    dead = True
+                    break
+                if code == move and e < Physics.MOVE_COST:
+                    stalled = True
+                    break
+                e += table[code]
+                trajectory[-1] = e
+                if e <= 0:
+                    dead = True
+                    break
+            trajectory.extend([e] * (len(row) + 1 - len(trajectory)))
+            trajectories.append(trajectory)
+            finals.append(e)
+            deads.append(dead)
+            stalls.append(stalled)
+            lengths.append(sum(1 for code in row if code != ForwardModel.PAD))
+        return BatchImagination(energy=trajectories, final=finals, dead=deads, stalled=stalls, lengths=lengths)
+
+    @staticmethod
+    @StageProfiler.timed("decide.imagine")
+    def assess_plans(agent, plans: List[List[Action]], survival_threshold: float = 5.0) -> List[bool]:
+        """
+        is_plan_safe for many candidate plans of one agent. Only action types reach the
+        forward model, so plans with the same type sequence (a MOVE to each neighbor, say)
+        are judged once. One-step plans use is_plan_safe's closed form (cheaper than any
+        batch); longer ones are imagined in a single batch.
+        """
+        keys = [tuple(action.type for action in plan) for plan in plans]
+        verdicts = {}
+        longer = []
+        for key, plan in zip(keys, plans):
+            if key in verdicts:
+                continue
+            verdicts[key] = ForwardModel.is_plan_safe(agent, plan, survival_threshold) if len(plan) <= 1 else None
+            if len(plan) > 1:
+                longer.append((key, plan))
+        if longer:
+            batch = ForwardModel.imagine_batch([agent.energy] * len(longer), ForwardModel.encode([plan for _, plan in longer]),
+                                               [agent.is_alive] * len(longer))
+            for (key, _), safe in zip(longer, batch.safe(survival_threshold)):
+                verdicts[key] = safe
+        return [verdicts[key] for key in keys]
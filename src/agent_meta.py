@@ -39,6 +39,7 @@ class AgentMeta:
                 current_score = agent.reflection_score.get(loc_id, 0.0)
                 # Apply penalty
                 agent.reflection_score[loc_id] = current_score - AgentMeta.INEFFICIENCY_PENALTY
+                agent.reflection_version += 1
             # Else could slowly decay penalty (forgive)?
             
         # 3. Detect "Fruitless" exploration
@@ -55,3 +56,4 @@ class AgentMeta:
         """Phase 13: Manually update a score (e.g. from Alarms)."""
         current = agent.reflection_score.get(loc_id, 0.0)
         agent.reflection_score[loc_id] = current + delta
+        agent.reflection_version += 1
@@ -1,5 +1,5 @@
 import random
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 from src.entity import Agent, ObjectType
 from src.world import World
 from src.physics import Action, ActionType, Physics
@@ -9,6 +9,8 @@ from src.agent_social import AgentSocial
 from src.agent_goals import GoalManager, GoalType
 from src.agent_memory_pro import MemoryAnalyzer
 from src.agent_imagination import ForwardModel
+from src.cognitive_map import CognitiveMap
+from src.perception import Perception
 
 class AgentMind:
     """
@@ -20,62 +22,59 @@ class AgentMind:
     MEMORY_SIZE = 10
     
     @staticmethod
-    def perceive(world: World, agent: Agent) -> Dict[str, Any]:
+    def perceive(world: World, agent: Agent) -> Perception:
+        """
+        Phase 33: Incremental perception. A room's contents are sensed once and shared by
+        every agent in it until the World's version stamp for the room moves (in-place
+        object edits stamp it too); an agent's list of nearby agents is reused until an
+        agent enters or leaves a room in range (World.move_agent).
+        Energies, last actions and the agent's own state are read fresh every call.
+        Phase 34: Agents within world.perception_radius hops are visible (distance = hops),
+        gathered from the World's occupancy index, so cost follows the neighborhood rather
+        than the population. Objects in other rooms within world.object_radius hops are
+        reported as distant_objects and tagged on the cognitive map.
+        """
         current_loc = agent.location_id
-        objects = world.get_objects_at(current_loc)
-        visible_food = [o.id for o in objects if o.type == ObjectType.FOOD]
-        visible_hazards = [o.id for o in objects if o.type == ObjectType.HAZARD]
-        
-        visible_coop_food = []
-        for o in objects:
-            if o.type == ObjectType.COOP_FOOD:
-                visible_coop_food.append({"id": o.id, "required": o.required_agents, "value": o.value})
-        
-        visible_tools = []
-        visible_obstacles = []
-        for o in objects:
-            if o.type == ObjectType.TOOL:
-                visible_tools.append({"id": o.id, "tool_type": o.tool_type})
-            elif o.type == ObjectType.OBSTACLE:
-                visible_obstacles.append({"id": o.id, "tool_required": o.tool_required, "required_agents": o.required_agents})
-        
-        neighbors = world.get_neighbors(current_loc)
-        visible_agents = []
-        for a_id, other in world.agents.items():
-            if other.id != agent.id and other.is_alive:
-                dist = 0 if other.location_id == current_loc else (1 if other.location_id in neighbors else -1)
-                if dist >= 0:
-                    visible_agents.append({
-                        "id": other.id, "location": other.location_id, "energy": other.energy,
-                        "last_action": other.last_action, "distance": dist
-                    })
-        
-        perception = {
-            "tick": agent.last_tick_updated, "location": current_loc, "energy": agent.energy,
-            "visible_food": visible_food, "visible_hazards": visible_hazards,
-            "visible_coop_food": visible_coop_food, "visible_tools": visible_tools,
-            "visible_obstacles": visible_obstacles, "neighbors": neighbors,
-            "visited_neighbors": [n for n in neighbors if n in agent.visited_locations],
-            "visible_agents": visible_agents, "inventory": [obj.id for obj in agent.inventory]
-        }
+        room = AgentMind._room_view(world, current_loc)
+        _, visible_food, visible_hazards, visible_coop_food, visible_tools, visible_obstacles, neighbors, objs_list = room
+
+        cache = agent.perception_cache
+        if cache is None:
+            cache = agent.perception_cache = {}
+        radius = world.perception_radius
+        nearby_key = (world.uid, current_loc, radius, world.topology_version, world.occupancy_versions.get(current_loc, 0))
+        nearby = cache.get("nearby")
+        if nearby is None or nearby[0] != nearby_key:
+            found = [(other, dist) for other, dist in world.agents_near(current_loc, radius) if other is not agent]
+            nearby = cache["nearby"] = (nearby_key, found)
+        visible_agents = [{
+            "id": other.id, "location": other.location_id, "energy": other.energy,
+            "last_action": other.last_action, "distance": dist
+        } for other, dist in nearby[1] if other.is_alive]
+
+        visited = cache.get("visited")
+        if visited is None or visited[0] is not neighbors or visited[1] != len(agent.visited_locations):
+            visited = cache["visited"] = (neighbors, len(agent.visited_locations),
+                                          [n for n in neighbors if n in agent.visited_locations])
+
+        distant_objects = ()
+        if world.object_radius > 0:
+            distant_objects = AgentMind._sense_distant(world, current_loc, world.object_radius)
+            for obj in distant_objects:
+                CognitiveMap.add_object(agent, obj["location"], obj["type"])
+
+        perception = Perception(
+            agent.last_tick_updated, current_loc, agent.energy, visible_food, visible_hazards,
+            visible_coop_food, visible_tools, visible_obstacles, neighbors, visited[2],
+            visible_agents, [obj.id for obj in agent.inventory], distant_objects,
+        )
         
         agent.memory.append(perception)
         if len(agent.memory) > AgentMind.MEMORY_SIZE: agent.memory.pop(0)
         agent.visited_locations.add(current_loc)
         
-        if current_loc not in agent.cognitive_map: agent.cognitive_map[current_loc] = {}
-        objs_list = []
-        if visible_food: objs_list.append("FOOD")
-        if visible_hazards: objs_list.append("HAZARD")
-        if visible_coop_food: objs_list.append("COOP_FOOD")
-        if visible_tools: objs_list.append("TOOL")
-        if visible_obstacles: objs_list.append("OBSTACLE")
-        
-        agent.cognitive_map[current_loc].update({
-             "neighbors": neighbors, "objects": objs_list,
-             "metadata": {"tools": visible_tools, "obstacles": visible_obstacles},
-             "last_tick": agent.last_tick_updated
-        })
+        CognitiveMap.observe(agent, current_loc, neighbors, objs_list,
+                             {"tools": visible_tools, "obstacles": visible_obstacles}, agent.last_tick_updated)
 
         for va in visible_agents: AgentSocial.update_seen_agent(agent, va["id"], va)
             
@@ -92,6 +91,54 @@ class AgentMind:
         MemoryAnalyzer.update_patterns(agent, perception)
         return perception
 
+    @staticmethod
+    def _sense_room(world: World, loc: str):
+        """One pass over the room's objects. Returns the per-type lists, neighbors and map tags."""
+        visible_food, visible_hazards, visible_coop_food, visible_tools, visible_obstacles = [], [], [], [], []
+        for o in world.get_objects_at(loc):
+            if o.type == ObjectType.FOOD:
+                visible_food.append(o.id)
+            elif o.type == ObjectType.HAZARD:
+                visible_hazards.append(o.id)
+            elif o.type == ObjectType.COOP_FOOD:
+                visible_coop_food.append({"id": o.id, "required": o.required_agents, "value": o.value})
+            elif o.type == ObjectType.TOOL:
+                visible_tools.append({"id": o.id, "tool_type": o.tool_type})
+            elif o.type == ObjectType.OBSTACLE:
+                visible_obstacles.append({"id": o.id, "tool_required": o.tool_required, "required_agents": o.required_agents})
+
+        objs_list = []
+        if visible_food: objs_list.append("FOOD")
+        if visible_hazards: objs_list.append("HAZARD")
+        if visible_coop_food: objs_list.append("COOP_FOOD")
+        if visible_tools: objs_list.append("TOOL")
+        if visible_obstacles: objs_list.append("OBSTACLE")
+        return (visible_food, visible_hazards, visible_coop_food, visible_tools, visible_obstacles,
+                world.get_neighbors(loc), objs_list)
+
+    @staticmethod
+    def _room_view(world: World, loc: str):
+        """The cached _sense_room result for loc, prefixed with the stamp it was sensed at."""
+        stamp = world.location_versions.get(loc, 0)
+        room = world.room_views.get(loc)
+        if room is None or room[0] != stamp:
+            room = world.room_views[loc] = (stamp,) + AgentMind._sense_room(world, loc)
+        return room
+
+    @staticmethod
+    def _sense_distant(world: World, loc: str, radius: int) -> List[Dict[str, Any]]:
+        """Phase 34: Objects in the other rooms within radius hops, nearest rooms first."""
+        found = []
+        for room, dist in world.neighborhood(loc, radius).items():
+            if dist == 0 or room not in world.locations:
+                continue
+            view = AgentMind._room_view(world, room)
+            for tag, items in zip(("FOOD", "HAZARD", "COOP_FOOD", "TOOL", "OBSTACLE"), view[1:6]):
+                for item in items:
+                    obj_id = item["id"] if isinstance(item, dict) else item
+                    found.append({"id": obj_id, "type": tag, "location": room, "distance": dist})
+        return found
+
     @staticmethod
     def decide(agent: Agent, perception: Dict[str, Any]) -> Action:
         AgentSocial.generate_story(agent, perception)
@@ -140,7 +187,10 @@ class AgentMind:
                 agent.plan_queue = []
             elif agent.plan_queue[0].type == ActionType.MOVE:
                 target = agent.plan_queue[0].target_id
-                if AgentMeta.get_score(agent, target) < -0.5: agent.plan_queue = []
+                if AgentMeta.get_score(agent, target) < -0.5:
+                    # Phase 39: Detour around the room rather than replanning from scratch
+                    repaired = AgentPlanner.repair_plan(agent, agent.plan_queue)
+                    agent.plan_queue = repaired if ForwardModel.is_plan_safe(agent, repaired) else []
 
         if agent.plan_queue:
             return agent.plan_queue.pop(0)
@@ -174,6 +224,8 @@ class AgentMind:
                 agent.plan_queue = new_plan
                 return agent.plan_queue.pop(0)
             if perception["visible_food"]: return Action(ActionType.CONSUME, target_id=perception["visible_food"][0])
+            # Phase 40: Search ran out of budget; stay put so it resumes next tick
+            if AgentPlanner.pending(agent): return Action(ActionType.WAIT)
 
         if active_goal.type == GoalType.EXPLORE:
             if not agent.home_location_id: agent.home_location_id = perception["location"]
@@ -186,6 +238,7 @@ class AgentMind:
             if new_plan:
                 agent.plan_queue = new_plan
                 return agent.plan_queue.pop(0)
+            if AgentPlanner.pending(agent): return Action(ActionType.WAIT)
 
         if perception["neighbors"]: return AgentMind._choose_move(agent, perception)
         return Action(ActionType.WAIT)
@@ -196,15 +249,15 @@ class AgentMind:
         if not neighbors: return Action(ActionType.WAIT)
         unvisited = [n for n in neighbors if n not in agent.visited_locations]
         
-        def is_safe(n):
-            meta_safe = AgentMeta.get_score(agent, n) >= -0.5
-            test_plan = [Action(ActionType.MOVE, target_id=n)]
-            return meta_safe and ForwardModel.is_plan_safe(agent, test_plan, survival_threshold=2.0)
-            
-        safe_unvisited = [n for n in unvisited if is_safe(n)]
-        safe_neighbors = [n for n in neighbors if is_safe(n)]
+        # Phase 43: every candidate step is imagined in one assess_plans call
+        plans = [[Action(ActionType.MOVE, target_id=n)] for n in neighbors]
+        imagined = ForwardModel.assess_plans(agent, plans, survival_threshold=2.0)
+        safe = {n for n, ok in zip(neighbors, imagined) if ok and AgentMeta.get_score(agent, n) >= -0.5}
+        safe_unvisited = [n for n in unvisited if n in safe]
+        safe_neighbors = [n for n in neighbors if n in safe]
         
-        if safe_unvisited: target = random.choice(safe_unvisited)
-        elif safe_neighbors: target = random.choice(safe_neighbors)
+        rng = agent.rng or random # Phase 24: per-agent stream when run by a Simulation
+        if safe_unvisited: target = rng.choice(safe_unvisited)
+        elif safe_neighbors: target = rng.choice(safe_neighbors)
         else: return Action(ActionType.WAIT)
         return Action(ActionType.MOVE, target_id=target)
@@ -1,92 +1,83 @@
-from typing import List, Dict, Any, Optional
-from collections import deque
+import heapq
+import itertools
+from typing import List, Dict, Any, Optional, Tuple
 from src.entity import Agent, ObjectType
-from src.physics import Action, ActionType
+from src.physics import Action, ActionType, Physics
 from src.agent_memory_pro import MemoryAnalyzer
 from src.agent_meta import AgentMeta
+from src.profiler import StageProfiler
+from src.map_index import MapIndex
+from src.region_map import RegionMap
+from src.plan_cache import SharedPlanCache
 
 class AgentPlanner:
     """
     Phase 5: Advanced Planning.
     Generates multi-step plans based on Cognitive Map.
+
+    Phase 35: Shortest paths come from a breadth-first reachability tree with parent
+    pointers (no per-node path copies), kept per agent and grown lazily: it is only
+    expanded as deep as a goal could still beat the best one found. The tree is cached
+    in agent.plan_cache, keyed by the map (identity, map_version), the agent's location
+    and reflection_version; the map-derived goal candidates only by the map, so they
+    survive moves. Goal scores (skills, inventory, reputations, staleness) are
+    recomputed on every call.
+    A plan-cache miss costs the rooms the tree settles plus the goal candidates, read
+    from the agent's MapIndex, which grows with the map; only a map handed over whole
+    pays a one-time index build over all its rooms.
+
+    Phase 37: MODE = "weighted" swaps the hop-count BFS for a multi-target Dijkstra.
+    Entering a room costs its energy (MOVE + metabolism, plus assumed damage if the map
+    tags a HAZARD there) in units of one plain step, plus a distrust penalty for
+    negative reflection scores. The search stops as soon as no unsettled room could
+    still beat the best goal found.
+
+    Phase 38: MODE = "hierarchical" searches the first LOCAL_RADIUS steps with the BFS
+    tree as above. Goals that may lie farther out are planned over the agent's
+    RegionMap: a Dijkstra over region gates (crossing costs from cached per-region BFS
+    tables) estimates their distances, and the chosen route is refined room by room
+    from the same tables. Such routes are valid but may be a few steps longer than the
+    shortest; in exchange the per-room work of far searches is reused across calls
+    and locations.
+
+    Phase 40: Anytime planning. With BUDGET set, one call settles at most about BUDGET
+    rooms (whole BFS levels; region gates count as rooms). A search that runs out
+    returns [] and leaves pending(agent) set; its state stays in plan_cache, so the
+    next call (same map, room and reflections) resumes where it stopped.
+
+    Phase 41: Agents with identical knowledge share one tree (SharedPlanCache). Each
+    walks it with its own cursor and is charged for the steps it replays, so plans and
+    budget hits do not depend on which agents share a cache (or a MindPool worker).
     """
+
+    SAFETY_THRESHOLD = -0.5 # Rooms scored below this by reflection are never entered
+    STALE_THRESHOLD = 50
+    MODE = "bfs"            # "bfs" (hop count), "weighted" (Phase 37) or "hierarchical" (Phase 38)
+    HAZARD_DAMAGE = 10      # Energy a known hazard is assumed to cost per visit
+    DISTRUST_WEIGHT = 4.0   # Extra steps charged per point of negative reflection score
+    LOCAL_RADIUS = 12       # Hierarchical mode: exact search radius before region planning
+    REPAIR_DEPTH = 6        # Longest detour repair_plan looks for (Phase 39)
+    BUDGET: Optional[int] = None # Rooms one call may settle (Phase 40); None = unbounded
     
     @staticmethod
+    @StageProfiler.timed("decide.plan")
     def generate_plan(agent: Agent) -> List[Action]:
         current_loc = agent.location_id
         map_data = agent.cognitive_map
         if not map_data:
             return []
 
+        cache = AgentPlanner._cache_for(agent)
+        cache["pending"] = False
+
         # 1. Identify Goals
-        goal_metrics = [] # (score, target_id, type)
-        
-        for loc, data in map_data.items():
-            if loc == current_loc:
-                continue
-            
-            if "objects" in data:
-                # Phase 22: Skill multipliers
-                extract_skill = agent.skills.get("EXTRACT", 1.0)
-                use_skill = agent.skills.get("USE", 1.0)
-                explore_skill = agent.skills.get("EXPLORE", 1.0)
-
-                # Robust check for FOOD (string or Enum name)
-                if any(x in data["objects"] for x in ["FOOD", "ObjectType.FOOD"]):
-                    goal_metrics.append((100 * extract_skill, loc, "FOOD"))
-                
-                # Check for COOP_FOOD
-                if any(x in data["objects"] for x in ["COOP_FOOD", "ObjectType.COOP_FOOD"]):
-                    priority = 120
-                    requester = data.get("requester_id")
-                    if requester:
-                        rep = agent.social_reputations.get(requester, 0.0)
-                        priority += rep * 20
-                    goal_metrics.append((priority * extract_skill, loc, "COOP_FOOD"))
-            
-                # Check for OBSTACLE
-                if any(x in data["objects"] for x in ["OBSTACLE", "ObjectType.OBSTACLE"]):
-                    obstacles = data.get("metadata", {}).get("obstacles", [])
-                    for obs in obstacles:
-                        required_tool_type = obs.get("tool_required")
-                        if not required_tool_type:
-                            goal_metrics.append((90, loc, "OBSTACLE"))
-                            continue
-
-                        has_tool = any(item.tool_type == required_tool_type for item in agent.inventory)
-                        if has_tool:
-                            goal_metrics.append((110 * use_skill, loc, "OBSTACLE"))
-                        else:
-                            # Search map for the tool
-                            tool_loc = None
-                            for t_loc, t_data in map_data.items():
-                                tools = t_data.get("metadata", {}).get("tools", [])
-                                if any(t.get("tool_type") == required_tool_type for t in tools):
-                                    tool_loc = t_loc
-                                    break
-                            if tool_loc:
-                                goal_metrics.append((115 * use_skill, tool_loc if tool_loc != current_loc else loc, "GET_TOOL"))
-        
-        # Frontiers
-        known_nodes = set(map_data.keys())
-        potential_frontiers = set()
-        for loc, data in map_data.items():
-            for n in data.get("neighbors", []):
-                if n not in known_nodes:
-                    potential_frontiers.add(n)
-        
-        explore_multi = agent.skills.get("EXPLORE", 1.0)
-        for f in potential_frontiers:
-            goal_metrics.append((50 * explore_multi, f, "FRONTIER"))
-        
+        goal_metrics = AgentPlanner._score_goals(agent, cache) # (score, target_id, type)
+
         # Stale Frontiers (Phase 19)
-        STALE_THRESHOLD = 50
         current_tick = agent.last_tick_updated
-        for loc, data in map_data.items():
+        for loc in MapIndex.get(agent).stale(current_tick - AgentPlanner.STALE_THRESHOLD):
             if loc == current_loc: continue
-            last_tick = data.get("last_tick", 0)
-            if current_tick - last_tick > STALE_THRESHOLD:
-                goal_metrics.append((45, loc, "STALE_FRONTIER"))
+            goal_metrics.append((45, loc, "STALE_FRONTIER"))
             
         # Likely Regions (Phase 8/18)
         for loc_id, stats in agent.spatial_patterns.items():
@@ -105,34 +96,429 @@ class AgentPlanner:
         if not goal_metrics:
             return []
             
-        # 2. BFS for best goal
-        def is_safe(n):
-            return AgentMeta.get_score(agent, n) >= -0.5
-
-        targets_found = {} # loc_id -> path
-        queue = deque([(current_loc, [])])
-        visited = {current_loc}
-        
-        while queue:
-            curr, path = queue.popleft()
-            targets_found[curr] = path
-            
-            node_data = map_data.get(curr)
-            if not node_data: continue
-                
-            for n in node_data.get("neighbors", []):
-                if n not in visited and is_safe(n):
-                    visited.add(n)
-                    queue.append((n, path + [n]))
-        
-        best_plan = []
+        # 2. Cheapest path to the best goal (score minus path cost)
+        tree = cache["tree"]
+        top = {} # goal room -> highest base score
+        for base_score, goal_id, _ in goal_metrics:
+            if base_score > top.get(goal_id, base_score - 1):
+                top[goal_id] = base_score
+        ceiling = max(top.values())
+        local = tree["local"] if tree["mode"] == "hierarchical" else tree
+        dist = local["dist"]
+        best_score = -1
+        for goal_id, base_score in top.items():
+            if goal_id in dist and base_score - dist[goal_id] > best_score and AgentPlanner._reached(cache, local, goal_id):
+                best_score = base_score - dist[goal_id]
+        # Rooms costing more than ceiling - best_score cannot change the choice
+        radius = AgentPlanner.LOCAL_RADIUS if local is not tree else float("inf")
+        budget = AgentPlanner.BUDGET if AgentPlanner.BUDGET is not None else float("inf")
+        while True:
+            if budget <= 0:
+                return AgentPlanner._out_of_budget(agent, cache)
+            settled = AgentPlanner._step(agent, cache, local, min(ceiling - best_score, radius))
+            if not settled:
+                break
+            budget -= len(settled)
+            for n in settled:
+                if n in top and top[n] - dist[n] > best_score:
+                    best_score = top[n] - dist[n]
+        if local is not tree and local["frontier"] and local["level"] < ceiling - best_score:
+            # Phase 38: A goal beyond the local radius could still win; estimate via regions
+            dist = AgentPlanner._region_distances(agent, tree, top, ceiling, best_score, budget)
+            if dist is None:
+                return AgentPlanner._out_of_budget(agent, cache)
+            for goal_id, d in local["dist"].items():
+                if goal_id in top and d <= dist.get(goal_id, d):
+                    dist[goal_id] = d
+                    tree["via"].pop(goal_id, None)
+
+        best_goal = None
         best_score = -1
         for base_score, goal_id, g_type in goal_metrics:
-            if goal_id in targets_found:
-                path = targets_found[goal_id]
-                final_score = base_score - len(path)
+            if goal_id in dist and (dist is not local["dist"] or AgentPlanner._reached(cache, local, goal_id)):
+                final_score = base_score - dist[goal_id]
                 if final_score > best_score:
                     best_score = final_score
-                    best_plan = [Action(ActionType.MOVE, target_id=step) for step in path]
-                    
-        return best_plan
+                    best_goal = goal_id
+        if best_goal is None:
+            return []
+        if dist is not local["dist"] and best_goal in tree["via"]:
+            path = AgentPlanner._region_path(agent, tree, best_goal)
+        else:
+            path = AgentPlanner._path_to(local, best_goal)
+        return [Action(ActionType.MOVE, target_id=step) for step in path]
+
+    @staticmethod
+    def pending(agent: Agent) -> bool:
+        """Phase 40: Whether the agent's last generate_plan ran out of budget mid-search."""
+        return agent.plan_cache is not None and agent.plan_cache.get("pending", False)
+
+    @staticmethod
+    def _out_of_budget(agent: Agent, cache: Dict[str, Any]) -> List[Action]:
+        cache["pending"] = True
+        agent.plan_budget_hits += 1
+        return []
+
+    @staticmethod
+    @StageProfiler.timed("decide.repair")
+    def repair_plan(agent: Agent, plan: List[Action], avoid: Optional[Tuple[str, str]] = None) -> List[Action]:
+        """
+        Phase 39: Local Plan Repair.
+        Reroutes a MOVE plan around rooms now scored below SAFETY_THRESHOLD (and the
+        edge `avoid`, e.g. a move that just failed) instead of planning from scratch:
+        a BFS of at most REPAIR_DEPTH steps from the agent's room to a room of the plan
+        past its last unsafe one, keeping detour + remaining steps smallest (later rooms
+        win ties). Returns [] if no such detour exists.
+        """
+        if not plan or any(a.type != ActionType.MOVE for a in plan):
+            return []
+        rooms = [a.target_id for a in plan]
+        blocked = {loc for loc, score in agent.reflection_score.items() if score < AgentPlanner.SAFETY_THRESHOLD}
+        first = 0
+        for i, room in enumerate(rooms):
+            if room in blocked:
+                first = i + 1
+        targets = {room: j for j, room in enumerate(rooms) if j >= first} # Latest visit wins
+        if not targets:
+            return []
+
+        start = agent.location_id
+        parent = {start: None}
+        frontier = [start]
+        best, best_total = None, None
+        level = 0
+        while frontier:
+            for room in frontier:
+                j = targets.get(room)
+                if j is not None:
+                    total = level + len(rooms) - 1 - j
+                    if best_total is None or total < best_total or (total == best_total and j > targets[best]):
+                        best, best_total = room, total
+            if level == AgentPlanner.REPAIR_DEPTH or (best_total is not None and level >= best_total):
+                break
+            level += 1
+            next_frontier = []
+            for curr in frontier:
+                for n in agent.cognitive_map.get(curr, {}).get("neighbors", []):
+                    if n not in parent and n not in blocked and (curr, n) != avoid:
+                        parent[n] = curr
+                        next_frontier.append(n)
+            frontier = next_frontier
+        if best is None:
+            return []
+        detour = AgentPlanner._path_to({"parent": parent}, best)
+        return [Action(ActionType.MOVE, target_id=step) for step in detour] + plan[targets[best] + 1:]
+
+    @staticmethod
+    def after_failure(agent: Agent, action: Action) -> bool:
+        """
+        Phase 39: Plan maintenance after a failed action. A failed MOVE of the plan is
+        repaired around that edge (the plan is dropped if that fails); other failures
+        leave the plan alone. Returns whether the plan changed.
+        """
+        if action.type != ActionType.MOVE:
+            return False
+        avoid = (agent.location_id, action.target_id)
+        agent.plan_queue = AgentPlanner.repair_plan(agent, [action] + agent.plan_queue, avoid=avoid)
+        return True
+
+    @staticmethod
+    def step_cost(agent: Agent, loc_id: str) -> float:
+        """Phase 37: Cost of entering loc_id, in plain steps (weighted mode)."""
+        step_energy = Physics.MOVE_COST + Physics.METABOLISM_COST
+        energy = step_energy
+        objects = agent.cognitive_map.get(loc_id, {}).get("objects")
+        if objects and ("HAZARD" in objects or "ObjectType.HAZARD" in objects):
+            energy += AgentPlanner.HAZARD_DAMAGE
+        cost = energy / step_energy
+        score = agent.reflection_score.get(loc_id, 0.0)
+        if score < 0:
+            cost += AgentPlanner.DISTRUST_WEIGHT * -score
+        return cost
+
+    @staticmethod
+    def _cache_for(agent: Agent) -> Dict[str, Any]:
+        """
+        Returns agent.plan_cache, rebuilt if the map, location or reflection scores moved on.
+        Phase 41: A rebuilt cache takes its goals and tree from the active SharedPlanCache
+        when another agent with the same knowledge, room and mode already searched.
+        """
+        map_data = agent.cognitive_map
+        key = (agent.map_version, len(map_data), agent.location_id, agent.reflection_version, AgentPlanner.MODE)
+        cache = agent.plan_cache
+        if cache is None or cache["map"] is not map_data or cache["key"] != key:
+            # Goal candidates only depend on the map: a move or new reflections keep them
+            goals = cache["goals"] if cache is not None and cache["map"] is map_data and cache["key"][:2] == key[:2] else None
+            start = agent.location_id
+            blocked = {loc for loc, score in agent.reflection_score.items() if score < AgentPlanner.SAFETY_THRESHOLD}
+            shared, shared_key = SharedPlanCache.current(), None
+            if shared is not None and AgentPlanner.MODE != "hierarchical": # Region trees use the agent's RegionMap
+                if AgentPlanner.MODE == "weighted": # Every distrusted room changes step costs
+                    scores = frozenset((loc, score) for loc, score in agent.reflection_score.items() if score < 0)
+                else:
+                    scores = frozenset(blocked)
+                shared_key = (MapIndex.get(agent).fingerprint(), start, scores, AgentPlanner.MODE)
+                entry = shared.get(shared_key)
+                if entry is not None:
+                    agent.plan_cache_hits += 1
+                    cache = agent.plan_cache = {"map": map_data, "key": key, **entry, "walked": 0}
+                    return cache
+                agent.plan_cache_misses += 1
+            # "steps": what each _grow call settled, in order (replayed by agents sharing the tree)
+            if AgentPlanner.MODE == "weighted":
+                tree = {"mode": "weighted", "parent": {start: None}, "dist": {}, "cost": {start: 0.0},
+                        "heap": [(0.0, 0, start)], "seq": itertools.count(1), "blocked": blocked,
+                        "steps": [], "rank": {}}
+            elif AgentPlanner.MODE == "hierarchical":
+                # Gate entries: settled distance, link (previous entry, room crossed from)
+                local = {"mode": "bfs", "parent": {start: None}, "dist": {start: 0},
+                         "frontier": [start], "level": 0, "blocked": blocked, "steps": []}
+                tree = {"mode": "hierarchical", "local": local, "start": start, "dist": {}, "link": {},
+                        "heap": [(0, 0, start, None)], "seq": itertools.count(1), "settled": {},
+                        "start_table": None, "via": {}, "blocked": blocked}
+            else:
+                tree = {"mode": "bfs", "parent": {start: None}, "dist": {start: 0},
+                        "frontier": [start], "level": 0, "blocked": blocked, "steps": []}
+            entry = {"goals": goals if goals is not None else AgentPlanner._map_goals(agent), "tree": tree}
+            if shared_key is not None:
+                shared.put(shared_key, entry)
+            cache = agent.plan_cache = {"map": map_data, "key": key, **entry, "walked": 0}
+        return cache
+
+    @staticmethod
+    def _step(agent: Agent, cache: Dict[str, Any], tree: Dict[str, Any], bound: float) -> List[str]:
+        """
+        Phase 41: Advances the agent's own walk through a search tree by one step (a BFS
+        level or one Dijkstra room) if it is within bound, and returns the rooms settled.
+        Steps another agent already computed in a shared tree are replayed rather than
+        skipped, so the work an agent is charged (Phase 40 budget) and the goals it sees
+        never depend on which agents share its cache.
+        """
+        walked = cache["walked"]
+        steps = tree["steps"]
+        if walked < len(steps):
+            settled = steps[walked]
+            if (tree["dist"][settled[0]] > bound) if tree["mode"] == "weighted" else walked >= bound:
+                return []
+        else:
+            grow = AgentPlanner._grow_weighted if tree["mode"] == "weighted" else AgentPlanner._grow
+            settled = grow(agent, tree, bound)
+            if not settled:
+                return []
+        cache["walked"] = walked + 1
+        return settled
+
+    @staticmethod
+    def _reached(cache: Dict[str, Any], tree: Dict[str, Any], room: str) -> bool:
+        """Phase 41: Whether room is settled within the agent's own walk of the tree."""
+        walked = cache["walked"]
+        if tree["mode"] == "weighted":
+            return tree["rank"].get(room, walked) < walked
+        return tree["dist"].get(room, walked + 1) <= walked
+
+    @staticmethod
+    def _grow(agent: Agent, tree: Dict[str, Any], bound: float) -> List[str]:
+        """
+        Adds the next BFS level to the tree if it is within bound. Returns its rooms in
+        discovery order ([] when the tree already reaches bound or is exhausted).
+        """
+        if not tree["frontier"] or tree["level"] >= bound:
+            return []
+        get_node = agent.cognitive_map.get
+        parent, dist, blocked = tree["parent"], tree["dist"], tree["blocked"]
+        level = tree["level"] + 1
+        next_frontier = []
+        for curr in tree["frontier"]:
+            node_data = get_node(curr)
+            if not node_data: continue
+            for n in node_data.get("neighbors", []):
+                if n not in dist and n not in blocked:
+                    parent[n] = curr
+                    dist[n] = level
+                    next_frontier.append(n)
+        tree["frontier"], tree["level"] = next_frontier, level
+        if next_frontier:
+            tree["steps"].append(next_frontier)
+        return next_frontier
+
+    @staticmethod
+    def _grow_weighted(agent: Agent, tree: Dict[str, Any], bound: float) -> List[str]:
+        """Settles the next-cheapest room if its cost is within bound (Dijkstra step)."""
+        heap, dist, cost, parent, blocked = tree["heap"], tree["dist"], tree["cost"], tree["parent"], tree["blocked"]
+        while heap:
+            d, _, room = heap[0]
+            if room in dist:
+                heapq.heappop(heap) # Superseded by a cheaper entry
+                continue
+            if d > bound:
+                return []
+            heapq.heappop(heap)
+            dist[room] = d
+            tree["rank"][room] = len(tree["steps"])
+            tree["steps"].append([room])
+            node_data = agent.cognitive_map.get(room)
+            if node_data:
+                for n in node_data.get("neighbors", []):
+                    if n in dist or n in blocked:
+                        continue
+                    nd = d + AgentPlanner.step_cost(agent, n)
+                    if nd < cost.get(n, float("inf")):
+                        cost[n] = nd
+                        parent[n] = room
+                        heapq.heappush(heap, (nd, next(tree["seq"]), n))
+            return [room]
+        return []
+
+    @staticmethod
+    def _region_distances(agent: Agent, tree: Dict[str, Any], top: Dict[str, float], ceiling: float,
+                          best_score: float, budget: float = float("inf")) -> Optional[Dict[str, int]]:
+        """
+        Phase 38: Estimated distances to the goals in top, from a Dijkstra over region
+        gates that stops once no unsettled gate could lead to a better goal.
+        tree["via"] records the gate entry each estimate goes through.
+        Returns None if more than `budget` gates would have to be settled (Phase 40).
+        """
+        regions = RegionMap.get(agent, tree["blocked"])
+        start = tree["start"]
+        if start not in regions.region_of:
+            return {}
+        entry_dist, link, settled, heap = tree["dist"], tree["link"], tree["settled"], tree["heap"]
+        goals_in: Dict[int, List[str]] = {}
+        for goal_id in top:
+            rid = regions.region_for(goal_id)
+            if rid is not None:
+                goals_in.setdefault(rid, []).append(goal_id)
+
+        def table(entry):
+            if entry != start:
+                return regions.table(entry)
+            if tree["start_table"] is None:
+                tree["start_table"] = regions.table(start, keep=False)
+            return tree["start_table"]
+
+        dist, via = {}, tree["via"]
+        via.clear()
+        best = [best_score]
+        def reach(entry, rid):
+            within = table(entry)[0]
+            for goal_id in goals_in.get(rid, ()):
+                if goal_id in within:
+                    d = entry_dist[entry] + within[goal_id]
+                    if d < dist.get(goal_id, d + 1):
+                        dist[goal_id], via[goal_id] = d, entry
+                        best[0] = max(best[0], top[goal_id] - d)
+
+        for rid in goals_in:
+            for entry in settled.get(rid, ()):
+                reach(entry, rid)
+        while heap and heap[0][0] <= ceiling - best[0]:
+            if budget <= 0:
+                return None
+            d, _, entry, entry_link = heapq.heappop(heap)
+            if entry in entry_dist:
+                continue
+            budget -= 1
+            rid = regions.region_of[entry]
+            entry_dist[entry], link[entry] = d, entry_link
+            settled.setdefault(rid, []).append(entry)
+            reach(entry, rid)
+            within = table(entry)[0]
+            for u, v in regions.gates(rid):
+                if u in within and v not in entry_dist:
+                    heapq.heappush(heap, (d + within[u] + 1, next(tree["seq"]), v, (entry, u)))
+        return dist
+
+    @staticmethod
+    def _region_path(agent: Agent, tree: Dict[str, Any], goal_id: str) -> List[str]:
+        """Phase 38: Refines the gate route to goal_id into rooms, walking the region tables back."""
+        regions = agent.region_map
+        path = []
+        entry, target = tree["via"][goal_id], goal_id
+        while True:
+            parent = (tree["start_table"] if entry == tree["start"] else regions.table(entry))[1]
+            node = target
+            while node != entry:
+                path.append(node)
+                node = parent[node]
+            if tree["link"][entry] is None:
+                break
+            path.append(entry) # Crossed the gate into this region
+            entry, target = tree["link"][entry]
+        path.reverse()
+        return path
+
+    @staticmethod
+    def _path_to(tree: Dict[str, Any], goal_id: str) -> List[str]:
+        parent = tree["parent"]
+        path = []
+        node = goal_id
+        while parent[node] is not None:
+            path.append(node)
+            node = parent[node]
+        path.reverse()
+        return path
+
+    @staticmethod
+    def _map_goals(agent: Agent) -> List[Tuple]:
+        """
+        Goal candidates that depend only on the map, in map order:
+        ("FOOD", loc), ("COOP_FOOD", loc, requester), ("OBSTACLE", loc, tool_type or None,
+        room to fetch the tool from or None), ("FRONTIER", loc). Scored by _score_goals.
+        Phase 36: Read from the agent's MapIndex, so the cost follows the candidates.
+        """
+        map_data = agent.cognitive_map
+        index = MapIndex.get(agent)
+        goals = []
+        for loc in index.rooms_with(("FOOD", "COOP_FOOD", "OBSTACLE")):
+            data = map_data[loc]
+            objects = data["objects"]
+            # Robust check for FOOD (string or Enum name)
+            if "FOOD" in objects or "ObjectType.FOOD" in objects:
+                goals.append(("FOOD", loc))
+            if "COOP_FOOD" in objects or "ObjectType.COOP_FOOD" in objects:
+                goals.append(("COOP_FOOD", loc, data.get("requester_id")))
+            if "OBSTACLE" in objects or "ObjectType.OBSTACLE" in objects:
+                for obs in data.get("metadata", {}).get("obstacles", []):
+                    required_tool_type = obs.get("tool_required")
+                    tool_loc = index.first_tool_room(required_tool_type) if required_tool_type else None
+                    goals.append(("OBSTACLE", loc, required_tool_type, tool_loc))
+
+        # Frontiers, in order of first mention (never in hash order: outcomes only depend on the seed)
+        for f in index.frontiers():
+            goals.append(("FRONTIER", f))
+        return goals
+
+    @staticmethod
+    def _score_goals(agent: Agent, cache: Dict[str, Any]) -> List[Tuple[float, str, str]]:
+        # Phase 22: Skill multipliers
+        extract_skill = agent.skills.get("EXTRACT", 1.0)
+        use_skill = agent.skills.get("USE", 1.0)
+        explore_multi = agent.skills.get("EXPLORE", 1.0)
+        current_loc = agent.location_id
+
+        goal_metrics = []
+        for goal in cache["goals"]:
+            kind, loc = goal[0], goal[1]
+            if loc == current_loc:
+                continue # Already here
+            if kind == "FOOD":
+                goal_metrics.append((100 * extract_skill, loc, "FOOD"))
+            elif kind == "COOP_FOOD":
+                priority = 120
+                requester = goal[2]
+                if requester:
+                    rep = agent.social_reputations.get(requester, 0.0)
+                    priority += rep * 20
+                goal_metrics.append((priority * extract_skill, loc, "COOP_FOOD"))
+            elif kind == "OBSTACLE":
+                required_tool_type, tool_loc = goal[2], goal[3]
+                if not required_tool_type:
+                    goal_metrics.append((90, loc, "OBSTACLE"))
+                elif any(item.tool_type == required_tool_type for item in agent.inventory):
+                    goal_metrics.append((110 * use_skill, loc, "OBSTACLE"))
+                elif tool_loc:
+                    # Search map for the tool
+                    goal_metrics.append((115 * use_skill, tool_loc if tool_loc != current_loc else loc, "GET_TOOL"))
+            else:
+                goal_metrics.append((50 * explore_multi, loc, "FRONTIER"))
+        return goal_metrics
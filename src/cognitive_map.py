@@ -0,0 +1,97 @@
+from typing import Dict, Any, Optional
+from src.entity import Agent
+from src.map_index import MapIndex
+from src.shared_map import SharedCognitiveMap
+
+class CognitiveMap:
+    """
+    Phase 32: Cognitive Map Writes.
+    Every write to an agent's cognitive map goes through these helpers so that
+    agent.map_version moves whenever the map content changes. Digests and caches
+    compare versions instead of walking the map.
+    Refreshing only an entry's last_tick is not a content change.
+    Phase 36: Writes also mark the entry in the agent's MapIndex (if it has one).
+    Phase 44: Entries are only ever assigned to, never mutated in place, so the map may
+    be a CompactCognitiveMap.
+    Phase 45: Writes to an existing entry go through writable(), so the map may be a
+    SharedCognitiveMap whose entries other agents hold too.
+    Phase 46: touch() also records the version of each room's last change, so map
+    updates can carry only what a peer has not been sent.
+    """
+
+    @staticmethod
+    def ensure_entry(agent: Agent, loc_id: str) -> Dict[str, Any]:
+        """Returns the entry for loc_id, creating an empty one if the room is unknown."""
+        entry = agent.cognitive_map.get(loc_id)
+        if entry is None:
+            agent.cognitive_map[loc_id] = {"neighbors": [], "objects": []}
+            entry = agent.cognitive_map[loc_id] # Phase 44: a CompactCognitiveMap stores a copy
+            CognitiveMap.touch(agent, loc_id)
+        return entry
+
+    @staticmethod
+    def touch(agent: Agent, loc_id: Optional[str] = None):
+        """Marks the map (or the entry for loc_id) as changed."""
+        agent.map_version += 1
+        if loc_id is not None: # Phase 46: Keep map_changes ordered by last change
+            agent.map_changes.pop(loc_id, None)
+            agent.map_changes[loc_id] = agent.map_version
+        if agent.map_index is not None:
+            MapIndex.mark(agent, loc_id)
+
+    @staticmethod
+    def writable(agent: Agent, loc_id: str) -> Dict[str, Any]:
+        """The entry for loc_id, safe to write: a private copy if it is shared (Phase 45)."""
+        cmap = agent.cognitive_map
+        if isinstance(cmap, SharedCognitiveMap) and loc_id in cmap.frozen:
+            cmap[loc_id] = CognitiveMap.copy_entry(cmap.entries[loc_id])
+        return cmap[loc_id]
+
+    @staticmethod
+    def copy_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+        """An entry another agent may keep: fresh containers, shared immutable leaves."""
+        entry = dict(entry)
+        for key in ("neighbors", "objects"):
+            if key in entry:
+                entry[key] = list(entry[key])
+        if isinstance(entry.get("metadata"), dict):
+            entry["metadata"] = {key: list(value) for key, value in entry["metadata"].items()}
+        return entry
+
+    @staticmethod
+    def add_object(agent: Agent, loc_id: str, tag: str) -> Dict[str, Any]:
+        """Adds an object tag (e.g. "FOOD") to a room, creating the entry if needed."""
+        entry = CognitiveMap.ensure_entry(agent, loc_id)
+        objects = entry["objects"]
+        if tag not in objects:
+            entry = CognitiveMap.writable(agent, loc_id)
+            entry["objects"] = objects + [tag] # Assigned, not appended: views return copies
+            CognitiveMap.touch(agent, loc_id)
+        return entry
+
+    @staticmethod
+    def set_field(agent: Agent, loc_id: str, key: str, value: Any):
+        entry = CognitiveMap.ensure_entry(agent, loc_id)
+        if entry.get(key) != value:
+            CognitiveMap.writable(agent, loc_id)[key] = value
+            CognitiveMap.touch(agent, loc_id)
+
+    @staticmethod
+    def observe(agent: Agent, loc_id: str, neighbors, objects, metadata, tick: int):
+        """Records what the agent sees in its own room."""
+        entry = agent.cognitive_map.get(loc_id)
+        if entry is not None and (entry.get("neighbors") == neighbors and entry.get("objects") == objects
+                                  and entry.get("metadata") == metadata):
+            # Unchanged: only the time of the visit moves (the staleness index follows it)
+            CognitiveMap.writable(agent, loc_id)["last_tick"] = tick
+            if agent.map_index is not None:
+                MapIndex.mark(agent, loc_id)
+            return
+        if entry is None:
+            agent.cognitive_map[loc_id] = {}
+        entry = CognitiveMap.writable(agent, loc_id)
+        # Fresh copies: the caller's lists are cached views of the room
+        entry.update({"neighbors": neighbors, "objects": list(objects),
+                      "metadata": {key: list(value) for key, value in metadata.items()},
+                      "last_tick": tick})
+        CognitiveMap.touch(agent, loc_id)
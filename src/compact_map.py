@@ -0,0 +1,279 @@
+import sys
+import threading
+from array import array
+from collections.abc import Mapping, MutableMapping
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+from src.entity import ObjectType
+
+# Per-row flags: which keys the entry has
+_NEIGHBORS, _OBJECTS, _METADATA, _TICK = 1, 2, 4, 8
+_FIELDS = (("neighbors", _NEIGHBORS), ("objects", _OBJECTS), ("metadata", _METADATA), ("last_tick", _TICK))
+_FLAG_OF = dict(_FIELDS)
+_EMPTY_METADATA = ("tools", "obstacles") # What observe() writes for a room with neither
+
+class _ActiveInterner(threading.local):
+    interner = None # Set while a Simulation (or MindHost) is ticking on this thread
+
+_active = _ActiveInterner()
+
+class Interner:
+    """
+    Phase 44: Numbering of location IDs and object tags for a group of compact maps.
+    Tables only grow; they are freed with the last map that uses them.
+    """
+
+    @staticmethod
+    def current() -> Optional["Interner"]:
+        return _active.interner
+
+    @staticmethod
+    def activate(interner: Optional["Interner"]) -> Optional["Interner"]:
+        """Makes interner the active one on this thread. Returns the previous one."""
+        previous = _active.interner
+        _active.interner = interner
+        return previous
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}         # Interned location ID -> number
+        self.names: List[str] = []            # Number -> location ID
+        self.tag_bits: Dict[str, int] = {}    # Object tag -> bit
+        self.tags: List[str] = []             # Bit -> tag
+        self.mask_tags: Dict[int, Tuple[str, ...]] = {0: ()}
+        # Seed the tag bits in the order observe() lists them, so its lists need no side table
+        for tag in ("FOOD", "HAZARD", "COOP_FOOD", "TOOL", "OBSTACLE"):
+            self.bit(tag)
+        for object_type in ObjectType:
+            self.bit(object_type.name)
+            self.bit(str(object_type))
+
+    def id(self, name: str) -> int:
+        number = self.ids.get(name)
+        if number is None:
+            name = sys.intern(name)
+            number = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return number
+
+    def bit(self, tag: str) -> int:
+        bit = self.tag_bits.get(tag)
+        if bit is None:
+            bit = self.tag_bits[tag] = len(self.tags)
+            self.tags.append(tag)
+        return bit
+
+    def decode_mask(self, mask: int) -> Tuple[str, ...]:
+        tags = self.mask_tags.get(mask)
+        if tags is None:
+            tags = self.mask_tags[mask] = tuple(tag for bit, tag in enumerate(self.tags) if mask >> bit & 1)
+        return tags
+
+class CompactCognitiveMap(MutableMapping):
+    """
+    Phase 44: Compact Cognitive Map.
+    Same read/write API as the {loc_id: entry dict} map, stored column-wise:
+      - location IDs are numbered by an Interner; neighbors are arrays of their numbers
+      - objects are a bitmask over interned tags (lists that are not in bit order, or
+        repeat a tag, also keep their exact tuple in a side table)
+      - last_tick is an int array; presence of each key is a per-row flag byte
+      - non-empty metadata and any other keys (e.g. requester_id) live in side tables
+    map[loc] returns a CompactEntry view that decodes on read and encodes on write.
+    Values read from a view are fresh containers: mutate them, then assign them back.
+    Iteration follows insertion order, like a dict. Pickles by name, not number, so a
+    map can move between processes with their own intern tables.
+    Maps built without an interner (unpickled ones too) use the active Interner, the
+    one of the Simulation or MindHost ticking on this thread, or else a private one.
+    """
+
+    def __init__(self, entries: Optional[Mapping] = None, interner: Optional[Interner] = None):
+        if interner is None:
+            interner = Interner.current() or Interner()
+        self.interner = interner
+        self._rows: Dict[str, int] = {}
+        self._flags = bytearray()
+        self._neighbors: List[Optional[array]] = []
+        self._objects: List[int] = []
+        self._ticks = array("q")
+        self._odd_objects: Dict[int, Tuple[str, ...]] = {}
+        self._metadata: Dict[int, Dict[str, Any]] = {}
+        self._extra: Dict[int, Dict[str, Any]] = {}
+        if entries:
+            for loc, entry in entries.items():
+                self[loc] = entry
+
+    # --- Mapping protocol ---
+
+    def __getitem__(self, loc: str) -> "CompactEntry":
+        return CompactEntry(self, self._rows[loc])
+
+    def get(self, loc: str, default=None):
+        row = self._rows.get(loc)
+        return default if row is None else CompactEntry(self, row)
+
+    def __contains__(self, loc) -> bool:
+        return loc in self._rows
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._rows)
+
+    def __reversed__(self) -> Iterator[str]:
+        return reversed(self._rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __setitem__(self, loc: str, entry: Mapping):
+        entry = dict(entry) # Also detaches a view of this very row
+        row = self._rows.get(loc)
+        if row is None:
+            row = self._rows[sys.intern(loc)] = len(self._flags)
+            self._flags.append(0)
+            self._neighbors.append(None)
+            self._objects.append(0)
+            self._ticks.append(0)
+        else:
+            self._clear(row)
+        for key, value in entry.items():
+            self._set(row, key, value)
+
+    def __delitem__(self, loc: str):
+        self._clear(self._rows.pop(loc)) # Rows are not reused
+
+    def __repr__(self) -> str:
+        return f"CompactCognitiveMap({len(self)} rooms)"
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        return {loc: dict(entry) for loc, entry in self.items()}
+
+    # --- Row encoding ---
+
+    def _clear(self, row: int):
+        self._flags[row] = 0
+        self._neighbors[row] = None
+        self._objects[row] = 0
+        self._odd_objects.pop(row, None)
+        self._metadata.pop(row, None)
+        self._extra.pop(row, None)
+
+    def _set(self, row: int, key: str, value: Any):
+        flag = _FLAG_OF.get(key)
+        if flag == _NEIGHBORS:
+            number = self.interner.id
+            self._neighbors[row] = array("I", [number(n) for n in value])
+        elif flag == _OBJECTS:
+            mask, last, ordered = 0, -1, True
+            for tag in value:
+                bit = self.interner.bit(tag)
+                ordered = ordered and bit > last
+                last = bit
+                mask |= 1 << bit
+            self._objects[row] = mask
+            if ordered:
+                self._odd_objects.pop(row, None)
+            else:
+                self._odd_objects[row] = tuple(value)
+        elif flag == _METADATA:
+            if isinstance(value, dict) and tuple(value) == _EMPTY_METADATA and not any(value.values()):
+                self._metadata.pop(row, None)
+            else:
+                self._metadata[row] = {k: list(v) for k, v in value.items()} if isinstance(value, dict) else value
+        elif flag == _TICK and type(value) is int and -(1 << 63) <= value < (1 << 63):
+            self._ticks[row] = value
+        else:
+            self._extra.setdefault(row, {})[key] = value
+            return
+        self._flags[row] |= flag
+
+    def _read(self, row: int, key: str, default: Any) -> Any:
+        flag = _FLAG_OF.get(key)
+        if flag is None or not self._flags[row] & flag:
+            extra = self._extra.get(row)
+            return extra.get(key, default) if extra else default
+        if flag == _NEIGHBORS:
+            names = self.interner.names
+            return [names[n] for n in self._neighbors[row]]
+        if flag == _OBJECTS:
+            odd = self._odd_objects.get(row)
+            return list(odd if odd is not None else self.interner.decode_mask(self._objects[row]))
+        if flag == _METADATA:
+            metadata = self._metadata.get(row)
+            if metadata is None:
+                return {key: [] for key in _EMPTY_METADATA}
+            return {k: list(v) for k, v in metadata.items()} if isinstance(metadata, dict) else metadata
+        return self._ticks[row]
+
+    def _unset(self, row: int, key: str) -> bool:
+        flag = _FLAG_OF.get(key)
+        if flag is not None and self._flags[row] & flag:
+            self._flags[row] &= ~flag
+            if flag == _OBJECTS:
+                self._odd_objects.pop(row, None)
+            elif flag == _METADATA:
+                self._metadata.pop(row, None)
+            return True
+        extra = self._extra.get(row)
+        if extra and key in extra:
+            del extra[key]
+            return True
+        return False
+
+    def _keys(self, row: int) -> List[str]:
+        flags = self._flags[row]
+        keys = [key for key, flag in _FIELDS if flags & flag]
+        keys.extend(self._extra.get(row, ()))
+        return keys
+
+    def has_tag(self, loc: str, tag: str) -> bool:
+        """Whether the room's objects include tag, without decoding the entry."""
+        bit = self.interner.tag_bits.get(tag)
+        row = self._rows.get(loc)
+        return bit is not None and row is not None and bool(self._objects[row] >> bit & 1)
+
+    # --- Pickling (by name: intern tables are per process) ---
+
+    def __getstate__(self):
+        return {"entries": [(loc, [(key, self._read(row, key, None)) for key in self._keys(row)])
+                            for loc, row in self._rows.items()]}
+
+    def __setstate__(self, state):
+        self.__init__()
+        for loc, items in state["entries"]:
+            self[loc] = dict(items)
+
+class CompactEntry(MutableMapping):
+    """Phase 44: Dict-like view of one CompactCognitiveMap row."""
+    __slots__ = ("_map", "_row")
+
+    def __init__(self, cmap: CompactCognitiveMap, row: int):
+        self._map = cmap
+        self._row = row
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._map._read(self._row, key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: str, default=None):
+        return self._map._read(self._row, key, default)
+
+    def __setitem__(self, key: str, value: Any):
+        self._map._unset(self._row, key)
+        self._map._set(self._row, key, value)
+
+    def __delitem__(self, key: str):
+        if not self._map._unset(self._row, key):
+            raise KeyError(key)
+
+    def __contains__(self, key) -> bool:
+        return self._map._read(self._row, key, _MISSING) is not _MISSING
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._map._keys(self._row))
+
+    def __len__(self) -> int:
+        return len(self._map._keys(self._row))
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+_MISSING = object()
@@ -0,0 +1,180 @@
+import os
+import sys
+import ast
+import hashlib
+import argparse
+from typing import Dict, List, Any, Optional, Tuple
+from src.entity import Agent, Object
+
+class StateDigest:
+    """
+    Phase 32: Per-Tick State Digest.
+    After every tick, hashes the state that defines a run's outcome: each World
+    object (type, location, value, requirements) and each agent's energy, location,
+    alive flag, inventory, plan queue and cognitive-map version. The tick digest is
+    chained onto the previous one, so equal digests at tick t mean equal histories.
+    Hashes use blake2b over repr() and are stable across processes (unlike hash()).
+
+    Incremental: the World digest is the sum (mod 2^128) of the entity digests, so
+    only entities that may have changed are re-hashed: agents alive at this or the
+    previous update (metabolism alone changes them every tick) and the objects the
+    World reports in changed_entities (added, removed or edited). A World seen for the
+    first time is hashed in full.
+    """
+
+    MASK = (1 << 128) - 1
+
+    def __init__(self, keep_history: bool = True):
+        self.keep_history = keep_history
+        self.chain = ""
+        self.ticks: List[str] = []                  # Chained digest after each tick
+        self.entities: Dict[str, str] = {}          # Latest per-entity digest
+        self.states: Dict[str, Tuple] = {}          # Latest per-entity state (for diffs)
+        self.total = 0                              # Sum of the entity digests
+        self.world = None                           # World whose changes are tracked
+        self.live: List[str] = []                   # Agents alive at the last update
+
+    @staticmethod
+    def entity_state(entity) -> Tuple:
+        if isinstance(entity, Agent):
+            return (
+                "agent", entity.energy, entity.location_id, entity.is_alive,
+                tuple(obj.id for obj in entity.inventory),
+                tuple((a.type.name, a.target_id) for a in entity.plan_queue),
+                entity.map_version,
+            )
+        if isinstance(entity, Object):
+            return ("object", entity.type.name, entity.location_id, entity.value,
+                    entity.required_agents, entity.tool_required, entity.tool_type)
+        return ("entity", type(entity).__name__)
+
+    @staticmethod
+    def _hash(data: str) -> str:
+        return hashlib.blake2b(data.encode(), digest_size=16).hexdigest()
+
+    def update(self, sim) -> str:
+        world = sim.world
+        if world is not self.world or world.changed_entities is None:
+            self.world, world.changed_entities = world, set()
+            self.entities, self.states, self.total = {}, {}, 0
+            touched = list(world.entities)
+        else:
+            touched = self.live + list(world.changed_entities)
+            world.changed_entities.clear()
+        for e_id in touched:
+            self._refresh(e_id, world.entities.get(e_id))
+        self.live = [a_id for a_id, agent in world.agents.items() if agent.is_alive]
+        self.chain = StateDigest._hash(f"{self.chain}#{sim.tick_count}#{self.total:032x}")
+        if self.keep_history:
+            self.ticks.append(self.chain)
+        return self.chain
+
+    def _refresh(self, e_id: str, entity):
+        """Re-hashes one entity (None = removed) and updates the running total."""
+        old = self.entities.get(e_id)
+        if entity is None:
+            if old is not None:
+                self.total = (self.total - int(old, 16)) & StateDigest.MASK
+                del self.entities[e_id], self.states[e_id]
+            return
+        state = StateDigest.entity_state(entity)
+        if old is not None and self.states[e_id] == state:
+            return
+        new = StateDigest._hash(repr((e_id, state)))
+        self.total = (self.total + int(new, 16) - (int(old, 16) if old is not None else 0)) & StateDigest.MASK
+        self.entities[e_id], self.states[e_id] = new, state
+
+    @staticmethod
+    def diff(a: "StateDigest", b: "StateDigest") -> Dict[str, Dict[str, Any]]:
+        """Entities whose latest state differs: {entity_id: {"reference": state, "candidate": state}}."""
+        differing = {}
+        for e_id in sorted(set(a.entities) | set(b.entities)):
+            if a.entities.get(e_id) != b.entities.get(e_id):
+                differing[e_id] = {"reference": a.states.get(e_id), "candidate": b.states.get(e_id)}
+        return differing
+
+def compare_runs(factory, ticks: int, reference: Optional[Dict[str, Any]] = None,
+                 candidate: Optional[Dict[str, Any]] = None, seed: int = 42,
+                 **params) -> Dict[str, Any]:
+    """
+    Runs the same scenario under two Simulation configurations in lockstep and
+    stops at the first tick whose digests differ.
+    reference/candidate: extra Simulation options (e.g. {"decision_workers": 2}).
+    Keys of the form "Class.ATTR" override class constants for that side only, as in
+    SweepRunner grids (e.g. {"AgentPlanner.BUDGET": 50}, {"AgentCommunication.DELTA_SYNC":
+    False}); they are set while that side is built and while it ticks (MindPool workers
+    forked at build time inherit them), and restored afterwards.
+    Returns {"equivalent", "ticks", "divergent_tick", "entities"}.
+    """
+    from src.sweep import SweepRunner
+
+    sides = []
+    for options in (reference or {}, candidate or {}):
+        overrides = {k: v for k, v in options.items() if "." in k}
+        for key in overrides:
+            if key.split(".", 1)[0] not in SweepRunner.TUNABLE_CLASSES:
+                raise ValueError(f"Unknown tunable class in '{key}'")
+        options = {"headless": True, "log_path": os.devnull, **{k: v for k, v in options.items() if "." not in k}}
+        digest = StateDigest(keep_history=False)
+        saved = SweepRunner._apply_overrides(overrides)
+        try:
+            sides.append((factory(seed=seed, digest=digest, **params, **options), digest, overrides))
+        finally:
+            SweepRunner._apply_overrides(saved)
+    sims = [sim for sim, _, _ in sides]
+    digests = [digest for _, digest, _ in sides]
+    try:
+        for _ in range(ticks):
+            for sim, _, overrides in sides:
+                saved = SweepRunner._apply_overrides(overrides)
+                try:
+                    sim.tick()
+                finally:
+                    SweepRunner._apply_overrides(saved)
+            if digests[0].chain != digests[1].chain:
+                return {
+                    "equivalent": False,
+                    "ticks": sims[0].tick_count,
+                    "divergent_tick": sims[0].tick_count - 1,
+                    "entities": StateDigest.diff(digests[0], digests[1]),
+                }
+        return {"equivalent": True, "ticks": sims[0].tick_count, "divergent_tick": None, "entities": {}}
+    finally:
+        for sim in sims:
+            sim.close()
+
+def _parse_options(pairs: List[str]) -> Dict[str, Any]:
+    options = {}
+    for pair in pairs or []:
+        key, _, value = pair.partition("=")
+        try:
+            options[key] = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            options[key] = value
+    return options
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from src.scenarios import Scenarios
+
+    parser = argparse.ArgumentParser(description="Checks that two engine configurations produce identical runs")
+    parser.add_argument("--scenario", default="foraging", help="Scenarios factory name")
+    parser.add_argument("--ticks", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--param", nargs="*", default=[], help="Scenario params, key=value")
+    parser.add_argument("--reference", nargs="*", default=[], help="Reference Simulation options or Class.ATTR, key=value")
+    parser.add_argument("--candidate", nargs="*", default=[], help="Candidate Simulation options or Class.ATTR, key=value")
+    args = parser.parse_args(argv)
+
+    factory = getattr(Scenarios, args.scenario)
+    result = compare_runs(factory, args.ticks, _parse_options(args.reference), _parse_options(args.candidate),
+                          seed=args.seed, **_parse_options(args.param))
+    if result["equivalent"]:
+        print(f"Equivalent for {result['ticks']} ticks.")
+        return 0
+    print(f"Diverged at tick {result['divergent_tick']} ({len(result['entities'])} entities differ):")
+    for e_id, states in result["entities"].items():
+        print(f"  {e_id}\n    reference: {states['reference']}\n    candidate: {states['candidate']}")
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
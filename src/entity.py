@@ -1,4 +1,5 @@
 import uuid
+import random
 from dataclasses import dataclass, field
 from typing import List, Dict, Set, Any, Optional
 from enum import Enum, auto
@@ -35,14 +36,24 @@ class Agent(Entity):
     
     # Phase 3: Communication & Mapping
     cognitive_map: Dict[str, Dict[str, Any]] = field(default_factory=dict) # Internal model of world: {loc_id: {data}}
+    map_version: int = 0                                                   # Phase 32: Bumped on every map content change
+    map_changes: Dict[str, int] = field(default_factory=dict)              # Phase 46: loc -> map_version of its last change (oldest first)
+    map_sent: Dict[str, int] = field(default_factory=dict)                 # Phase 46: peer id -> map_version last sent to it
+    map_rooms_sent: int = 0                                                # Phase 46: Rooms shipped in MAP_UPDATEs
+    map_rooms_merged: int = 0                                              # Phase 46: Rooms received in MAP_UPDATEs
+    map_merge_seconds: float = 0.0                                         # Phase 46: Time spent merging them
     message_queue: List[Dict[str, Any]] = field(default_factory=list)      # Incoming messages
     
     # Phase 4: Reflection
     action_history: List[Dict[str, Any]] = field(default_factory=list)     # History of actions/results
     reflection_score: Dict[str, float] = field(default_factory=dict)       # Heuristic scores (e.g. {"loc_id_efficiency": 0.5})
+    reflection_version: int = 0                                            # Phase 35: Bumped on every reflection_score write
 
     # Phase 5: Planning
     plan_queue: List[Any] = field(default_factory=list)                    # List[Action] (Sequence of planned actions)
+    plan_budget_hits: int = 0                                              # Phase 40: Searches cut short by AgentPlanner.BUDGET
+    plan_cache_hits: int = 0                                               # Phase 41: Searches reused from the SharedPlanCache
+    plan_cache_misses: int = 0                                             # Phase 41: Searches started and shared
     planned_target: str = None                                             # ID of the current plan's goal
 
     # Phase 6: Social
@@ -71,6 +82,30 @@ class Agent(Entity):
     # Track the last tick updated to help with debugging/synchronization
     last_tick_updated: int = 0
 
+    # Phase 24: Private random stream (assigned by the Simulation from its seed)
+    rng: Optional[random.Random] = field(default=None, repr=False, compare=False)
+
+    # Phase 33: Reusable pieces of the last perception (see AgentMind.perceive)
+    perception_cache: Optional[Dict[str, Any]] = field(default=None, repr=False, compare=False)
+    # Phase 35: Planner reachability tree and goal candidates (see AgentPlanner)
+    plan_cache: Optional[Dict[str, Any]] = field(default=None, repr=False, compare=False)
+    # Phase 36: Secondary indexes over cognitive_map (see MapIndex)
+    map_index: Optional[Any] = field(default=None, repr=False, compare=False)
+    # Phase 38: Region clustering of cognitive_map for long-range planning (see RegionMap)
+    region_map: Optional[Any] = field(default=None, repr=False, compare=False)
+    # Phase 42: Energy prefix sums of the executing plan (see ForwardModel.is_plan_safe)
+    plan_profile: Optional[Any] = field(default=None, repr=False, compare=False)
+
+    def __getstate__(self):
+        # Caches point at other agents / the map; they are rebuilt on next use
+        state = self.__dict__.copy()
+        state["perception_cache"] = None
+        state["plan_cache"] = None
+        state["map_index"] = None
+        state["region_map"] = None
+        state["plan_profile"] = None
+        return state
+
 class ObjectType(Enum):
     FOOD = auto()
     BARRIER = auto()
@@ -92,3 +127,22 @@ class Object(Entity):
     # Phase 20
     tool_required: Optional[str] = None # Name of tool type needed (e.g. "KEY")
     tool_type: Optional[str] = None # If type is TOOL, this is the specific type name (e.g. "KEY")
+
+    # Phase 33: World the object is registered in (set by World.add_entity). Attribute
+    # writes stamp the object's room there, so perception caches see in-place edits.
+    _owner: Optional[Any] = field(default=None, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name, value):
+        owner = self._owner
+        if owner is None or name == "_owner":
+            object.__setattr__(self, name, value)
+            return
+        old_location = self.location_id
+        object.__setattr__(self, name, value)
+        owner.object_changed(self, old_location)
+
+    def __getstate__(self):
+        # Copies (MindPool views, exported minds) are not part of the World
+        state = self.__dict__.copy()
+        state["_owner"] = None
+        return state
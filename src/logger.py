@@ -1,28 +1,39 @@
 import json
 import time
+from collections.abc import Mapping
 from typing import Any, Dict
 
 class Logger:
-    def __init__(self, filepath: str):
+    def __init__(self, filepath: str, enabled: bool = True):
         self.filepath = filepath
+        # Phase 26: A disabled logger never touches the file (headless runs)
+        self.enabled = enabled
+        if not enabled:
+            return
         # Clear file on init
         with open(self.filepath, 'w') as f:
             pass
 
     def log(self, tick: int, event_type: str, data: Dict[str, Any]):
+        if not self.enabled:
+            return
         entry = {
             "tick": tick,
             "timestamp": time.time(),
             "type": event_type,
             **data
         }
+        for key, value in data.items():
+            # Phase 33: Read-only records (Perception) are logged like the dicts they replace
+            if isinstance(value, Mapping) and not isinstance(value, dict):
+                entry[key] = dict(value.items())
         
         def set_default(obj):
             if isinstance(obj, set):
                 return list(obj)
             if hasattr(obj, '__dict__'):
-                # Basic dict representation for custom objects/dataclasses
-                return obj.__dict__
+                # Basic dict representation for custom objects/dataclasses (private links left out)
+                return {key: value for key, value in obj.__dict__.items() if not key.startswith("_")}
             if hasattr(obj, 'name'): # For Enums
                 return obj.name
             return str(obj)
@@ -32,6 +43,8 @@ class Logger:
 
     def log_effect(self, tick: int, effect: Any):
         """Helper to log an Effect object."""
+        if not self.enabled:
+            return
         # Convert dataclass/Effect to dict
         if hasattr(effect, '__dict__'):
             data = effect.__dict__.copy()
@@ -0,0 +1,253 @@
+import heapq
+from typing import Dict, List, Any, Optional, Set, Tuple
+from src.entity import Agent
+
+# Object tags the planner looks for; "ObjectType.X" spellings count as X
+GOAL_TAGS = ("FOOD", "COOP_FOOD", "OBSTACLE")
+_TAG_ALIASES = {tag: tag for tag in GOAL_TAGS}
+_TAG_ALIASES.update({f"ObjectType.{tag}": tag for tag in GOAL_TAGS})
+_HASH_MASK = (1 << 64) - 1
+
+class MapIndex:
+    """
+    Phase 36: Secondary Indexes over a Cognitive Map.
+    Per-agent lookups the planner needs, so goal enumeration costs the number of
+    candidate rooms instead of a full map scan:
+      - rooms by goal tag (FOOD, COOP_FOOD, OBSTACLE)
+      - rooms by tool_type (metadata tools)
+      - frontier: rooms some entry lists as a neighbor but the map has no entry for
+      - a last_tick heap for stale-room queries; stale() drains it up to the threshold
+        and keeps the rooms found, so a rising threshold only pays for new stale rooms
+    CognitiveMap marks entries dirty on every write (touch / observe); dirty entries
+    are re-indexed on the next query. Results come back in map order, like a scan
+    would produce them. Map entries are never deleted (new entries are appended).
+
+    Phase 38: If `changes` is set to a dict (RegionMap does), sync also records the
+    rooms that were added or whose neighbors changed, each with the rooms that listed
+    it as a frontier until now ({} if none). The consumer empties it.
+
+    Phase 41: fingerprint() hashes what the planner reads from the map (order, neighbors,
+    objects, requesters, tool and obstacle types; not last_tick) so agents with equal
+    knowledge can share search state. Computed on first use, then kept up to date
+    per re-indexed entry.
+    """
+
+    def __init__(self, cognitive_map: Dict[str, Dict[str, Any]]):
+        self.map = cognitive_map
+        self.position: Dict[str, int] = {}               # loc -> insertion order in the map
+        self.dirty: Set[str] = set()
+        self.tags: Dict[str, Dict[str, None]] = {tag: {} for tag in GOAL_TAGS}
+        self.tools: Dict[str, Dict[str, None]] = {}      # tool_type -> rooms
+        self.entry_tags: Dict[str, Tuple[str, ...]] = {}
+        self.entry_tools: Dict[str, Tuple[str, ...]] = {}
+        self.entry_neighbors: Dict[str, Tuple[str, ...]] = {}
+        self.referrers: Dict[str, Dict[str, int]] = {}   # frontier room -> {entry listing it: neighbor index}
+        self.first_mention: Dict[str, Tuple[int, int]] = {} # frontier room -> min (position, index) of its referrers
+        self.frontier_list: Optional[List[str]] = None    # frontiers() result, until referrers change
+        self.ticks: Dict[str, int] = {}                  # loc -> last_tick (missing = 0)
+        self.tick_heap: List[Tuple[int, str]] = []       # Not yet drained by stale()
+        self.stale_before: Optional[int] = None          # Threshold of the last stale() query
+        self.stale_rooms: Dict[str, None] = {}           # Rooms with last_tick below it
+        self.stale_list: Optional[List[str]] = None      # stale_rooms in map order, until they change
+        self.changes: Optional[Dict[str, Dict[str, int]]] = None # Phase 38: topology log
+        self.entry_hashes: Optional[Dict[str, int]] = None        # Phase 41: fingerprint terms
+        self.total_hash = 0
+        self._build()
+
+    def _build(self):
+        """Bulk version of _reindex for every entry of the map."""
+        cognitive_map = self.map
+        self.position = {loc: i for i, loc in enumerate(cognitive_map)}
+        self.ticks = {loc: entry.get("last_tick", 0) for loc, entry in cognitive_map.items()}
+        self.tick_heap = [(tick, loc) for loc, tick in self.ticks.items()]
+        heapq.heapify(self.tick_heap)
+        referrers, first_mention = self.referrers, self.first_mention
+        for loc, entry in cognitive_map.items():
+            neighbors = entry.get("neighbors")
+            if neighbors:
+                self.entry_neighbors[loc] = tuple(neighbors)
+                for i, n in enumerate(neighbors):
+                    if n not in cognitive_map:
+                        referrers.setdefault(n, {}).setdefault(loc, i)
+                        first_mention.setdefault(n, (self.position[loc], i))
+            if entry.get("objects"):
+                self._index_tags(loc, entry)
+            metadata = entry.get("metadata")
+            if metadata and metadata.get("tools"):
+                self._index_tools(loc, entry)
+        self.frontier_list = list(referrers) # A map-order scan meets each frontier first at its first mention
+
+    def _index_tags(self, loc: str, entry: Dict[str, Any]):
+        tags = tuple(sorted({_TAG_ALIASES[o] for o in entry.get("objects") or () if o in _TAG_ALIASES}))
+        if tags != self.entry_tags.get(loc, ()):
+            for tag in self.entry_tags.get(loc, ()):
+                del self.tags[tag][loc]
+            for tag in tags:
+                self.tags[tag][loc] = None
+            self.entry_tags[loc] = tags
+
+    def _index_tools(self, loc: str, entry: Dict[str, Any]):
+        tool_types = tuple(sorted({t.get("tool_type") for t in entry.get("metadata", {}).get("tools", [])
+                                   if t.get("tool_type") is not None}))
+        if tool_types != self.entry_tools.get(loc, ()):
+            for tool_type in self.entry_tools.get(loc, ()):
+                del self.tools[tool_type][loc]
+            for tool_type in tool_types:
+                self.tools.setdefault(tool_type, {})[loc] = None
+            self.entry_tools[loc] = tool_types
+
+    # --- Maintenance ---
+
+    @staticmethod
+    def get(agent: Agent) -> "MapIndex":
+        """The agent's index, synced with its map (rebuilt if the map object was replaced)."""
+        index = agent.map_index
+        if index is None or index.map is not agent.cognitive_map or len(index.position) > len(agent.cognitive_map):
+            index = agent.map_index = MapIndex(agent.cognitive_map)
+        index.sync()
+        return index
+
+    @staticmethod
+    def mark(agent: Agent, loc_id: Optional[str]):
+        """Called by CognitiveMap on writes. loc_id=None drops the index (full rebuild)."""
+        index = agent.map_index
+        if index is None:
+            return
+        if loc_id is None:
+            agent.map_index = None
+        else:
+            index.dirty.add(loc_id)
+
+    def sync(self):
+        self._extend()
+        if self.dirty:
+            for loc in self.dirty:
+                self._reindex(loc)
+            self.dirty.clear()
+        if len(self.tick_heap) > 2 * len(self.ticks) + 64:
+            self.tick_heap = [(tick, loc) for loc, tick in self.ticks.items()]
+            heapq.heapify(self.tick_heap)
+
+    def _extend(self):
+        """Positions (and indexes) entries appended to the map since the last sync."""
+        missing = len(self.map) - len(self.position)
+        if missing <= 0:
+            return
+        new = []
+        for loc in reversed(self.map):
+            if len(new) == missing:
+                break
+            new.append(loc)
+        for loc in reversed(new):
+            self.position[loc] = len(self.position)
+            self.dirty.add(loc)
+            if self.changes is not None:
+                self.changes.setdefault(loc, {})
+
+    def _reindex(self, loc: str):
+        entry = self.map.get(loc)
+        if entry is None or loc not in self.position:
+            return
+        refs = self.referrers.pop(loc, None) # Known now, no longer a frontier
+        if refs:
+            del self.first_mention[loc]
+            self.frontier_list = None
+            if self.changes is not None:
+                self.changes.setdefault(loc, {}).update(refs)
+
+        self._index_tags(loc, entry)
+        self._index_tools(loc, entry)
+
+        neighbors = tuple(entry.get("neighbors", ()))
+        if neighbors != self.entry_neighbors.get(loc, ()):
+            position, first_mention = self.position[loc], self.first_mention
+            for n in self.entry_neighbors.get(loc, ()):
+                refs = self.referrers.get(n)
+                if refs is not None and refs.pop(loc, None) is not None:
+                    if not refs:
+                        del self.referrers[n]
+                        del first_mention[n]
+                    elif first_mention[n][0] == position:
+                        first_mention[n] = min((self.position[r], i) for r, i in refs.items())
+            for i, n in enumerate(neighbors):
+                if n not in self.map:
+                    refs = self.referrers.setdefault(n, {})
+                    if loc not in refs:
+                        refs[loc] = i
+                        if n not in first_mention or (position, i) < first_mention[n]:
+                            first_mention[n] = (position, i)
+            self.entry_neighbors[loc] = neighbors
+            self.frontier_list = None
+            if self.changes is not None:
+                self.changes.setdefault(loc, {})
+
+        tick = entry.get("last_tick", 0)
+        if self.ticks.get(loc) != tick:
+            self.ticks[loc] = tick
+            heapq.heappush(self.tick_heap, (tick, loc))
+            if loc in self.stale_rooms and tick >= self.stale_before:
+                del self.stale_rooms[loc]
+                self.stale_list = None
+
+        if self.entry_hashes is not None:
+            new_hash = self._entry_hash(loc, entry)
+            self.total_hash = (self.total_hash - self.entry_hashes.get(loc, 0) + new_hash) & _HASH_MASK
+            self.entry_hashes[loc] = new_hash
+
+    def _entry_hash(self, loc: str, entry: Dict[str, Any]) -> int:
+        metadata = entry.get("metadata") or {}
+        return hash((self.position[loc], loc, tuple(entry.get("neighbors", ())), tuple(entry.get("objects") or ()),
+                     entry.get("requester_id"),
+                     tuple(o.get("tool_required") for o in metadata.get("obstacles", ())),
+                     tuple(t.get("tool_type") for t in metadata.get("tools", ()))))
+
+    # --- Queries (call MapIndex.get first) ---
+
+    def rooms_with(self, tags) -> List[str]:
+        """Rooms carrying any of the given goal tags, in map order."""
+        rooms = set()
+        for tag in tags:
+            rooms.update(self.tags[tag])
+        return sorted(rooms, key=self.position.__getitem__)
+
+    def first_tool_room(self, tool_type: str) -> Optional[str]:
+        """The first room (map order) whose metadata lists a tool of this type."""
+        rooms = self.tools.get(tool_type)
+        return min(rooms, key=self.position.__getitem__) if rooms else None
+
+    def frontiers(self) -> List[str]:
+        """
+        Unknown neighbor rooms, ordered by their first mention in a map-order scan.
+        Kept until an entry's neighbors change, so plan-cache misses on an unchanged
+        topology do not sort them again; first mentions are kept up to date on writes,
+        so a re-sort does not scan the referrers. Callers must not mutate it.
+        """
+        if self.frontier_list is None:
+            self.frontier_list = sorted(self.referrers, key=self.first_mention.__getitem__)
+        return self.frontier_list
+
+    def fingerprint(self) -> Tuple[int, int]:
+        """Phase 41: (content hash, entry count) of the map as the planner sees it."""
+        if self.entry_hashes is None:
+            self.entry_hashes = {loc: self._entry_hash(loc, entry) for loc, entry in self.map.items()}
+            self.total_hash = sum(self.entry_hashes.values()) & _HASH_MASK
+        return self.total_hash, len(self.entry_hashes)
+
+    def stale(self, before: int) -> List[str]:
+        """Rooms whose last_tick is below `before`, in map order. Callers must not mutate it."""
+        if self.stale_before is not None and before < self.stale_before:
+            # Threshold moved back: drained rooms may no longer qualify, start over
+            self.tick_heap = [(tick, loc) for loc, tick in self.ticks.items()]
+            heapq.heapify(self.tick_heap)
+            self.stale_rooms = {}
+            self.stale_list = None
+        self.stale_before = before
+        heap, ticks, rooms = self.tick_heap, self.ticks, self.stale_rooms
+        while heap and heap[0][0] < before:
+            tick, loc = heapq.heappop(heap)
+            if ticks.get(loc) == tick and loc not in rooms:
+                rooms[loc] = None
+                self.stale_list = None
+        if self.stale_list is None:
+            self.stale_list = sorted(rooms, key=self.position.__getitem__)
+        return self.stale_list
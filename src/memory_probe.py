@@ -0,0 +1,118 @@
+import os
+import sys
+import json
+import tracemalloc
+from enum import Enum
+from typing import Dict, List, Any, Optional
+from src.entity import Object
+
+class MemoryProbe:
+    """
+    Phase 29: Memory-Growth Instrumentation.
+    Every `interval` ticks, records tracemalloc totals plus the deep size of the
+    agent structures that grow over long runs, and appends one JSON line per
+    sample to a time series next to the run log (<log>.mem.jsonl).
+    Sizes are sys.getsizeof summed over the reachable containers of each field;
+    objects shared between fields of one agent are counted once per field.
+    A run logging to os.devnull has no series file unless `path` is given; samples
+    are still kept in `samples`. With decision_workers the minds live in the pool, so
+    the agent sizes are those of the main-process mirrors, not of the workers.
+    """
+
+    AGENT_FIELDS = (
+        "cognitive_map", "action_history", "stories", "social_map", "message_queue",
+        "spatial_patterns", "goal_history", "memory",
+    )
+
+    def __init__(self, interval: int = 50, path: Optional[str] = None, top_allocations: int = 5,
+                 per_agent: bool = True):
+        self.interval = max(1, interval)
+        self.path = path # Defaults to <log_path>.mem.jsonl when attached to a Simulation (None for os.devnull)
+        self.top_allocations = top_allocations
+        self.per_agent = per_agent
+        self.samples: List[Dict[str, Any]] = []
+        self._started_tracing = False
+
+    def attach(self, log_path: str):
+        if self.path is None and log_path != os.devnull:
+            self.path = os.path.splitext(log_path)[0] + ".mem.jsonl"
+        if self.path:
+            with open(self.path, "w"):
+                pass
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def maybe_sample(self, sim) -> Optional[Dict[str, Any]]:
+        if sim.tick_count % self.interval != 0:
+            return None
+        return self.sample(sim)
+
+    def sample(self, sim) -> Dict[str, Any]:
+        totals = {name: 0 for name in MemoryProbe.AGENT_FIELDS}
+        agents = {}
+        for agent in sim.world.agents.values():
+            sizes = {name: MemoryProbe.deep_sizeof(getattr(agent, name)) for name in MemoryProbe.AGENT_FIELDS}
+            for name, size in sizes.items():
+                totals[name] += size
+            if self.per_agent:
+                agents[agent.id] = sizes
+
+        record = {
+            "tick": sim.tick_count,
+            "agent_totals": totals,
+            "agent_bytes": sum(totals.values()),
+            "world": {
+                "locations": MemoryProbe.deep_sizeof(sim.world.locations),
+                "entities": len(sim.world.entities),
+                "agents": len(sim.world.agents),
+            },
+        }
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            record["traced_bytes"] = current
+            record["traced_peak"] = peak
+            if self.top_allocations:
+                stats = tracemalloc.take_snapshot().statistics("lineno")[:self.top_allocations]
+                record["top"] = [{"site": str(st.traceback[0]), "bytes": st.size, "count": st.count} for st in stats]
+        if self.per_agent:
+            record["agents"] = agents
+
+        self.samples.append(record)
+        if self.path:
+            with open(self.path, "a") as f:
+                f.write(json.dumps(record) + "\n")
+        return record
+
+    def finish(self):
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @staticmethod
+    def deep_sizeof(obj: Any, seen: Optional[set] = None) -> int:
+        """Approximate retained size of obj and everything it reaches through containers/attributes."""
+        if seen is None:
+            seen = set()
+        stack = [obj]
+        size = 0
+        while stack:
+            o = stack.pop()
+            if id(o) in seen or isinstance(o, (type, Enum)): # Classes and enum members are shared singletons
+                continue
+            seen.add(id(o))
+            size += sys.getsizeof(o)
+            if isinstance(o, dict):
+                stack.extend(o.keys())
+                stack.extend(o.values())
+            elif isinstance(o, (list, tuple, set, frozenset)):
+                stack.extend(o)
+            elif isinstance(o, (str, bytes, int, float, bool, type(None))):
+                continue
+            elif isinstance(o, Object):
+                stack.append(o.__getstate__()) # As copied: no link back to the World
+            elif hasattr(o, "__dict__"):
+                stack.append(o.__dict__)
+            elif hasattr(o, "__slots__"):
+                stack.extend(getattr(o, s) for s in o.__slots__ if hasattr(o, s))
+        return size
@@ -0,0 +1,78 @@
+from typing import Dict, List, Any, Optional, Tuple
+from src.entity import Agent
+from src.world import World
+from src.agent_social import AgentSocial
+from src.agent_communication import AgentCommunication
+
+class MessageBus:
+    """
+    Phase 47: Scoped Message Delivery.
+    Picks the receivers of a message by scope instead of handing it to the whole
+    population, so a send costs the number of relevant receivers:
+      - ROOM: living agents in the sender's room
+      - RADIUS: living agents within `radius` hops (World.agents_near)
+      - TRUSTED: living agents the sender trusts (AgentSocial.TRUST_THRESHOLD)
+      - ALL: every living agent
+    Dead agents and the sender never receive. Each message is built once and the same
+    dict is queued on every receiver. Counts deliveries per tick and per run.
+    """
+
+    ROOM, RADIUS, TRUSTED, ALL = "room", "radius", "trusted", "all"
+
+    # Default (scope, radius) per message type; unlisted types go to ALL
+    SCOPES: Dict[str, Tuple[str, int]] = {
+        "ALARM": (RADIUS, 3),
+        "HELP_CALL": (RADIUS, 3),
+        "PUZZLE_HELP": (RADIUS, 3),
+    }
+
+    def __init__(self):
+        self.tick_stats: Dict[str, List[int]] = {} # msg_type -> [messages, deliveries] this tick
+        self.published = 0
+        self.delivered = 0
+
+    @staticmethod
+    def deliverable(sender: Agent, agents: List[Agent]) -> List[Agent]:
+        """The living agents in agents, other than sender."""
+        return [a for a in agents if a.is_alive and a is not sender]
+
+    def receivers(self, world: World, sender: Agent, scope: str, radius: int = 1) -> List[Agent]:
+        """Living agents other than sender within scope, in World order."""
+        if scope == MessageBus.ROOM:
+            scope, radius = MessageBus.RADIUS, 0
+        if scope == MessageBus.RADIUS:
+            return [a for a, _ in world.agents_near(sender.location_id, radius) if a.is_alive and a is not sender]
+        if scope == MessageBus.TRUSTED:
+            trusted = {a_id for a_id, trust in sender.trust_scores.items() if trust >= AgentSocial.TRUST_THRESHOLD}
+            return [a for a_id, a in world.agents.items() if a_id in trusted and a.is_alive and a is not sender]
+        if scope == MessageBus.ALL:
+            return [a for a in world.agents.values() if a.is_alive and a is not sender]
+        raise ValueError(f"Unknown message scope: {scope}")
+
+    def publish(self, world: World, sender: Agent, msg_type: str, payload: Dict[str, Any],
+                scope: Optional[str] = None, radius: Optional[int] = None,
+                to: Optional[List[Agent]] = None) -> int:
+        """
+        Queues one message on every receiver in scope (default: SCOPES[msg_type]) or on
+        the deliverable agents in `to`. Returns the number of deliveries.
+        """
+        if to is not None:
+            to = MessageBus.deliverable(sender, to)
+        else:
+            default_scope, default_radius = MessageBus.SCOPES.get(msg_type, (MessageBus.ALL, 0))
+            to = self.receivers(world, sender, scope or default_scope,
+                                default_radius if radius is None else radius)
+        AgentCommunication.broadcast(world, sender, to, payload, msg_type=msg_type)
+        self.record(msg_type, len(to))
+        return len(to)
+
+    def record(self, msg_type: str, deliveries: int):
+        """Counts a message sent outside publish (e.g. AgentCommunication.share_map)."""
+        counts = self.tick_stats.setdefault(msg_type, [0, 0])
+        counts[0] += 1
+        counts[1] += deliveries
+        self.published += 1
+        self.delivered += deliveries
+
+    def begin_tick(self):
+        self.tick_stats = {}
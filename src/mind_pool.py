@@ -0,0 +1,269 @@
+import copy
+import time
+import pickle
+import multiprocessing
+from typing import Dict, List, Any, Optional, Tuple
+from src.entity import Agent
+from src.world import World
+from src.agent_mind import AgentMind
+from src.agent_planner import AgentPlanner
+from src.plan_cache import SharedPlanCache
+from src.compact_map import Interner
+from src.profiler import StageProfiler, SpanLog
+from src.agent_meta import AgentMeta
+from src.agent_communication import AgentCommunication
+from src.physics import ActionType
+
+_PROTOCOL = pickle.HIGHEST_PROTOCOL
+
+class MindHost:
+    """
+    Phase 23: Resident Minds.
+    Owns the mind state of a subset of agents and runs the cognitive part of a tick
+    (message processing, reflection, perception, decision) from compact packets.
+    The host never sees the real World, only a local view of the agent's room.
+    """
+
+    def __init__(self):
+        self.minds: Dict[str, Agent] = {}
+        self.plan_cache = SharedPlanCache() # Phase 41: shared by the minds of this host
+        self.interner = Interner() # Phase 44: tables of the compact maps unpickled here
+
+    def step(self, packets: List[bytes]) -> List[bytes]:
+        """
+        Each packet is pickled on its own so minds never share mutable payloads.
+        Phase 28: Spans of profiled packets are returned relative to the start of this call.
+        """
+        origin = time.perf_counter()
+        previous = SharedPlanCache.activate(self.plan_cache)
+        previous_interner = Interner.activate(self.interner)
+        previous_profiler = StageProfiler.current()
+        try:
+            return [pickle.dumps(self._step_one(pickle.loads(p), origin), _PROTOCOL) for p in packets]
+        finally:
+            SharedPlanCache.activate(previous)
+            Interner.activate(previous_interner)
+            StageProfiler.activate(previous_profiler)
+
+    def _step_one(self, packet: Dict[str, Any], origin: float) -> Dict[str, Any]:
+        agent_id = packet["id"]
+        if packet.get("agent") is not None:
+            self.minds[agent_id] = packet["agent"]
+        mind = self.minds[agent_id]
+        # Phase 28: Mind stages are timed here and recorded by the main process
+        spans = SpanLog() if packet.get("profile") else None
+        StageProfiler.activate(spans)
+        if spans: t = time.perf_counter()
+
+        # 1. Body state (authoritative copy lives in the main process)
+        mind.energy, mind.location_id, mind.is_alive, mind.skills, mind.inventory, mind.last_tick_updated = packet["body"]
+
+        # 2. Outcome of last tick's action: plan maintenance + reflection
+        outcome = packet.get("outcome")
+        if outcome:
+            if not outcome["success"] and mind.plan_queue:
+                AgentPlanner.after_failure(mind, outcome["action"])
+                if spans: t = spans.lap("repair", t, agent_id)
+            mind.action_history.append(outcome)
+            AgentMeta.reflect(mind)
+            if spans: t = spans.lap("reflect", t, agent_id)
+
+        # 3. Messages, perception, decision
+        mind.message_queue = packet["messages"]
+        msgs_processed = AgentCommunication.process_messages(mind)
+        if spans: t = spans.lap("process_messages", t, agent_id)
+        perception = AgentMind.perceive(MindHost._build_view(mind, packet["view"]), mind)
+        if spans: t = spans.lap("perceive", t, agent_id)
+
+        # The mind travels with its own rng stream (Phase 24), so worker placement is irrelevant
+        action = AgentMind.decide(mind, perception)
+        if spans: spans.lap("decide", t, agent_id)
+        mind.last_action = action
+
+        result = {
+            "action": action,
+            "msgs": msgs_processed,
+            "perception": perception if packet.get("observe", True) else None,
+            "goal": mind.current_goal,
+            "plan": list(mind.plan_queue),
+            "planned_target": mind.planned_target,
+            "map_version": mind.map_version,
+            "plan_stats": (mind.plan_budget_hits, mind.plan_cache_hits, mind.plan_cache_misses),
+            "merge_stats": (mind.map_rooms_merged, mind.map_merge_seconds),
+        }
+        if action.type == ActionType.COMMUNICATE:
+            # The main process builds broadcast payloads from these
+            result["cognitive_map"] = mind.cognitive_map
+            result["map_changes"] = mind.map_changes
+            result["stories"] = mind.stories
+        if spans:
+            result["spans"] = [(stage, start - origin, end - origin, a_id) for stage, start, end, a_id in spans.spans]
+        if packet.get("report"):
+            result["reflection"] = mind.reflection_score
+            result["trust"] = mind.trust_scores
+        return result
+
+    @staticmethod
+    def _build_view(mind: Agent, view: Tuple) -> World:
+        """Rebuilds the slice of the World that AgentMind.perceive looks at."""
+        radius, object_radius, rooms, objects, others = view
+        world = World()
+        world.perception_radius, world.object_radius = radius, object_radius
+        for loc, neighbors in rooms.items():
+            world.add_location(loc, neighbors)
+        for obj in objects:
+            world.add_entity(obj)
+        for other_id, loc, energy, last_action in others:
+            world.add_entity(Agent(id=other_id, location_id=loc, energy=energy, last_action=last_action))
+        return world
+
+def _worker_main(conn):
+    host = MindHost()
+    while True:
+        request = conn.recv()
+        if request is None:
+            break
+        kind, data = request
+        if kind == "step":
+            conn.send(host.step(data))
+        elif kind == "export":
+            conn.send(pickle.dumps(host.minds, _PROTOCOL))
+    conn.close()
+
+class MindPool:
+    """
+    Phase 23: Parallel Decision Phase.
+    Distributes resident minds over worker processes. Per tick the main process ships
+    each agent's body state, new messages and a local view of its room; workers send
+    back the chosen Action plus the few mind fields the main process needs for logging
+    and broadcasting. World and Physics stay in the main process.
+
+    workers=0 hosts all minds in-process (same protocol, no processes).
+    """
+
+    # Fields owned by the resident mind (see Simulation.sync_minds)
+    MIND_FIELDS = (
+        "memory", "visited_locations", "cognitive_map", "action_history", "reflection_score",
+        "plan_queue", "planned_target", "social_map", "trust_scores", "current_goal",
+        "goal_history", "spatial_patterns", "social_reputations", "stories", "home_location_id",
+        "rng", "map_version", "reflection_version", "map_changes", "map_rooms_merged", "map_merge_seconds",
+    )
+
+    def __init__(self, workers: int):
+        if workers < 0:
+            raise ValueError("workers must be >= 0")
+        self.workers = workers
+        self.assignment: Dict[str, int] = {}
+        self.registered = set()
+        self.pending_outcomes: Dict[str, Dict[str, Any]] = {}
+        self._inline: Optional[MindHost] = MindHost() if workers == 0 else None
+        self._conns = []
+        self._procs = []
+        for _ in range(workers):
+            parent_conn, child_conn = multiprocessing.Pipe()
+            proc = multiprocessing.Process(target=_worker_main, args=(child_conn,), daemon=True)
+            proc.start()
+            child_conn.close()
+            self._conns.append(parent_conn)
+            self._procs.append(proc)
+
+    def decide(self, world: World, agents: List[Agent], report: bool = False, observe: bool = True,
+               profile: bool = False) -> List[Dict[str, Any]]:
+        """
+        Runs message processing, perception and decision for all given agents.
+        report: also return reflection/trust scores. observe: also return perceptions.
+        profile: also return each mind's stage spans ("spans", seconds from the start of
+        its host's batch).
+        """
+        # Snapshot of who stands where, shared by every view this tick
+        occupancy: Dict[str, List[Tuple[int, Agent]]] = {}
+        for rank, other in enumerate(world.agents.values()):
+            if other.is_alive:
+                occupancy.setdefault(other.location_id, []).append((rank, other))
+
+        buckets: List[List[str]] = [[] for _ in range(max(1, self.workers))]
+        packets: List[List[bytes]] = [[] for _ in range(max(1, self.workers))]
+        for agent in agents:
+            slot = self._assign(agent.id)
+            buckets[slot].append(agent.id)
+            packets[slot].append(pickle.dumps(self._packet(world, agent, occupancy, report, observe, profile), _PROTOCOL))
+
+        results: Dict[str, Dict[str, Any]] = {}
+        if self._inline is not None:
+            for agent_id, raw in zip(buckets[0], self._inline.step(packets[0])):
+                results[agent_id] = pickle.loads(raw)
+        else:
+            for slot, conn in enumerate(self._conns):
+                if packets[slot]:
+                    conn.send(("step", packets[slot]))
+            for slot, conn in enumerate(self._conns):
+                if packets[slot]:
+                    for agent_id, raw in zip(buckets[slot], conn.recv()):
+                        results[agent_id] = pickle.loads(raw)
+        return [results[agent.id] for agent in agents]
+
+    def record_outcome(self, agent_id: str, history_entry: Dict[str, Any]):
+        """Queues the result of an applied action for the agent's mind (delivered next tick)."""
+        self.pending_outcomes[agent_id] = history_entry
+
+    def export_minds(self) -> Dict[str, Agent]:
+        """Returns copies of all resident minds."""
+        if self._inline is not None:
+            return copy.deepcopy(self._inline.minds)
+        minds: Dict[str, Agent] = {}
+        for conn in self._conns:
+            conn.send(("export", None))
+        for conn in self._conns:
+            minds.update(pickle.loads(conn.recv()))
+        return minds
+
+    def close(self):
+        for conn in self._conns:
+            try:
+                conn.send(None)
+                conn.close()
+            except (OSError, BrokenPipeError):
+                pass
+        for proc in self._procs:
+            proc.join(timeout=1.0)
+        self._conns = []
+        self._procs = []
+
+    def _assign(self, agent_id: str) -> int:
+        if agent_id not in self.assignment:
+            self.assignment[agent_id] = len(self.assignment) % max(1, self.workers)
+        return self.assignment[agent_id]
+
+    def _packet(self, world: World, agent: Agent, occupancy: Dict[str, List[Tuple[int, Agent]]], report: bool,
+                observe: bool, profile: bool = False) -> Dict[str, Any]:
+        loc = agent.location_id
+        radius, object_radius = world.perception_radius, world.object_radius
+        # Phase 34: The rooms perceive walks (adjacency out to radius - 1 hops) and reads
+        # objects from (own room, plus the rooms within object_radius)
+        hood = world.neighborhood(loc, max(radius, object_radius))
+        limit = max(radius - 1, object_radius, 0)
+        rooms = {room: world.locations[room]["neighbors"] for room, dist in hood.items()
+                 if dist <= limit and room in world.locations}
+        objects = [obj for room, dist in hood.items() if dist <= object_radius for obj in world.get_objects_at(room)]
+        # Keep World registration order, as AgentMind.perceive would see it
+        visible = sorted(pair for room, dist in hood.items() if dist <= radius
+                         for pair in occupancy.get(room, []) if pair[1].id != agent.id)
+        others = [(o.id, o.location_id, o.energy, o.last_action) for _, o in visible]
+
+        messages = list(agent.message_queue)
+        agent.message_queue.clear()
+
+        first_time = agent.id not in self.registered
+        self.registered.add(agent.id)
+        packet = {
+            "id": agent.id,
+            "agent": agent if first_time else None,
+            "body": (agent.energy, loc, agent.is_alive, agent.skills, agent.inventory, agent.last_tick_updated),
+            "outcome": self.pending_outcomes.pop(agent.id, None),
+            "messages": messages,
+            "view": (radius, object_radius, rooms, objects, others),
+            "report": report,
+            "observe": observe,
+            "profile": profile,
+        }
+        return packet
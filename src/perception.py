@@ -0,0 +1,78 @@
+from collections.abc import Mapping
+from typing import Any, Iterator
+
+_KEYS = (
+    "tick", "location", "energy", "visible_food", "visible_hazards", "visible_coop_food",
+    "visible_tools", "visible_obstacles", "neighbors", "visited_neighbors", "visible_agents",
+    "inventory", "distant_objects",
+)
+_INDEX = {key: i for i, key in enumerate(_KEYS)}
+_item = tuple.__getitem__
+
+class Perception(tuple):
+    """
+    Phase 33: Immutable Perception Record.
+    What an agent sensed this tick. A slotted tuple underneath (cheap to build, no
+    per-instance dict), read like the old perception dict: perception["energy"],
+    perception.get("visible_food"), dict(perception). Registered as a Mapping.
+    The lists inside may be shared with the perception cache and must not be mutated;
+    use replace() to derive a modified copy.
+    """
+
+    __slots__ = ()
+    KEYS = _KEYS
+
+    def __new__(cls, tick, location, energy, visible_food, visible_hazards, visible_coop_food,
+                visible_tools, visible_obstacles, neighbors, visited_neighbors, visible_agents, inventory,
+                distant_objects=()):
+        return tuple.__new__(cls, (tick, location, energy, visible_food, visible_hazards, visible_coop_food,
+                                   visible_tools, visible_obstacles, neighbors, visited_neighbors,
+                                   visible_agents, inventory, distant_objects))
+
+    # --- Mapping protocol (keys are the field names) ---
+
+    def __getitem__(self, key: str) -> Any:
+        return _item(self, _INDEX[key])
+
+    def get(self, key: str, default: Any = None) -> Any:
+        i = _INDEX.get(key)
+        return default if i is None else _item(self, i)
+
+    def __contains__(self, key) -> bool:
+        return key in _INDEX
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_KEYS)
+
+    def keys(self):
+        return _KEYS
+
+    def values(self):
+        return tuple(_item(self, slice(None)))
+
+    def items(self):
+        return tuple(zip(_KEYS, _item(self, slice(None))))
+
+    def __eq__(self, other):
+        if isinstance(other, Mapping):
+            return dict(self.items()) == dict(other.items())
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def replace(self, **changes) -> "Perception":
+        values = dict(self.items())
+        values.update(changes)
+        return Perception(**values)
+
+    def __reduce__(self):
+        return (Perception, _item(self, slice(None)))
+
+    def __repr__(self) -> str:
+        return f"Perception({dict(self.items())!r})"
+
+Mapping.register(Perception)
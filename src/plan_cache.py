@@ -0,0 +1,79 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Hashable
+
+class _ActiveCache(threading.local):
+    cache = None # Set while a Simulation (or MindHost) is deciding on this thread
+
+_active = _ActiveCache()
+
+class SharedPlanCache:
+    """
+    Phase 41: Cross-Agent Plan Cache.
+    Planner search state (goal candidates + reachability tree) shared by agents whose
+    knowledge is identical: keyed by a content fingerprint of the cognitive map (see
+    MapIndex.fingerprint), the start room, the rooms the agent will not enter and the
+    planner mode. Goal scores (skills, inventory, reputations) stay per agent, so they
+    are not part of the key. Least recently used entries are evicted past `capacity`.
+    Most searches are never repeated by another agent, so an entry is only stored once
+    its key has missed `min_lookups` times (the misses of not yet stored keys are
+    counted for at most `capacity` keys as well).
+    Like StageProfiler, a cache is made active for the thread while minds decide.
+    """
+
+    CAPACITY = 128
+    MIN_LOOKUPS = 2
+
+    def __init__(self, capacity: Optional[int] = None, min_lookups: Optional[int] = None):
+        self.capacity = capacity if capacity is not None else SharedPlanCache.CAPACITY
+        self.min_lookups = min_lookups if min_lookups is not None else SharedPlanCache.MIN_LOOKUPS
+        self.entries: "OrderedDict[Hashable, Dict[str, Any]]" = OrderedDict()
+        # hash(key) -> misses, for keys not stored yet (a collision only stores an entry early)
+        self.pending: "OrderedDict[int, int]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            pending_key = hash(key)
+            self.pending[pending_key] = self.pending.get(pending_key, 0) + 1
+            self.pending.move_to_end(pending_key)
+            if len(self.pending) > self.capacity:
+                self.pending.popitem(last=False)
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: Hashable, entry: Dict[str, Any]):
+        """Stores entry if its key has missed min_lookups times (see get)."""
+        if key not in self.entries:
+            if self.pending.get(hash(key), 0) < self.min_lookups:
+                return
+            self.pending.pop(hash(key), None)
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "pending": len(self.pending),
+                "size": len(self.entries), "hit_rate": self.hits / lookups if lookups else 0.0}
+
+    # --- Activation ---
+
+    @staticmethod
+    def current() -> Optional["SharedPlanCache"]:
+        return _active.cache
+
+    @staticmethod
+    def activate(cache: Optional["SharedPlanCache"]) -> Optional["SharedPlanCache"]:
+        """Makes cache the active one on this thread. Returns the previous one."""
+        previous = _active.cache
+        _active.cache = cache
+        return previous
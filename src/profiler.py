@@ -0,0 +1,146 @@
+import time
+import functools
+import threading
+from typing import Dict, List, Any, Optional, Tuple
+
+class _ActiveProfiler(threading.local):
+    profiler = None # Set while a profiled Simulation is ticking on this thread
+
+_active = _ActiveProfiler()
+
+class StageProfiler:
+    """
+    Phase 27: Per-Stage Tick Profiler.
+    Low-overhead stage timers with counts and log2 histograms, optionally per agent.
+    The Simulation times its own stages; stages deeper in the mind (goal selection,
+    planning, imagination) are timed by functions decorated with StageProfiler.timed,
+    which cost one thread-local lookup when no profiler is active.
+    """
+
+    BUCKETS = 32 # Bucket b holds durations in [2^(b-1), 2^b) microseconds
+
+    def __init__(self, per_agent: bool = False):
+        self.per_agent = per_agent
+        # stage -> [count, total_seconds, max_seconds, histogram]
+        self.stages: Dict[str, List[Any]] = {}
+        # stage -> {agent_id: [count, total_seconds]}
+        self.agents: Dict[str, Dict[str, List[float]]] = {}
+
+    # --- Recording ---
+
+    def record(self, stage: str, start: float, end: float, agent_id: Optional[str] = None):
+        duration = end - start
+        entry = self.stages.get(stage)
+        if entry is None:
+            entry = self.stages[stage] = [0, 0.0, 0.0, [0] * StageProfiler.BUCKETS]
+        entry[0] += 1
+        entry[1] += duration
+        if duration > entry[2]:
+            entry[2] = duration
+        entry[3][min(int(duration * 1e6).bit_length(), StageProfiler.BUCKETS - 1)] += 1
+        if self.per_agent and agent_id is not None:
+            per = self.agents.setdefault(stage, {}).setdefault(agent_id, [0, 0.0])
+            per[0] += 1
+            per[1] += duration
+
+    def counter(self, name: str, value: float, agent_id: Optional[str] = None):
+        """Samples a gauge (queue sizes, plan lengths). Only trace recorders keep these."""
+        pass
+
+    def finish(self):
+        """Called at the end of Simulation.run (e.g. to write output files)."""
+        pass
+
+    def lap(self, stage: str, start: float, agent_id: Optional[str] = None) -> float:
+        """Records start->now under stage and returns now (start of the next stage)."""
+        now = time.perf_counter()
+        self.record(stage, start, now, agent_id)
+        return now
+
+    # --- Activation (for stages inside the mind) ---
+
+    @staticmethod
+    def current() -> Optional["StageProfiler"]:
+        return _active.profiler
+
+    @staticmethod
+    def activate(profiler: Optional["StageProfiler"]) -> Optional["StageProfiler"]:
+        """Makes profiler the active one on this thread. Returns the previous one."""
+        previous = _active.profiler
+        _active.profiler = profiler
+        return previous
+
+    @staticmethod
+    def timed(stage: str):
+        """Decorator for functions whose first argument is the Agent."""
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(agent, *args, **kwargs):
+                profiler = _active.profiler
+                if profiler is None:
+                    return fn(agent, *args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return fn(agent, *args, **kwargs)
+                finally:
+                    profiler.record(stage, start, time.perf_counter(), agent.id)
+            return wrapper
+        return decorator
+
+    # --- Reporting ---
+
+    @staticmethod
+    def _percentile(histogram: List[int], count: int, q: float) -> float:
+        """Upper bound (seconds) of the histogram bucket holding quantile q."""
+        target = q * count
+        seen = 0
+        for bucket, n in enumerate(histogram):
+            seen += n
+            if seen >= target and n:
+                return (1 << bucket) / 1e6
+        return 0.0
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        result = {}
+        for stage, (count, total, peak, histogram) in self.stages.items():
+            result[stage] = {
+                "count": count,
+                "total_s": total,
+                "mean_us": total / count * 1e6 if count else 0.0,
+                "p50_us": StageProfiler._percentile(histogram, count, 0.50) * 1e6,
+                "p95_us": StageProfiler._percentile(histogram, count, 0.95) * 1e6,
+                "p99_us": StageProfiler._percentile(histogram, count, 0.99) * 1e6,
+                "max_us": peak * 1e6,
+                "histogram": list(histogram),
+            }
+            if stage in self.agents:
+                result[stage]["agents"] = {a_id: {"count": c, "total_s": t} for a_id, (c, t) in self.agents[stage].items()}
+        return result
+
+    def report(self, top_agents: int = 3) -> str:
+        """Human-readable table, slowest stages first. Percentiles are bucket upper bounds."""
+        lines = [f"{'stage':<18}{'count':>9}{'total ms':>11}{'mean us':>10}{'p50 us':>9}{'p95 us':>9}{'p99 us':>9}{'max us':>10}"]
+        stats = self.stats()
+        for stage in sorted(stats, key=lambda s: stats[s]["total_s"], reverse=True):
+            st = stats[stage]
+            lines.append(f"{stage:<18}{st['count']:>9}{st['total_s'] * 1e3:>11.2f}{st['mean_us']:>10.1f}"
+                         f"{st['p50_us']:>9.0f}{st['p95_us']:>9.0f}{st['p99_us']:>9.0f}{st['max_us']:>10.0f}")
+            if "agents" in st and top_agents:
+                slowest = sorted(st["agents"].items(), key=lambda kv: kv[1]["total_s"], reverse=True)[:top_agents]
+                for a_id, a_st in slowest:
+                    lines.append(f"  {a_id:<16}{a_st['count']:>9}{a_st['total_s'] * 1e3:>11.2f}")
+        return "\n".join(lines)
+
+class SpanLog(StageProfiler):
+    """
+    Phase 28: Raw span buffer. Keeps (stage, start, end, agent_id) per record and no
+    aggregates, so spans timed where the main profiler is out of reach (a MindPool
+    worker) can be shipped back and recorded there.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.spans: List[Tuple[str, float, float, Optional[str]]] = []
+
+    def record(self, stage: str, start: float, end: float, agent_id: Optional[str] = None):
+        self.spans.append((stage, start, end, agent_id))
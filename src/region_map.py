@@ -0,0 +1,157 @@
+from collections import deque
+from typing import Dict, List, Optional, Set, Tuple
+from src.entity import Agent
+from src.map_index import MapIndex
+
+class RegionMap:
+    """
+    Phase 38: Region Hierarchy over a Cognitive Map.
+    Partitions the known rooms into connected regions of at most REGION_SIZE rooms
+    (grown breadth-first in map order) for the planner's "hierarchical" mode:
+      - gates(rid): one crossing (room in rid, room in the other region) per
+        neighboring region
+      - table(entry): BFS distances and parents from a room to every room of its
+        region, plus the unknown rooms they list (frontiers); cached per region
+    Rooms merged into the map later join a neighboring region with space left, or
+    open a new one. A region's version moves when one of its rooms (or a room next
+    to it) changes neighbors, which drops its gates and tables. Rooms below the
+    planner's safety threshold are never entered.
+    """
+
+    REGION_SIZE = 256
+
+    def __init__(self, index: MapIndex):
+        self.index = index
+        self.map = index.map
+        self.region_of: Dict[str, int] = {}
+        self.members: List[List[str]] = []
+        self.versions: List[int] = []
+        self.blocked: Set[str] = set()
+        self.layouts: Dict[int, Tuple[int, Dict[str, List[str]], List[Tuple[str, str]]]] = {}
+        self.tables: Dict[str, Tuple[int, Dict[str, int], Dict[str, Optional[str]]]] = {}
+        index.changes = {}
+        self._build()
+
+    def _build(self):
+        cmap, region_of, cap = self.map, self.region_of, self.REGION_SIZE
+        for seed in cmap:
+            if seed in region_of:
+                continue
+            rid = len(self.members)
+            region = [seed]
+            region_of[seed] = rid
+            queue = deque([seed])
+            while queue and len(region) < cap:
+                for n in cmap[queue.popleft()].get("neighbors", ()):
+                    if n in cmap and n not in region_of:
+                        region_of[n] = rid
+                        region.append(n)
+                        queue.append(n)
+                        if len(region) == cap:
+                            break
+            self.members.append(region)
+            self.versions.append(0)
+
+    # --- Maintenance ---
+
+    @staticmethod
+    def get(agent: Agent, blocked: Set[str]) -> "RegionMap":
+        """The agent's regions, synced with its map and the rooms it will not enter."""
+        index = MapIndex.get(agent)
+        regions = agent.region_map
+        if regions is None or regions.index is not index:
+            regions = agent.region_map = RegionMap(index)
+        regions.sync()
+        if blocked != regions.blocked:
+            regions.blocked = set(blocked)
+            regions.layouts.clear()
+            regions.tables.clear()
+        return regions
+
+    def sync(self):
+        changes = self.index.changes
+        if not changes:
+            return
+        region_of, versions = self.region_of, self.versions
+        for loc, refs in changes.items():
+            rid = region_of.get(loc)
+            if rid is None:
+                rid = self._assign(loc, refs)
+            versions[rid] += 1
+            for r in refs:
+                if r in region_of:
+                    versions[region_of[r]] += 1
+        changes.clear()
+
+    def _assign(self, loc: str, refs: Dict[str, int]) -> int:
+        """Puts a newly known room into an adjacent region with space left, else a new one."""
+        for n in list(self.map[loc].get("neighbors", ())) + list(refs):
+            rid = self.region_of.get(n)
+            if rid is not None and len(self.members[rid]) < self.REGION_SIZE:
+                break
+        else:
+            rid = len(self.members)
+            self.members.append([])
+            self.versions.append(0)
+        self.region_of[loc] = rid
+        self.members[rid].append(loc)
+        return rid
+
+    # --- Queries (call RegionMap.get first) ---
+
+    def region_for(self, loc: str) -> Optional[int]:
+        """The region of a room; an unknown room counts in the region of its first referrer."""
+        rid = self.region_of.get(loc)
+        if rid is None:
+            refs = self.index.referrers.get(loc)
+            if refs:
+                rid = self.region_of.get(next(iter(refs)))
+        return rid
+
+    def gates(self, rid: int) -> List[Tuple[str, str]]:
+        return self._layout(rid)[2]
+
+    def _layout(self, rid: int) -> Tuple[int, Dict[str, List[str]], List[Tuple[str, str]]]:
+        """(version, adjacency inside the region incl. unknown rooms, gates), cached per version."""
+        cached = self.layouts.get(rid)
+        if cached is not None and cached[0] == self.versions[rid]:
+            return cached
+        cmap, region_of, blocked = self.map, self.region_of, self.blocked
+        adjacency, found = {}, {}
+        for u in self.members[rid]:
+            inside = adjacency[u] = []
+            for v in cmap[u].get("neighbors", ()):
+                if v in blocked:
+                    continue
+                other = region_of.get(v)
+                if other == rid or (other is None and v not in cmap):
+                    inside.append(v)
+                elif other is not None and other not in found and u not in blocked:
+                    found[other] = (u, v)
+        cached = self.layouts[rid] = (self.versions[rid], adjacency, list(found.values()))
+        return cached
+
+    def table(self, entry: str, keep: bool = True) -> Tuple[Dict[str, int], Dict[str, Optional[str]]]:
+        """BFS (distances, parents) from entry within its region. keep=False skips the cache."""
+        rid = self.region_of[entry]
+        cached = self.tables.get(entry)
+        if cached is not None and cached[0] == self.versions[rid]:
+            return cached[1], cached[2]
+        adjacency = self._layout(rid)[1]
+        dist = {entry: 0}
+        parent: Dict[str, Optional[str]] = {entry: None}
+        frontier = [entry]
+        d = 0
+        while frontier:
+            d += 1
+            next_frontier = []
+            for curr in frontier:
+                for n in adjacency.get(curr, ()): # Unknown rooms have no row: reached, not expanded
+                    if n not in dist:
+                        dist[n] = d
+                        parent[n] = curr
+                        next_frontier.append(n)
+            frontier = next_frontier
+        if keep:
+            self.tables[entry] = (self.versions[rid], dist, parent)
+        return dist, parent
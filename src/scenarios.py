@@ -0,0 +1,108 @@
+import math
+from typing import List
+from src.sim import Simulation
+from src.world import World
+from src.entity import Agent, Object, ObjectType
+
+class Scenarios:
+    """
+    Phase 25: Standard Scenario Factories.
+    Reusable world builders for sweeps, benchmarks and equivalence checks.
+    Every factory takes (seed, log_path, **params) and returns a ready Simulation;
+    placement randomness comes from the Simulation's own rng so a scenario is
+    fully determined by its seed.
+    """
+
+    @staticmethod
+    def grid_world(world: World, width: int, height: int) -> List[str]:
+        """Adds a width x height 4-connected grid of rooms. Returns room IDs row by row."""
+        rooms = [f"R{x}_{y}" for y in range(height) for x in range(width)]
+        for y in range(height):
+            for x in range(width):
+                neighbors = []
+                if x > 0: neighbors.append(f"R{x-1}_{y}")
+                if x < width - 1: neighbors.append(f"R{x+1}_{y}")
+                if y > 0: neighbors.append(f"R{x}_{y-1}")
+                if y < height - 1: neighbors.append(f"R{x}_{y+1}")
+                world.add_location(f"R{x}_{y}", neighbors)
+        return rooms
+
+    @staticmethod
+    def foraging(seed: int = 42, log_path: str = "simulation.log", agents: int = 4, width: int = 4,
+                 height: int = 4, food: int = 6, food_value: int = 30, hazards: int = 1,
+                 coop_food: int = 1, energy: int = 80, **sim_options) -> Simulation:
+        """Grid world with scattered food, hazards and cooperative resources."""
+        sim = Simulation(log_path=log_path, seed=seed, **sim_options)
+        rooms = Scenarios.grid_world(sim.world, width, height)
+        rng = sim.rng
+
+        for i in range(food):
+            sim.world.add_entity(Object(id=f"Food{i}", type=ObjectType.FOOD, value=food_value, location_id=rng.choice(rooms)))
+        for i in range(hazards):
+            sim.world.add_entity(Object(id=f"Hazard{i}", type=ObjectType.HAZARD, value=10, location_id=rng.choice(rooms)))
+        for i in range(coop_food):
+            sim.world.add_entity(Object(id=f"Mammoth{i}", type=ObjectType.COOP_FOOD, value=100,
+                                        required_agents=2, location_id=rng.choice(rooms)))
+        for i in range(agents):
+            sim.world.add_entity(Agent(id=f"Agent{i}", name=f"Agent{i}", location_id=rng.choice(rooms), energy=energy))
+        return sim
+
+    @staticmethod
+    def scaling(seed: int = 42, log_path: str = "simulation.log", agents: int = 10, locations: int = 100,
+                objects: int = 20, energy: int = 100, perception_radius: int = 1, object_radius: int = 0,
+                **sim_options) -> Simulation:
+        """
+        Phase 30: Scale scenario for benchmarks. A near-square grid of about `locations`
+        rooms with a mixed object population (food, hazards, tools, obstacles, coop food).
+        Phase 34: perception_radius / object_radius set the World's perception range.
+        """
+        sim = Simulation(log_path=log_path, seed=seed, **sim_options)
+        sim.world.perception_radius = perception_radius
+        sim.world.object_radius = object_radius
+        width = max(1, int(math.ceil(math.sqrt(locations))))
+        height = max(1, int(math.ceil(locations / width)))
+        rooms = Scenarios.grid_world(sim.world, width, height)
+        rng = sim.rng
+
+        for i in range(objects):
+            roll = rng.random()
+            loc = rng.choice(rooms)
+            if roll < 0.6:
+                obj = Object(id=f"Food{i}", type=ObjectType.FOOD, value=30, location_id=loc)
+            elif roll < 0.7:
+                obj = Object(id=f"Hazard{i}", type=ObjectType.HAZARD, value=5, location_id=loc)
+            elif roll < 0.8:
+                obj = Object(id=f"Key{i}", type=ObjectType.TOOL, tool_type="KEY", location_id=loc)
+            elif roll < 0.9:
+                obj = Object(id=f"Gate{i}", type=ObjectType.OBSTACLE, tool_required="KEY", location_id=loc)
+            else:
+                obj = Object(id=f"Mammoth{i}", type=ObjectType.COOP_FOOD, value=100, required_agents=2, location_id=loc)
+            sim.world.add_entity(obj)
+        for i in range(agents):
+            sim.world.add_entity(Agent(id=f"Agent{i}", name=f"Agent{i}", location_id=rng.choice(rooms), energy=energy))
+        return sim
+
+    @staticmethod
+    def social(seed: int = 42, log_path: str = "simulation.log", agents: int = 50, width: int = 5,
+               height: int = 5, energy: int = 100, **sim_options) -> Simulation:
+        """
+        Phase 30: Message-heavy scenario. A crowded small world full of coop resources
+        needing more hands than a room usually has (HELP_CALL), hazards (ALARM) and
+        multi-agent puzzles (PUZZLE_HELP).
+        """
+        sim = Simulation(log_path=log_path, seed=seed, **sim_options)
+        rooms = Scenarios.grid_world(sim.world, width, height)
+        rng = sim.rng
+
+        for i, loc in enumerate(rooms):
+            if i % 3 == 0:
+                sim.world.add_entity(Object(id=f"Mammoth{i}", type=ObjectType.COOP_FOOD, value=60,
+                                            required_agents=4, location_id=loc))
+            elif i % 3 == 1:
+                sim.world.add_entity(Object(id=f"Hazard{i}", type=ObjectType.HAZARD, value=2, location_id=loc))
+            else:
+                sim.world.add_entity(Object(id=f"Gate{i}", type=ObjectType.OBSTACLE, required_agents=3, location_id=loc))
+            sim.world.add_entity(Object(id=f"Food{i}", type=ObjectType.FOOD, value=20, location_id=loc))
+        for i in range(agents):
+            sim.world.add_entity(Agent(id=f"Agent{i}", name=f"Agent{i}", location_id=rng.choice(rooms), energy=energy))
+        return sim
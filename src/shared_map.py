@@ -0,0 +1,106 @@
+from collections.abc import Mapping, MutableMapping
+from typing import Dict, Any, Optional, Iterator, Set
+
+class SharedCognitiveMap(MutableMapping):
+    """
+    Phase 45: Structurally Shared Cognitive Map.
+    A {loc_id: entry} map whose entries may be shared with other agents' maps. Each
+    entry is either owned (this agent's own dict) or frozen (listed in `frozen`): handed
+    over by reference from another map in a merge and never written again by anyone.
+    Frozen entries read back as read-only FrozenEntry views whose list and dict values
+    are fresh copies, so nothing reachable from a read reaches the shared entry;
+    CognitiveMap.writable swaps in a private copy before the first write (copy on write). Merging a SharedCognitiveMap
+    into another adopts unknown rooms by reference and skips rooms whose entries are
+    already the same object, so agents that learned the same world hold one copy.
+    """
+
+    __slots__ = ("entries", "frozen") # Only the shared rooms are listed: most rooms are owned
+
+    def __init__(self, entries: Optional[Mapping] = None):
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.frozen: Set[str] = set()
+        if entries:
+            for loc, entry in entries.items():
+                self[loc] = entry
+
+    def __getitem__(self, loc: str):
+        entry = self.entries[loc]
+        return FrozenEntry(entry) if loc in self.frozen else entry
+
+    def get(self, loc: str, default=None):
+        entry = self.entries.get(loc)
+        if entry is None:
+            return default
+        return FrozenEntry(entry) if loc in self.frozen else entry
+
+    def __setitem__(self, loc: str, entry: Mapping):
+        self.entries[loc] = entry if type(entry) is dict else dict(entry)
+        self.frozen.discard(loc)
+
+    def __delitem__(self, loc: str):
+        del self.entries[loc]
+        self.frozen.discard(loc)
+
+    def __contains__(self, loc) -> bool:
+        return loc in self.entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.entries)
+
+    def __reversed__(self) -> Iterator[str]:
+        return reversed(self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __repr__(self) -> str:
+        return f"SharedCognitiveMap({len(self)} rooms, {len(self.frozen)} shared)"
+
+    # --- Sharing ---
+
+    def share(self, loc: str) -> Dict[str, Any]:
+        """The entry for loc, frozen so that it can be handed to another map."""
+        entry = self.entries[loc]
+        self.frozen.add(loc)
+        return entry
+
+    def adopt(self, loc: str, entry: Dict[str, Any]):
+        """Stores a frozen entry by reference (see share)."""
+        self.entries[loc] = entry
+        self.frozen.add(loc)
+
+def _thawed(value: Any) -> Any:
+    """A copy of value's nested lists and dicts (other values are immutable or shared)."""
+    if type(value) is list:
+        return [_thawed(v) if type(v) in (list, dict) else v for v in value]
+    if type(value) is dict:
+        return {k: _thawed(v) if type(v) in (list, dict) else v for k, v in value.items()}
+    return value
+
+class FrozenEntry(Mapping):
+    """Phase 45: Read-only view of a shared entry; list and dict values read back as copies."""
+    __slots__ = ("_entry",)
+
+    def __init__(self, entry: Dict[str, Any]):
+        self._entry = entry
+
+    def __getitem__(self, key: str) -> Any:
+        return _thawed(self._entry[key])
+
+    def get(self, key: str, default=None):
+        value = self._entry.get(key, _MISSING)
+        return default if value is _MISSING else _thawed(value)
+
+    def __contains__(self, key) -> bool:
+        return key in self._entry
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entry)
+
+    def __len__(self) -> int:
+        return len(self._entry)
+
+    def __repr__(self) -> str:
+        return f"FrozenEntry({self._entry!r})"
+
+_MISSING = object()
@@ -1,37 +1,107 @@
 import random
-from typing import Optional, Callable
+import time
+from typing import Optional, Callable, Dict, Any, Tuple
 from src.world import World
 from src.physics import Physics, Action, ActionType
 from src.entity import Agent, Object
 from src.logger import Logger
 from src.agent_mind import AgentMind
+from src.agent_planner import AgentPlanner
 from src.agent_communication import AgentCommunication
 from src.agent_meta import AgentMeta
 from src.agent_social import AgentSocial
+from src.mind_pool import MindPool
+from src.profiler import StageProfiler
+from src.plan_cache import SharedPlanCache
+from src.message_bus import MessageBus
+from src.compact_map import CompactCognitiveMap, Interner
+from src.shared_map import SharedCognitiveMap
+from src.memory_probe import MemoryProbe
+from src.digest import StateDigest
 
 class Simulation:
-    def __init__(self, log_path="simulation.log", seed=42):
+    # Phase 44/45: Cognitive map representation per map_type (dict = plain {loc_id: entry})
+    MAP_TYPES = ("dict", "compact", "shared")
+
+    def __init__(self, log_path="simulation.log", seed=42, decision_workers: Optional[int] = None,
+                 headless: bool = False, profiler: Optional[StageProfiler] = None,
+                 memory_probe: Optional[MemoryProbe] = None, digest: Optional[StateDigest] = None,
+                 map_type: str = "dict"):
+        if map_type not in self.MAP_TYPES:
+            raise ValueError(f"map_type must be one of {self.MAP_TYPES}, got {map_type!r}")
         self.world = World()
-        self.logger = Logger(log_path)
+        # Phase 26: Headless = no event log, no per-tick payloads, only a final summary
+        self.observe = not headless
+        self.logger = Logger(log_path, enabled=self.observe)
+        # Phase 27: Optional stage profiler (None = no timing at all)
+        self.profiler = profiler
+        # Phase 29: Optional memory-growth sampler (writes <log>.mem.jsonl)
+        self.memory_probe = memory_probe
+        if memory_probe:
+            memory_probe.attach(log_path)
+        # Phase 32: Optional per-tick state digest (equivalence checks between engines)
+        self.digest = digest
         self.tick_count = 0
         self.seed = seed
-        random.seed(seed)
+        # Phase 24: Simulation-owned generator (never touches the global `random` state)
+        self.rng = random.Random(seed)
+        
+        # Phase 25: Run metrics (see summary())
+        self.metrics = {"food_eaten": 0, "coop_extractions": 0, "deaths": 0, "decisions": 0}
+        # Phase 41: Planner search state shared by agents with identical knowledge
+        self.plan_cache = SharedPlanCache()
+        # Phase 44/45: Agent maps are converted to map_type when the agent first ticks;
+        # compact maps of this run number rooms in the run's own Interner
+        self.map_type = map_type
+        self.interner = Interner()
+        # Phase 47: Scoped delivery for agent messages
+        self.message_bus = MessageBus()
+        self.death_ticks: Dict[str, int] = {}
         
-    def run(self, max_ticks: int, agent_controller: Optional[Callable[[Agent, World], Action]] = None):
+        # Phase 23: Parallel decision phase (None = classic sequential tick)
+        self.mind_pool = MindPool(decision_workers) if decision_workers is not None else None
+        
+    def run(self, max_ticks: int, agent_controller: Optional[Callable[[Agent, World], Action]] = None) -> Dict[str, Any]:
         """
         Main run loop.
         agent_controller: Function(agent, world) -> Action. 
                           If None, simple random walk is used.
+        Returns the run summary, including throughput (ticks/sec, decisions/sec).
         """
-        print(f"Starting simulation with seed {self.seed} for {max_ticks} ticks.")
+        if self.observe:
+            print(f"Starting simulation with seed {self.seed} for {max_ticks} ticks.")
         
+        start_ticks = self.tick_count
+        start_decisions = self.metrics["decisions"]
+        start = time.perf_counter()
         for _ in range(max_ticks):
             self.tick(agent_controller)
             
             # Check stop condition (all agents dead)
             if not any(a.is_alive for a in self.world.agents.values()):
-                print("All agents dead. Stopping.")
+                if self.observe:
+                    print("All agents dead. Stopping.")
                 break
+        elapsed = time.perf_counter() - start
+        
+        summary = self.summary()
+        summary["engine"] = self.engine_stats()
+        summary["wall_time"] = elapsed
+        summary["ticks_per_sec"] = (self.tick_count - start_ticks) / elapsed if elapsed > 0 else 0.0
+        summary["decisions_per_sec"] = (self.metrics["decisions"] - start_decisions) / elapsed if elapsed > 0 else 0.0
+        if self.memory_probe:
+            if self.tick_count % self.memory_probe.interval != 0:
+                self.memory_probe.sample(self) # Final point of the series
+            self.memory_probe.finish()
+        if self.profiler:
+            self.profiler.finish()
+            summary["profile"] = self.profiler.stats()
+            print(self.profiler.report())
+        if not self.observe:
+            print(f"Headless run (seed {self.seed}): {self.tick_count - start_ticks} ticks in {elapsed:.3f}s | "
+                  f"{summary['ticks_per_sec']:.1f} ticks/s | {summary['decisions_per_sec']:.1f} decisions/s | "
+                  f"alive {summary['alive']}/{summary['agents']}")
+        return summary
 
     def tick(self, agent_controller: Optional[Callable[[Agent, World], Action]] = None):
         """
@@ -46,6 +116,40 @@ class Simulation:
            e. Log
         3. Increment Time
         """
+        if self.mind_pool is not None and agent_controller:
+            raise ValueError("agent_controller is not supported with decision_workers")
+        prof = self.profiler
+        if prof:
+            tick_start = time.perf_counter()
+            previous = StageProfiler.activate(prof)
+        previous_cache = SharedPlanCache.activate(self.plan_cache)
+        previous_interner = Interner.activate(self.interner)
+        self.message_bus.begin_tick()
+        try:
+            # Phase 34: Pick up agents placed by direct location_id assignment
+            self.world.refresh_occupancy()
+            if self.map_type != "dict":
+                self._convert_maps()
+            if self.mind_pool is not None:
+                self._tick_parallel()
+            else:
+                self._tick_serial(agent_controller)
+        finally:
+            SharedPlanCache.activate(previous_cache)
+            Interner.activate(previous_interner)
+            if prof:
+                StageProfiler.activate(previous)
+                prof.record("tick", tick_start, time.perf_counter())
+        if self.observe and self.message_bus.tick_stats:
+            # Phase 47: Per-tick delivery counts ({msg_type: [messages, deliveries]}); the tick just ended
+            self.logger.log(self.tick_count - 1, "MESSAGE_STATS", {"sent": self.message_bus.tick_stats})
+        if self.memory_probe:
+            self.memory_probe.maybe_sample(self)
+        if self.digest:
+            self.digest.update(self)
+
+    def _tick_serial(self, agent_controller: Optional[Callable[[Agent, World], Action]]):
+        prof = self.profiler
         
         # Snapshot agent IDs to iterate safely
         agent_ids = list(self.world.agents.keys())
@@ -55,24 +159,32 @@ class Simulation:
             agent.last_tick_updated = self.tick_count # Sync perception time
             if not agent.is_alive:
                 continue
+            self._ensure_rng(agent)
+            if prof: t = turn_start = time.perf_counter()
 
             # --- 2a. Metabolism ---
             metabolic_effect = Physics.apply_tick_metabolism(self.world, agent)
             self._apply_effect(metabolic_effect)
+            if prof: t = prof.lap("metabolism", t, agent.id)
             
             if not agent.is_alive:
                 continue
             
             # --- 2a. Receive Messages (New Phase 3) ---
+            if prof: prof.counter("message_queue", len(agent.message_queue), agent.id)
+            merged = (agent.map_rooms_merged, agent.map_merge_seconds)
             msgs_processed = AgentCommunication.process_messages(agent)
-            if msgs_processed > 0:
-                 self.logger.log(self.tick_count, "INFO_UPDATE", {"agent_id": agent.id, "msgs": msgs_processed})
+            if prof: t = prof.lap("process_messages", t, agent.id)
+            if msgs_processed > 0 and self.observe:
+                 self.logger.log(self.tick_count, "INFO_UPDATE", self._info_update(agent, msgs_processed, merged))
 
             # --- 2b. Mind: Perceive & Decide ---
             
             # 1. Perceive
             perception = AgentMind.perceive(self.world, agent)
-            self.logger.log(self.tick_count, "PERCEPTION", {"agent_id": agent.id, "data": perception})
+            if prof: t = prof.lap("perceive", t, agent.id)
+            if self.observe:
+                self.logger.log(self.tick_count, "PERCEPTION", {"agent_id": agent.id, "data": perception})
             
             # Track previous plan state to detect new plans
             was_planning = len(agent.plan_queue) > 0
@@ -81,165 +193,363 @@ class Simulation:
             old_goal = agent.current_goal
             
             # 2. Decide
+            if prof: t = time.perf_counter()
             if agent_controller:
                 # Override for manual/testing control
                 action = agent_controller(agent, self.world)
             else:
                 action = AgentMind.decide(agent, perception)
+            if prof:
+                prof.lap("decide", t, agent.id)
+                prof.counter("plan_length", len(agent.plan_queue), agent.id)
+            self.metrics["decisions"] += 1
             
             # Phase 14: Social observation
             agent.last_action = action
             
-            # Phase 7: Goal Switch Logging
-            if old_goal != agent.current_goal:
-                 self.logger.log(self.tick_count, "GOAL_SWITCH", {
-                     "agent_id": agent.id,
-                     "old": old_goal,
-                     "new": agent.current_goal
-                 })
-            
-            # Phase 9: Imagination Abort Logging
-            if was_planning and not agent.plan_queue: 
-                 self.logger.log(self.tick_count, "IMAGINATION_ABORT", {
-                     "agent_id": agent.id,
-                     "reason": "Predicted failure"
-                 })
-            
-            # Check for new plan generation
-            if not was_planning and len(agent.plan_queue) > 0:
-                 self.logger.log(self.tick_count, "PLAN_GENERATED", {
-                     "agent_id": agent.id, 
-                     "target": agent.planned_target, # We need to ensure Planner sets this or Mind sets this? 
-                     # Mind didn't set planned_target in my previous edit. 
-                     # Let's just log length for now, or update Mind to set it.
-                     "steps": len(agent.plan_queue) + 1 # +1 for the current action just invoked?
-                     # Actually decide() pops the first action. So queue has rest. 
-                     # Total steps = len(queue) + 1
-                 })
-                
-            self.logger.log(self.tick_count, "DECISION", {"agent_id": agent.id, "action": str(action.type.name), "target": action.target_id})
+            if self.observe:
+                self._log_decision(agent, action, old_goal, was_planning)
 
             # --- 2c. Apply Action Rule ---
-            action_effect = Physics.apply_action(self.world, agent, action)
-            
-            # Phase 5: Plan Maintenance
-            if not action_effect.success and agent.plan_queue:
-                # Plan failed (e.g. path blocked), clear remainder to trigger re-planning
-                agent.plan_queue = []
-                action_effect.message += " (Plan Aborted)"
-            
-            if action_effect.success and action_effect.action.type == ActionType.COMMUNICATE:
-                 target_id = action_effect.action.target_id
-                 if target_id == "ALARM":
-                      # Phase 13: ALARM CALL
-                      # Signal hazard at current location to everyone!
-                      payload = {"location_id": agent.location_id}
-                      all_agents = list(self.world.agents.values())
-                      AgentCommunication.broadcast(self.world, agent, all_agents, payload, msg_type="ALARM")
-                      self.logger.log(self.tick_count, "ALARM_CHIRP", {"sender": agent.id, "location": agent.location_id})
-                 elif target_id == "HELP_CALL":
-                       # Phase 15: COOP HELP CALL
-                       payload = {"location_id": agent.location_id, "type": "COOP_RESOURCE"}
-                       all_agents = list(self.world.agents.values())
-                       AgentCommunication.broadcast(self.world, agent, all_agents, payload, msg_type="HELP_CALL")
-                       self.logger.log(self.tick_count, "HELP_CALL_SENT", {"sender": agent.id, "location": agent.location_id})
-                 elif target_id and target_id.startswith("PUZZLE_HELP:"):
-                       # Phase 21: Social Puzzle Help
-                       puzzle_id = target_id.split(":")[1]
-                       # Find puzzle metadata
-                       puzzle = self.world.get_entity(puzzle_id)
-                       payload = {
-                           "location_id": agent.location_id,
-                           "puzzle_id": puzzle_id,
-                           "metadata": {
-                               "obstacles": [{
-                                   "id": puzzle.id,
-                                   "tool_required": puzzle.tool_required,
-                                   "required_agents": puzzle.required_agents
-                               }]
-                           }
-                       }
-                       all_agents = list(self.world.agents.values())
-                       AgentCommunication.broadcast(self.world, agent, all_agents, payload, msg_type="PUZZLE_HELP")
-                       self.logger.log(self.tick_count, "PUZZLE_HELP_SENT", {"sender": agent.id, "location": agent.location_id, "puzzle": puzzle_id})
-                 elif target_id.startswith("STORY:"):
-                       # Phase 17: Gossip
-                       real_target_id = target_id.split(":")[1]
-                       if real_target_id in self.world.agents:
-                           receiver = self.world.agents[real_target_id]
-                           story_payload = AgentSocial.select_story_to_tell(agent, real_target_id)
-                           if story_payload:
-                                AgentCommunication.broadcast(self.world, agent, [receiver], story_payload, msg_type="STORY")
-                                self.logger.log(self.tick_count, "STORY_SHARED", {"sender": agent.id, "receiver": real_target_id, "topic": story_payload["topic"]})
-                 elif target_id and target_id in self.world.agents:
-                      # TARGETED SHARE
-                      target_agent = self.world.agents[target_id]
-                      # Identify highest value info (Phase 11)
-                      high_value_payload = AgentSocial.identify_highest_value_info(agent)
-                      if high_value_payload:
-                           # Wrap in a dict format compatible with _merge_map (loc_id: {objects: []})
-                           loc_id = high_value_payload["location_id"]
-                           payload = {loc_id: {"objects": ["FOOD"]}}
-                           AgentCommunication.broadcast(self.world, agent, [target_agent], payload)
-                           self.logger.log(self.tick_count, "ALTRUISTIC_ACTION", {
-                               "sender": agent.id, 
-                               "receiver": target_id, 
-                               "info": high_value_payload
-                           })
-                      else:
-                           # Fallback to whole map
-                           AgentCommunication.broadcast(self.world, agent, [target_agent], agent.cognitive_map)
-                 else:
-                      # Execute Broadcast
-                      payload = agent.cognitive_map
-                      all_agents = list(self.world.agents.values())
-                      AgentCommunication.broadcast(self.world, agent, all_agents, payload)
-                      self.logger.log(self.tick_count, "COMMUNICATION", {"sender": agent.id, "receivers": len(all_agents)-1, "payload_size": len(payload)})
+            action_effect = self._apply_action(agent, action)
 
             # --- 2d. Update World State ---
+            if prof: t = time.perf_counter()
             self._apply_effect(action_effect)
+            if prof: t = prof.lap("apply_effect", t, agent.id)
             
             # --- 2e. History & Reflection (Phase 4) ---
             # Record history
-            history_entry = {
-                "tick": self.tick_count,
-                "action": action_effect.action, # Storing the Action object
-                "success": action_effect.success,
-                "energy_cost": action_effect.energy_cost
-            }
-            agent.action_history.append(history_entry)
+            agent.action_history.append(self._history_entry(action_effect))
             
             # Reflect
             AgentMeta.reflect(agent)
+            if prof: prof.lap("reflect", t, agent.id)
             
-            # Log Reflection if Score Changed (Optional, or just periodic)
-            # For verification, let's log any negative score update? 
-            # Or just log current negative scores occasionally.
-            # Let's log if reflection modified (hard to track diff, so just log "REFLECTION" event periodically)
-            # Log Reflection & Social Status
-            if self.tick_count % 5 == 0:
-                 bad_scores = {k:v for k,v in agent.reflection_score.items() if v < 0}
-                 if bad_scores:
-                      self.logger.log(self.tick_count, "REFLECTION", {"agent_id": agent.id, "avoid_list": bad_scores})
-                 
-                 # Phase 6: Social Log
-                 if agent.trust_scores:
-                      self.logger.log(self.tick_count, "SOCIAL_STATUS", {"agent_id": agent.id, "trust": agent.trust_scores})
+            if self.observe:
+                self._log_status(agent, metabolic_effect, action_effect)
+            if prof: prof.lap("agent", turn_start, agent.id)
 
-            # --- 2f. Log ---
-            self.logger.log_effect(self.tick_count, metabolic_effect)
-            self.logger.log_effect(self.tick_count, action_effect)
-            
-            # Log agent state summary
-            self.logger.log(self.tick_count, "STATE", {
-                "agent_id": agent.id,
-                "loc": agent.location_id,
-                "energy": agent.energy,
-                "alive": agent.is_alive
-            })
+        self.tick_count += 1
 
+    def _tick_parallel(self):
+        """
+        Phase 23: Two-phase tick for the parallel decision mode.
+        1. Metabolism for every agent (main process).
+        2. Messages, perception and decisions for all agents at once (MindPool workers).
+        3. Actions applied in agent order (main process keeps World/Physics authority).
+        Every mind decides against the same post-metabolism snapshot, so the outcome
+        does not depend on how agents are spread across workers.
+        """
+        prof = self.profiler
+        active = []
+        for agent_id in list(self.world.agents.keys()):
+            agent = self.world.agents[agent_id]
+            agent.last_tick_updated = self.tick_count
+            if not agent.is_alive:
+                continue
+            self._ensure_rng(agent)
+            if prof: t = time.perf_counter()
+            metabolic_effect = Physics.apply_tick_metabolism(self.world, agent)
+            self._apply_effect(metabolic_effect)
+            if prof: prof.lap("metabolism", t, agent.id)
+            if agent.is_alive:
+                if prof: prof.counter("message_queue", len(agent.message_queue), agent.id)
+                active.append((agent, metabolic_effect))
+        
+        report = self.observe and self.tick_count % 5 == 0
+        if prof: t = time.perf_counter()
+        results = self.mind_pool.decide(self.world, [a for a, _ in active], report, observe=self.observe,
+                                        profile=prof is not None)
+        if prof:
+            prof.lap("decide.pool", t) # Whole-tick round trip
+            # Phase 28: Mind stages ran in the workers; their spans are offsets from the
+            # start of their worker's batch, which began after t, so they stay within the pool span
+            for result in results:
+                for stage, start, end, agent_id in result.get("spans", ()):
+                    prof.record(stage, t + start, t + end, agent_id)
+        
+        self.metrics["decisions"] += len(results)
+        for (agent, metabolic_effect), result in zip(active, results):
+            merged = (agent.map_rooms_merged, agent.map_merge_seconds)
+            agent.map_rooms_merged, agent.map_merge_seconds = result["merge_stats"]
+            if self.observe:
+                if result["msgs"] > 0:
+                     self.logger.log(self.tick_count, "INFO_UPDATE", self._info_update(agent, result["msgs"], merged))
+                self.logger.log(self.tick_count, "PERCEPTION", {"agent_id": agent.id, "data": result["perception"]})
+            
+            was_planning = len(agent.plan_queue) > 0
+            old_goal = agent.current_goal
+            
+            # Mirror the mind fields the main process reads back
+            action = result["action"]
+            agent.current_goal = result["goal"]
+            agent.plan_queue = result["plan"]
+            agent.planned_target = result["planned_target"]
+            agent.map_version = result["map_version"]
+            agent.plan_budget_hits, agent.plan_cache_hits, agent.plan_cache_misses = result["plan_stats"]
+            if "cognitive_map" in result:
+                agent.cognitive_map = result["cognitive_map"]
+                agent.map_changes = result["map_changes"]
+                agent.stories = result["stories"]
+            if report:
+                agent.reflection_score = result["reflection"]
+                agent.trust_scores = result["trust"]
+            agent.last_action = action
+            if prof: prof.counter("plan_length", len(agent.plan_queue), agent.id)
+            
+            if self.observe:
+                self._log_decision(agent, action, old_goal, was_planning)
+            
+            action_effect = self._apply_action(agent, action)
+            if prof: t = time.perf_counter()
+            self._apply_effect(action_effect)
+            if prof: prof.lap("apply_effect", t, agent.id)
+            
+            # History & reflection happen inside the resident mind next tick
+            self.mind_pool.record_outcome(agent.id, self._history_entry(action_effect))
+            
+            if self.observe:
+                self._log_status(agent, metabolic_effect, action_effect)
+        
         self.tick_count += 1
 
+    def summary(self) -> Dict[str, Any]:
+        """Phase 25: Per-run summary metrics."""
+        survival = [self.death_ticks.get(a_id, self.tick_count) for a_id in self.world.agents]
+        return {
+            "ticks": self.tick_count,
+            "agents": len(survival),
+            "alive": sum(1 for a in self.world.agents.values() if a.is_alive),
+            **self.metrics,
+            # Phase 40: Planner searches cut short by AgentPlanner.BUDGET
+            "plan_budget_hits": sum(a.plan_budget_hits for a in self.world.agents.values()),
+            # Phase 46: Delta map sync
+            "map_rooms_sent": sum(a.map_rooms_sent for a in self.world.agents.values()),
+            "map_rooms_merged": sum(a.map_rooms_merged for a in self.world.agents.values()),
+            # Phase 47: MessageBus totals
+            "messages_sent": self.message_bus.published,
+            "messages_delivered": self.message_bus.delivered,
+            "mean_survival_ticks": sum(survival) / len(survival) if survival else 0.0,
+            "min_survival_ticks": min(survival) if survival else 0,
+        }
+
+    def engine_stats(self) -> Dict[str, Any]:
+        """
+        Phase 41: Counters of how the engine got its results, not of the results: they
+        depend on its configuration (each MindPool worker has its own plan cache), so
+        they are kept out of summary(), which equal runs must agree on.
+        """
+        hits = sum(a.plan_cache_hits for a in self.world.agents.values())
+        misses = sum(a.plan_cache_misses for a in self.world.agents.values())
+        return {
+            # Lookups in the shared plan cache (one per agent-side cache rebuild)
+            "plan_cache_hits": hits,
+            "plan_cache_misses": misses,
+            "plan_cache_hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+        }
+
+    def agent_rng(self, agent_id: str) -> random.Random:
+        """
+        Phase 24: Independent substream for one agent, derived from (seed, agent_id).
+        It does not depend on agent iteration order, worker placement or other
+        Simulations in the same process.
+        """
+        return random.Random(f"{self.seed}:{agent_id}")
+
+    def _ensure_rng(self, agent: Agent):
+        if agent.rng is None:
+            agent.rng = self.agent_rng(agent.id)
+
+    def _convert_maps(self):
+        """Phase 44/45: Gives agents whose map is not of map_type one that is (same rooms)."""
+        for agent in self.world.agents.values():
+            cmap = agent.cognitive_map
+            if self.map_type == "compact":
+                if not (isinstance(cmap, CompactCognitiveMap) and cmap.interner is self.interner):
+                    agent.cognitive_map = CompactCognitiveMap(cmap, interner=self.interner)
+            elif not isinstance(cmap, SharedCognitiveMap):
+                agent.cognitive_map = SharedCognitiveMap(cmap)
+
+    def sync_minds(self):
+        """Phase 23: Copies resident mind state from the MindPool back onto World agents."""
+        if self.mind_pool is None:
+            return
+        previous = Interner.activate(self.interner) # Compact maps come back in this run's tables
+        try:
+            minds = self.mind_pool.export_minds()
+        finally:
+            Interner.activate(previous)
+        for agent_id, mind in minds.items():
+            agent = self.world.agents.get(agent_id)
+            if agent:
+                for name in MindPool.MIND_FIELDS:
+                    setattr(agent, name, getattr(mind, name))
+
+    def close(self):
+        """Releases worker processes (if any)."""
+        if self.mind_pool is not None:
+            self.mind_pool.close()
+
+    def _log_decision(self, agent: Agent, action: Action, old_goal: str, was_planning: bool):
+        # Phase 7: Goal Switch Logging
+        if old_goal != agent.current_goal:
+             self.logger.log(self.tick_count, "GOAL_SWITCH", {
+                 "agent_id": agent.id,
+                 "old": old_goal,
+                 "new": agent.current_goal
+             })
+        
+        # Phase 9: Imagination Abort Logging
+        if was_planning and not agent.plan_queue: 
+             self.logger.log(self.tick_count, "IMAGINATION_ABORT", {
+                 "agent_id": agent.id,
+                 "reason": "Predicted failure"
+             })
+        
+        # Check for new plan generation
+        if not was_planning and len(agent.plan_queue) > 0:
+             self.logger.log(self.tick_count, "PLAN_GENERATED", {
+                 "agent_id": agent.id, 
+                 "target": agent.planned_target, # We need to ensure Planner sets this or Mind sets this? 
+                 # Mind didn't set planned_target in my previous edit. 
+                 # Let's just log length for now, or update Mind to set it.
+                 "steps": len(agent.plan_queue) + 1 # +1 for the current action just invoked?
+                 # Actually decide() pops the first action. So queue has rest. 
+                 # Total steps = len(queue) + 1
+             })
+            
+        self.logger.log(self.tick_count, "DECISION", {"agent_id": agent.id, "action": str(action.type.name), "target": action.target_id})
+
+    def _apply_action(self, agent: Agent, action: Action):
+        """Resolves an action through Physics and runs any communication it triggers."""
+        prof = self.profiler
+        if prof: t = time.perf_counter()
+        action_effect = Physics.apply_action(self.world, agent, action)
+        if prof: t = prof.lap("apply_action", t, agent.id)
+        
+        # Phase 5: Plan Maintenance
+        if not action_effect.success and agent.plan_queue:
+            # Plan failed (e.g. path blocked). Phase 39: try a detour before re-planning
+            if AgentPlanner.after_failure(agent, action_effect.action):
+                action_effect.message += " (Plan Repaired)" if agent.plan_queue else " (Plan Aborted)"
+            if prof: t = prof.lap("repair", t, agent.id) # Not part of the broadcast lap below
+        
+        if action_effect.success and action_effect.action.type == ActionType.COMMUNICATE:
+             self._handle_communication(agent, action_effect.action.target_id)
+             if prof: prof.lap("broadcast", t, agent.id)
+        return action_effect
+
+    def _handle_communication(self, agent: Agent, target_id: Optional[str]):
+         if target_id == "ALARM":
+              # Phase 13: ALARM CALL
+              # Signal hazard at current location to everyone nearby (Phase 47: MessageBus.SCOPES)
+              payload = {"location_id": agent.location_id}
+              receivers = self.message_bus.publish(self.world, agent, "ALARM", payload)
+              self.logger.log(self.tick_count, "ALARM_CHIRP", {"sender": agent.id, "location": agent.location_id, "receivers": receivers})
+         elif target_id == "HELP_CALL":
+               # Phase 15: COOP HELP CALL
+               payload = {"location_id": agent.location_id, "type": "COOP_RESOURCE"}
+               receivers = self.message_bus.publish(self.world, agent, "HELP_CALL", payload)
+               self.logger.log(self.tick_count, "HELP_CALL_SENT", {"sender": agent.id, "location": agent.location_id, "receivers": receivers})
+         elif target_id and target_id.startswith("PUZZLE_HELP:"):
+               # Phase 21: Social Puzzle Help
+               puzzle_id = target_id.split(":")[1]
+               # Find puzzle metadata
+               puzzle = self.world.get_entity(puzzle_id)
+               payload = {
+                   "location_id": agent.location_id,
+                   "puzzle_id": puzzle_id,
+                   "metadata": {
+                       "obstacles": [{
+                           "id": puzzle.id,
+                           "tool_required": puzzle.tool_required,
+                           "required_agents": puzzle.required_agents
+                       }]
+                   }
+               }
+               receivers = self.message_bus.publish(self.world, agent, "PUZZLE_HELP", payload)
+               self.logger.log(self.tick_count, "PUZZLE_HELP_SENT", {"sender": agent.id, "location": agent.location_id, "puzzle": puzzle_id,
+                                                                     "receivers": receivers})
+         elif target_id.startswith("STORY:"):
+               # Phase 17: Gossip
+               real_target_id = target_id.split(":")[1]
+               if real_target_id in self.world.agents:
+                   receiver = self.world.agents[real_target_id]
+                   story_payload = AgentSocial.select_story_to_tell(agent, real_target_id)
+                   if story_payload:
+                        self.message_bus.publish(self.world, agent, "STORY", story_payload, to=[receiver])
+                        self.logger.log(self.tick_count, "STORY_SHARED", {"sender": agent.id, "receiver": real_target_id, "topic": story_payload["topic"]})
+         elif target_id and target_id in self.world.agents:
+              # TARGETED SHARE
+              target_agent = self.world.agents[target_id]
+              # Identify highest value info (Phase 11)
+              high_value_payload = AgentSocial.identify_highest_value_info(agent)
+              if high_value_payload:
+                   # Wrap in a dict format compatible with _merge_map (loc_id: {objects: []})
+                   loc_id = high_value_payload["location_id"]
+                   payload = {loc_id: {"objects": ["FOOD"]}}
+                   self.message_bus.publish(self.world, agent, "MAP_UPDATE", payload, to=[target_agent])
+                   self.logger.log(self.tick_count, "ALTRUISTIC_ACTION", {
+                       "sender": agent.id, 
+                       "receiver": target_id, 
+                       "info": high_value_payload
+                   })
+              else:
+                   # Fallback to the map (Phase 46: what this peer has not been sent yet)
+                   receivers = MessageBus.deliverable(agent, [target_agent])
+                   if receivers:
+                       AgentCommunication.share_map(self.world, agent, receivers)
+                       self.message_bus.record("MAP_UPDATE", len(receivers))
+         else:
+              # Execute Broadcast (Phase 46: per receiver, the rooms it has not been sent yet)
+              receivers = self.message_bus.receivers(self.world, agent, MessageBus.ALL) # Phase 47: living only
+              sent, full = AgentCommunication.share_map(self.world, agent, receivers)
+              self.message_bus.record("MAP_UPDATE", len(receivers))
+              self.logger.log(self.tick_count, "COMMUNICATION", {"sender": agent.id, "receivers": len(receivers),
+                                                                 "payload_size": sent, "full_payload_size": full})
+
+    @staticmethod
+    def _info_update(agent: Agent, msgs: int, merged_before: Tuple[int, float]) -> dict:
+        """INFO_UPDATE event data; merged_before is the agent's merge counters before its messages."""
+        return {"agent_id": agent.id, "msgs": msgs, "merged_rooms": agent.map_rooms_merged - merged_before[0],
+                "merge_ms": round((agent.map_merge_seconds - merged_before[1]) * 1000, 3)}
+
+    def _history_entry(self, action_effect) -> dict:
+        return {
+            "tick": self.tick_count,
+            "action": action_effect.action, # Storing the Action object
+            "success": action_effect.success,
+            "energy_cost": action_effect.energy_cost
+        }
+
+    def _log_status(self, agent: Agent, metabolic_effect, action_effect):
+        # Log Reflection if Score Changed (Optional, or just periodic)
+        # For verification, let's log any negative score update? 
+        # Or just log current negative scores occasionally.
+        # Let's log if reflection modified (hard to track diff, so just log "REFLECTION" event periodically)
+        # Log Reflection & Social Status
+        if self.tick_count % 5 == 0:
+             bad_scores = {k:v for k,v in agent.reflection_score.items() if v < 0}
+             if bad_scores:
+                  self.logger.log(self.tick_count, "REFLECTION", {"agent_id": agent.id, "avoid_list": bad_scores})
+             
+             # Phase 6: Social Log
+             if agent.trust_scores:
+                  self.logger.log(self.tick_count, "SOCIAL_STATUS", {"agent_id": agent.id, "trust": agent.trust_scores})
+
+        # --- 2f. Log ---
+        self.logger.log_effect(self.tick_count, metabolic_effect)
+        self.logger.log_effect(self.tick_count, action_effect)
+        
+        # Log agent state summary
+        self.logger.log(self.tick_count, "STATE", {
+            "agent_id": agent.id,
+            "loc": agent.location_id,
+            "energy": agent.energy,
+            "alive": agent.is_alive
+        })
+
     def _apply_effect(self, effect):
         """
         Commits the effect to the world state.
@@ -254,6 +564,9 @@ class Simulation:
         agent.energy += effect.energy_gain
         
         if agent.energy <= 0:
+            if agent.is_alive:
+                self.metrics["deaths"] += 1
+                self.death_ticks[agent.id] = self.tick_count
             agent.is_alive = False
             self.logger.log(self.tick_count, "DEATH", {"agent_id": agent.id, "reason": "Starvation"})
 
@@ -293,15 +606,18 @@ class Simulation:
         if effect.removed_object_id:
             if effect.action.type == ActionType.CONSUME:
                 self.world.remove_object(effect.removed_object_id)
+                self.metrics["food_eaten"] += 1
             elif effect.action.type == ActionType.EXTRACT:
                 self.world.remove_object(effect.removed_object_id)
-                # Phase 16: List all participants at location
-                participants = [a_id for a_id, a in self.world.agents.items() if a.location_id == agent.location_id and a.is_alive]
-                self.logger.log(self.tick_count, "COOP_EXTRACTION", {
-                    "agent_id": agent.id, 
-                    "object_id": effect.removed_object_id,
-                    "participants": participants
-                })
+                self.metrics["coop_extractions"] += 1
+                if self.observe:
+                    # Phase 16: List all participants at location
+                    participants = [a_id for a_id, a in self.world.agents.items() if a.location_id == agent.location_id and a.is_alive]
+                    self.logger.log(self.tick_count, "COOP_EXTRACTION", {
+                        "agent_id": agent.id, 
+                        "object_id": effect.removed_object_id,
+                        "participants": participants
+                    })
             elif effect.action.type == ActionType.USE:
                 self.world.remove_object(effect.removed_object_id)
                 self.logger.log(self.tick_count, "OBJECT_USED", {"agent_id": agent.id, "object_id": effect.removed_object_id})
@@ -0,0 +1,165 @@
+import os
+import json
+import time
+import signal
+import itertools
+import multiprocessing
+from typing import Callable, Dict, List, Any, Optional, Iterable
+from src.sim import Simulation
+from src.physics import Physics
+from src.agent_mind import AgentMind
+from src.agent_social import AgentSocial
+from src.agent_meta import AgentMeta
+from src.agent_goals import GoalManager
+from src.agent_planner import AgentPlanner
+from src.agent_communication import AgentCommunication
+
+try:
+    import resource
+except ImportError: # Not available on Windows
+    resource = None
+
+class RunTimeout(Exception):
+    pass
+
+class SweepRunner:
+    """
+    Phase 25: Parameter Sweeps & Monte Carlo Runs.
+    Runs a scenario factory over (parameter grid x seeds) in a process pool and
+    streams one summary line per finished run into a JSONL results file.
+
+    Grid keys of the form "Class.ATTR" override class-level constants
+    (e.g. "Physics.MOVE_COST", "AgentMind.SURVIVAL_THRESHOLD"); all other keys are
+    passed to the factory as keyword arguments (e.g. world size, agent count).
+    """
+
+    # Classes whose constants may be overridden from a grid
+    TUNABLE_CLASSES = {
+        "Physics": Physics,
+        "AgentMind": AgentMind,
+        "AgentSocial": AgentSocial,
+        "AgentMeta": AgentMeta,
+        "GoalManager": GoalManager,
+        "AgentPlanner": AgentPlanner, # e.g. "AgentPlanner.BUDGET", "AgentPlanner.MODE"
+        "AgentCommunication": AgentCommunication, # "AgentCommunication.DELTA_SYNC"
+    }
+
+    def __init__(self, scenario_factory: Callable[..., Simulation], param_grid: Dict[str, List[Any]],
+                 seeds: Iterable[int], max_ticks: int, workers: Optional[int] = None,
+                 time_limit: Optional[float] = None, memory_limit_mb: Optional[int] = None,
+                 log_dir: Optional[str] = None):
+        """
+        scenario_factory: Module-level function(seed, log_path, **params) -> Simulation.
+        workers: Pool size (None = cpu count, 0 = run inline in this process).
+        time_limit: Wall-clock seconds per run.
+        memory_limit_mb: Address-space limit per run (worker processes only).
+        log_dir: Keep per-run event logs here (default: discard them).
+        """
+        for key in param_grid:
+            if "." in key and key.split(".", 1)[0] not in SweepRunner.TUNABLE_CLASSES:
+                raise ValueError(f"Unknown tunable class in '{key}'")
+        self.scenario_factory = scenario_factory
+        self.param_grid = param_grid
+        self.seeds = list(seeds)
+        self.max_ticks = max_ticks
+        self.workers = workers
+        self.time_limit = time_limit
+        self.memory_limit_mb = memory_limit_mb
+        self.log_dir = log_dir
+
+    def jobs(self) -> List[Dict[str, Any]]:
+        """Expands the grid into one job per (parameter combination, seed)."""
+        keys = sorted(self.param_grid)
+        combos = itertools.product(*(self.param_grid[k] for k in keys))
+        jobs = []
+        for params in (dict(zip(keys, values)) for values in combos):
+            for seed in self.seeds:
+                run_id = len(jobs)
+                log_path = os.path.join(self.log_dir, f"run_{run_id}.jsonl") if self.log_dir else os.devnull
+                jobs.append({
+                    "run_id": run_id, "factory": self.scenario_factory, "params": params, "seed": seed,
+                    "max_ticks": self.max_ticks, "time_limit": self.time_limit,
+                    "memory_limit_mb": self.memory_limit_mb, "log_path": log_path,
+                })
+        return jobs
+
+    def run(self, results_path: str) -> List[Dict[str, Any]]:
+        """Executes all runs. Each result is appended to results_path as soon as it finishes."""
+        jobs = self.jobs()
+        results = []
+        with open(results_path, "w") as out:
+            if self.workers == 0:
+                stream = (SweepRunner._run_job(job, inline=True) for job in jobs)
+                for record in stream:
+                    SweepRunner._emit(out, record, results)
+            else:
+                # One fresh process per run: class overrides and rlimits never leak
+                with multiprocessing.Pool(self.workers, maxtasksperchild=1) as pool:
+                    for record in pool.imap_unordered(SweepRunner._run_job, jobs):
+                        SweepRunner._emit(out, record, results)
+        return results
+
+    @staticmethod
+    def _emit(out, record: Dict[str, Any], results: List[Dict[str, Any]]):
+        out.write(json.dumps(record) + "\n")
+        out.flush()
+        results.append(record)
+
+    @staticmethod
+    def _run_job(job: Dict[str, Any], inline: bool = False) -> Dict[str, Any]:
+        overrides = {k: v for k, v in job["params"].items() if "." in k}
+        factory_args = {k: v for k, v in job["params"].items() if "." not in k}
+        saved = SweepRunner._apply_overrides(overrides)
+
+        if not inline and job["memory_limit_mb"] and resource is not None:
+            limit = job["memory_limit_mb"] * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, resource.getrlimit(resource.RLIMIT_AS)[1]))
+
+        def on_alarm(signum, frame):
+            raise RunTimeout()
+        timed = job["time_limit"] and hasattr(signal, "setitimer")
+        if timed:
+            previous_handler = signal.signal(signal.SIGALRM, on_alarm)
+            signal.setitimer(signal.ITIMER_REAL, job["time_limit"])
+
+        status = "ok"
+        sim = None
+        start = time.perf_counter()
+        try:
+            sim = job["factory"](seed=job["seed"], log_path=job["log_path"], **factory_args)
+            for _ in range(job["max_ticks"]):
+                sim.tick()
+                if not any(a.is_alive for a in sim.world.agents.values()):
+                    break
+        except RunTimeout:
+            status = "timeout"
+        except MemoryError:
+            status = "memory_limit"
+        except Exception as e:
+            status = f"error: {type(e).__name__}: {e}"
+        finally:
+            if timed:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+                signal.signal(signal.SIGALRM, previous_handler)
+            if sim is not None:
+                sim.close()
+            SweepRunner._apply_overrides(saved)
+
+        record = {
+            "run_id": job["run_id"], "seed": job["seed"], "params": job["params"],
+            "status": status, "wall_time": time.perf_counter() - start,
+        }
+        if sim is not None:
+            record.update(sim.summary())
+        return record
+
+    @staticmethod
+    def _apply_overrides(overrides: Dict[str, Any]) -> Dict[str, Any]:
+        """Sets Class.ATTR constants. Returns the previous values for restoring."""
+        previous = {}
+        for key, value in overrides.items():
+            cls_name, attr = key.split(".", 1)
+            cls = SweepRunner.TUNABLE_CLASSES[cls_name]
+            previous[key] = getattr(cls, attr)
+            setattr(cls, attr, value)
+        return previous
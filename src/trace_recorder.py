@@ -0,0 +1,72 @@
+import os
+import json
+import time
+from typing import Dict, List, Any, Optional
+from src.profiler import StageProfiler
+
+class TraceRecorder(StageProfiler):
+    """
+    Phase 28: Tick Timeline Export.
+    A StageProfiler that also keeps every span and counter sample and writes them
+    as Chrome Trace Event Format JSON (chrome://tracing, Perfetto, speedscope).
+    The Simulation itself runs on thread 0; every agent gets its own thread row so
+    a slow plan or a long broadcast shows up as a wide box on that agent's row.
+    """
+
+    SIM_TRACK = "simulation"
+
+    def __init__(self, path: str, per_agent: bool = True, max_events: Optional[int] = None):
+        super().__init__(per_agent=per_agent)
+        self.path = path
+        self.max_events = max_events # Drop further events once reached (aggregates keep counting)
+        self.events: List[Dict[str, Any]] = []
+        self.dropped = 0
+        self.origin = time.perf_counter()
+        self.tracks: Dict[str, int] = {}
+
+    def _tid(self, agent_id: Optional[str]) -> int:
+        track = agent_id if agent_id is not None else TraceRecorder.SIM_TRACK
+        tid = self.tracks.get(track)
+        if tid is None:
+            tid = self.tracks[track] = len(self.tracks)
+            if self._room(): # Metadata counts against max_events like any other event
+                self.events.append({"name": "thread_name", "ph": "M", "pid": 0, "tid": tid, "args": {"name": track}})
+        return tid
+
+    def _room(self) -> bool:
+        if self.max_events is not None and len(self.events) >= self.max_events:
+            self.dropped += 1
+            return False
+        return True
+
+    def record(self, stage: str, start: float, end: float, agent_id: Optional[str] = None):
+        super().record(stage, start, end, agent_id)
+        tid = self._tid(agent_id)
+        if self._room():
+            self.events.append({
+                "name": stage, "cat": "stage", "ph": "X", "pid": 0, "tid": tid,
+                "ts": (start - self.origin) * 1e6, "dur": (end - start) * 1e6,
+            })
+
+    def counter(self, name: str, value: float, agent_id: Optional[str] = None):
+        if self._room():
+            track = name if agent_id is None else f"{name} [{agent_id}]"
+            self.events.append({
+                "name": track, "ph": "C", "pid": 0,
+                "ts": (time.perf_counter() - self.origin) * 1e6, "args": {name: value},
+            })
+
+    def save(self, path: Optional[str] = None):
+        path = path or self.path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({
+                "traceEvents": self.events,
+                "displayTimeUnit": "ms",
+                "otherData": {"dropped_events": self.dropped},
+            }, f)
+
+    def finish(self):
+        self.save()
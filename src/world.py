@@ -1,11 +1,17 @@
-from typing import Dict, List, Optional
+import itertools
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
 from src.entity import Entity, Agent, Object
 
+_world_ids = itertools.count(1)
+
 class World:
     """
     The World class holds the state of the simulation.
     It separates the static graph (locations) from the dynamic state (entities).
     """
+    HOOD_CACHE = 4096 # Phase 34: Cached k-hop neighborhoods kept (least recently used go first)
+
     def __init__(self):
         # The map graph: location_id -> { "neighbors": [], "objects": [] }
         # Objects here refers to IDs of objects present in the location
@@ -17,21 +23,148 @@ class World:
         # Agent registry: agent_id -> Agent (subset of entities for quick access)
         self.agents: Dict[str, Agent] = {}
 
+        # Phase 33: Version stamps. location_versions[loc] moves whenever the room's
+        # neighbors or object list change, occupancy_versions[loc] whenever an agent is
+        # added to, enters or leaves a room within perception range of loc; uid tells
+        # worlds apart in caches. room_views holds AgentMind.perceive's per-room sensing.
+        self.uid = next(_world_ids)
+        self.location_versions: Dict[str, int] = {}
+        self.occupancy_versions: Dict[str, int] = {}
+        self.watchers: Dict[str, List[str]] = {}     # loc -> rooms that list loc as a neighbor
+        self.room_views: Dict[str, tuple] = {}
+
+        # Phase 34: Perception radius in hops (agents within it are visible; objects
+        # within object_radius are reported as distant objects, 0 = own room only).
+        self.perception_radius = 1
+        self.object_radius = 0
+        # topology_version moves on every add_location; k-hop neighborhoods are cached against it
+        self.topology_version = 0
+        self._hoods: "OrderedDict[Tuple[str, int, bool], Dict[str, int]]" = OrderedDict()
+        self._hoods_stamp: Tuple[int, int] = (0, 0)
+        # Occupancy index: loc -> {agent_id: Agent}, plus where each agent is indexed
+        # and its registration rank (perception lists agents in World order)
+        self.occupants: Dict[str, Dict[str, Agent]] = {}
+        self.agent_locations: Dict[str, str] = {}
+        self.agent_ranks: Dict[str, int] = {}
+        # Phase 32: Ids of entities added, removed or edited in place since StateDigest
+        # last looked (None until a digest starts tracking this World)
+        self.changed_entities: Optional[Set[str]] = None
+
     def add_location(self, loc_id: str, neighbors: List[str] = None):
         """Adds a location node to the world graph."""
         if neighbors is None:
             neighbors = []
+        old = self.locations.get(loc_id)
+        if old is not None:
+            for n in old["neighbors"]:
+                if loc_id in self.watchers.get(n, ()):
+                    self.watchers[n].remove(loc_id)
         self.locations[loc_id] = {
             "neighbors": neighbors,
             "objects": [] # List of Object IDs
         }
+        for n in neighbors:
+            self.watchers.setdefault(n, []).append(loc_id)
+        self.topology_version += 1
+        self.touch_location(loc_id)
+        self.touch_occupancy(loc_id)
+
+    def touch_location(self, loc_id: str):
+        """Phase 33: Marks a room as changed (objects or neighbors)."""
+        self.location_versions[loc_id] = self.location_versions.get(loc_id, 0) + 1
+
+    def location_version(self, loc_id: str) -> int:
+        return self.location_versions.get(loc_id, 0)
+
+    def touch_occupancy(self, loc_id: str):
+        """Phase 33: An agent entered or left loc_id; every room that can see it is stamped."""
+        versions = self.occupancy_versions
+        radius = self.perception_radius
+        if radius > 1:
+            watchers = self.neighborhood(loc_id, radius, reverse=True)
+        else: # The room and, at radius 1, the rooms listing it: no need to build (and cache) a neighborhood
+            watchers = [loc_id] + self.watchers.get(loc_id, []) if radius else [loc_id]
+        for watcher in watchers:
+            versions[watcher] = versions.get(watcher, 0) + 1
+
+    def neighborhood(self, loc_id: str, radius: int, reverse: bool = False) -> Dict[str, int]:
+        """
+        Phase 34: Rooms within `radius` hops of loc_id -> hop distance (loc_id itself is 0),
+        in BFS order. reverse=True follows edges backwards (rooms that can see loc_id).
+        Cached until the topology changes, at most HOOD_CACHE of them (least recently
+        used first out); callers must not mutate the result.
+        """
+        stamp = (self.topology_version, len(self.locations))
+        if stamp != self._hoods_stamp:
+            self._hoods.clear()
+            self._hoods_stamp = stamp
+        key = (loc_id, radius, reverse)
+        hood = self._hoods.get(key)
+        if hood is not None:
+            self._hoods.move_to_end(key)
+        else:
+            hood = {loc_id: 0}
+            frontier = [loc_id]
+            for dist in range(1, radius + 1):
+                next_frontier = []
+                for room in frontier:
+                    if reverse:
+                        adjacent = self.watchers.get(room, ())
+                    else:
+                        adjacent = self.locations.get(room, {}).get("neighbors", ())
+                    for n in adjacent:
+                        if n not in hood:
+                            hood[n] = dist
+                            next_frontier.append(n)
+                frontier = next_frontier
+            self._hoods[key] = hood
+            if len(self._hoods) > World.HOOD_CACHE:
+                self._hoods.popitem(last=False)
+        return hood
+
+    def agents_near(self, loc_id: str, radius: int) -> List[Tuple[Agent, int]]:
+        """Phase 34: (agent, hops) for every indexed agent within radius of loc_id, in World order."""
+        occupants = self.occupants
+        ranks = self.agent_ranks
+        found = []
+        for room, dist in self.neighborhood(loc_id, radius).items():
+            here = occupants.get(room)
+            if here:
+                for agent in here.values():
+                    found.append((ranks[agent.id], agent, dist))
+        found.sort(key=lambda entry: entry[0])
+        return [(agent, dist) for _, agent, dist in found]
+
+    def refresh_occupancy(self):
+        """
+        Phase 34: Re-indexes agents whose location_id was assigned directly instead of
+        through move_agent (tests, tools). The Simulation calls this once per tick.
+        """
+        located = self.agent_locations
+        for agent in self.agents.values():
+            if located.get(agent.id) != agent.location_id or self.occupants[agent.location_id].get(agent.id) is not agent:
+                self._place(agent)
+
+    def _place(self, agent: Agent):
+        if agent.id not in self.agent_ranks:
+            self.agent_ranks[agent.id] = len(self.agent_ranks)
+        old = self.agent_locations.get(agent.id)
+        if old is not None:
+            self.occupants[old].pop(agent.id, None)
+            self.touch_occupancy(old)
+        self.occupants.setdefault(agent.location_id, {})[agent.id] = agent
+        self.agent_locations[agent.id] = agent.location_id
+        self.touch_occupancy(agent.location_id)
 
     def add_entity(self, entity: Entity):
         """Registers an entity in the global state."""
         self.entities[entity.id] = entity
+        if self.changed_entities is not None:
+            self.changed_entities.add(entity.id)
         
         if isinstance(entity, Agent):
             self.agents[entity.id] = entity
+            self._place(entity)
         
         # If it has a location, update the location index
         if hasattr(entity, 'location_id') and entity.location_id in self.locations:
@@ -40,6 +173,9 @@ class World:
              # Design choice: Let's track Objects in location metadata for easy lookup
              if isinstance(entity, Object):
                  self.locations[entity.location_id]["objects"].append(entity.id)
+                 self.touch_location(entity.location_id)
+        if isinstance(entity, Object):
+            entity._owner = self # Phase 33: in-place edits stamp the object's room
 
     def get_entity(self, entity_id: str) -> Optional[Entity]:
         return self.entities.get(entity_id)
@@ -62,6 +198,7 @@ class World:
             # Note: We don't track agents in self.locations["objects"] to keep lists clean,
             # but we could if we wanted spatial hashing. For now, agents track their own loc.
             agent.location_id = new_loc_id
+            self._place(agent)
 
     def unlist_object(self, object_id: str):
         """Removes an object from its location index but keeps it in entities."""
@@ -70,6 +207,7 @@ class World:
             if isinstance(obj, Object) and obj.location_id in self.locations:
                 if object_id in self.locations[obj.location_id]["objects"]:
                     self.locations[obj.location_id]["objects"].remove(object_id)
+                    self.touch_location(obj.location_id)
                 obj.location_id = "" # Now in limbo or inventory
 
     def add_object_to_location(self, object_id: str, loc_id: str):
@@ -80,9 +218,23 @@ class World:
                 obj.location_id = loc_id
                 if object_id not in self.locations[loc_id]["objects"]:
                     self.locations[loc_id]["objects"].append(object_id)
+                    self.touch_location(loc_id)
+
+    def object_changed(self, obj: Object, old_location: str):
+        """Phase 33: Called by Object.__setattr__; stamps the room(s) the object was and is in."""
+        if old_location in self.locations:
+            self.touch_location(old_location)
+        if obj.location_id != old_location and obj.location_id in self.locations:
+            self.touch_location(obj.location_id)
+        if self.changed_entities is not None:
+            self.changed_entities.add(obj.id)
 
     def remove_object(self, object_id: str):
         """Removes an object from existence."""
         self.unlist_object(object_id)
         if object_id in self.entities:
-            del self.entities[object_id]
+            obj = self.entities.pop(object_id)
+            if isinstance(obj, Object):
+                obj._owner = None
+            if self.changed_entities is not None:
+                self.changed_entities.add(object_id)
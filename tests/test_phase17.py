@@ -65,7 +65,7 @@ class TestPhase17(unittest.TestCase):
         
         # Let's force A to decide GOSSIP
         p_a = AgentMind.perceive(sim.world, agent_a)
-        p_a["visible_agents"] = [{"id": agent_b.id, "distance": 0}] # Fake proximity for test logic simplicity if needed
+        p_a = p_a.replace(visible_agents=[{"id": agent_b.id, "distance": 0}]) # Fake proximity for test logic simplicity if needed
         # decide() calls AgentSocial which checks distance 0 agents.
         # Real sim perceive should handle this, provided update_social_map runs or we use simple list.
         # In AgentMind.perceive, visible_agents is populated.
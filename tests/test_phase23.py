@@ -0,0 +1,66 @@
+import unittest
+import os
+from src.sim import Simulation
+from src.entity import Agent, Object, ObjectType
+
+class TestPhase23(unittest.TestCase):
+    def setUp(self):
+        self.log_files = []
+
+    def tearDown(self):
+        for path in self.log_files:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def run_scenario(self, workers, ticks=12):
+        log_file = f"test_phase23_{workers}.jsonl"
+        self.log_files.append(log_file)
+        sim = Simulation(log_path=log_file, seed=7, decision_workers=workers)
+        
+        # Ring of rooms with food, a hazard and a coop resource
+        rooms = [f"R{i}" for i in range(6)]
+        for i, r in enumerate(rooms):
+            sim.world.add_location(r, [rooms[i - 1], rooms[(i + 1) % len(rooms)]])
+        sim.world.add_entity(Object(id="F1", type=ObjectType.FOOD, value=30, location_id="R2"))
+        sim.world.add_entity(Object(id="F2", type=ObjectType.FOOD, value=30, location_id="R4"))
+        sim.world.add_entity(Object(id="H1", type=ObjectType.HAZARD, value=5, location_id="R5"))
+        sim.world.add_entity(Object(id="M1", type=ObjectType.COOP_FOOD, value=80, required_agents=2, location_id="R3"))
+        for i in range(5):
+            sim.world.add_entity(Agent(id=f"A{i}", location_id=rooms[i], energy=45 + i * 10))
+        
+        try:
+            for _ in range(ticks):
+                sim.tick()
+            sim.sync_minds()
+        finally:
+            sim.close()
+        return sim
+
+    def snapshot(self, sim):
+        return {
+            a.id: (a.energy, a.location_id, a.is_alive, a.current_goal, len(a.cognitive_map), len(a.action_history))
+            for a in sim.world.agents.values()
+        }
+
+    def test_results_independent_of_worker_count(self):
+        """Verify the parallel decision phase is deterministic for any number of workers."""
+        inline = self.snapshot(self.run_scenario(0))
+        one = self.snapshot(self.run_scenario(1))
+        three = self.snapshot(self.run_scenario(3))
+        self.assertEqual(inline, one)
+        self.assertEqual(one, three)
+
+    def test_main_process_keeps_world_authority(self):
+        """Verify actions chosen in workers are applied to the main World."""
+        sim = self.run_scenario(2, ticks=20)
+        # Minds were synced back and actually learned the map
+        for agent in sim.world.agents.values():
+            self.assertTrue(agent.cognitive_map)
+            self.assertTrue(agent.action_history)
+        # Someone moved or ate: the world state evolved in the main process
+        moved = [a for a in sim.world.agents.values() if a.location_id != f"R{a.id[1:]}"]
+        eaten = [oid for oid in ("F1", "F2") if oid not in sim.world.entities]
+        self.assertTrue(moved or eaten)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+import os
+import sys
+import random
+import subprocess
+from src.sim import Simulation
+from src.entity import Agent
+
+class TestPhase24(unittest.TestCase):
+    def setUp(self):
+        self.log_files = []
+
+    def tearDown(self):
+        for path in self.log_files:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def build(self, name, seed, agent_order):
+        log_file = f"test_phase24_{name}.jsonl"
+        self.log_files.append(log_file)
+        sim = Simulation(log_path=log_file, seed=seed)
+        # Star world: plenty of random move choices
+        hubs = ["Hub"] + [f"S{i}" for i in range(5)]
+        sim.world.add_location("Hub", hubs[1:])
+        for s in hubs[1:]:
+            sim.world.add_location(s, ["Hub"])
+        for agent_id in agent_order:
+            sim.world.add_entity(Agent(id=agent_id, location_id="Hub", energy=100))
+        return sim
+
+    def trace(self, sim):
+        return {a.id: (a.location_id, a.energy) for a in sim.world.agents.values()}
+
+    def test_interleaved_simulations_do_not_interfere(self):
+        """Verify two Simulations ticking in one process stay reproducible."""
+        alone = self.build("alone", 11, ["A", "B", "C"])
+        for _ in range(10):
+            alone.tick()
+        
+        left = self.build("left", 11, ["A", "B", "C"])
+        right = self.build("right", 99, ["A", "B", "C"])
+        for _ in range(10):
+            left.tick()
+            right.tick()
+            random.random() # Global stream noise must not matter either
+        
+        self.assertEqual(self.trace(alone), self.trace(left))
+
+    def test_agent_stream_independent_of_order(self):
+        """Verify an agent's random choices don't depend on iteration order."""
+        forward = self.build("forward", 5, ["A", "B", "C"])
+        backward = self.build("backward", 5, ["C", "B", "A"])
+        # First move choice of each agent (no interaction yet on tick 0)
+        forward.tick()
+        backward.tick()
+        self.assertEqual(self.trace(forward), self.trace(backward))
+
+    def test_global_random_untouched(self):
+        """Verify Simulation no longer reseeds the global random module."""
+        random.seed(1234)
+        expected = random.random()
+        random.seed(1234)
+        sim = self.build("global", 3, ["A"])
+        sim.tick()
+        self.assertEqual(random.random(), expected)
+
+    def test_outcome_independent_of_hash_seed(self):
+        """Verify a run only depends on its seed, not on the interpreter's string hashing."""
+        script = ("import os; from src.scenarios import Scenarios; from src.digest import StateDigest\n"
+                  "d = StateDigest(); sim = Scenarios.scaling(seed=7, log_path=os.devnull, headless=True, digest=d,"
+                  " agents=20, locations=200, objects=60)\n"
+                  "for _ in range(30): sim.tick()\n"
+                  "print(d.chain)")
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        chains = set()
+        for hash_seed in ("1", "2"):
+            env = dict(os.environ, PYTHONHASHSEED=hash_seed)
+            out = subprocess.run([sys.executable, "-c", script], cwd=root, env=env, capture_output=True, text=True, check=True)
+            chains.add(out.stdout.strip().splitlines()[-1])
+        self.assertEqual(len(chains), 1)
+
+if __name__ == '__main__':
+    unittest.main()
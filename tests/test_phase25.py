@@ -0,0 +1,54 @@
+import unittest
+import os
+import json
+from src.sweep import SweepRunner
+from src.scenarios import Scenarios
+from src.physics import Physics
+
+class TestPhase25(unittest.TestCase):
+    def setUp(self):
+        self.results_file = "test_phase25_results.jsonl"
+
+    def tearDown(self):
+        if os.path.exists(self.results_file):
+            os.remove(self.results_file)
+
+    def test_sweep_streams_results(self):
+        """Verify a grid x seeds sweep produces one summary line per run."""
+        runner = SweepRunner(
+            Scenarios.foraging,
+            {"Physics.MOVE_COST": [3, 6], "agents": [2, 3]},
+            seeds=[1, 2], max_ticks=15, workers=2,
+        )
+        results = runner.run(self.results_file)
+        
+        self.assertEqual(len(results), 8)
+        with open(self.results_file) as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual(len(lines), 8)
+        for record in lines:
+            self.assertEqual(record["status"], "ok")
+            for key in ("mean_survival_ticks", "food_eaten", "coop_extractions", "deaths"):
+                self.assertIn(key, record)
+        self.assertEqual(sorted(r["run_id"] for r in lines), list(range(8)))
+        # Overrides are applied inside the workers only
+        self.assertEqual(Physics.MOVE_COST, 5)
+
+    def test_pool_matches_inline(self):
+        """Verify a run gives the same metrics in a worker and inline."""
+        grid = {"AgentMind.SURVIVAL_THRESHOLD": [40], "width": [3]}
+        pooled = SweepRunner(Scenarios.foraging, grid, seeds=[3], max_ticks=20, workers=1).run(self.results_file)
+        inline = SweepRunner(Scenarios.foraging, grid, seeds=[3], max_ticks=20, workers=0).run(self.results_file)
+        strip = lambda r: {k: v for k, v in r.items() if k != "wall_time"}
+        self.assertEqual(strip(pooled[0]), strip(inline[0]))
+
+    def test_time_limit(self):
+        """Verify a run exceeding its time limit is reported, not lost."""
+        runner = SweepRunner(Scenarios.foraging, {"food": [200], "food_value": [1000]},
+                             seeds=[1], max_ticks=10**6, workers=0, time_limit=0.2)
+        results = runner.run(self.results_file)
+        self.assertEqual(results[0]["status"], "timeout")
+        self.assertGreater(results[0]["ticks"], 0)
+
+if __name__ == '__main__':
+    unittest.main()
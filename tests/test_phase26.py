@@ -0,0 +1,32 @@
+import unittest
+import os
+from src.scenarios import Scenarios
+
+class TestPhase26(unittest.TestCase):
+    def setUp(self):
+        self.log_file = "test_phase26.jsonl"
+
+    def tearDown(self):
+        if os.path.exists(self.log_file):
+            os.remove(self.log_file)
+
+    def test_headless_writes_nothing(self):
+        """Verify headless mode produces no event log."""
+        sim = Scenarios.foraging(seed=3, log_path=self.log_file, headless=True)
+        summary = sim.run(max_ticks=20)
+        self.assertFalse(os.path.exists(self.log_file))
+        self.assertGreater(summary["ticks_per_sec"], 0)
+        self.assertGreater(summary["decisions_per_sec"], 0)
+        self.assertGreater(summary["decisions"], 0)
+
+    def test_headless_same_outcome(self):
+        """Verify turning observation off doesn't change the simulated outcome."""
+        observed = Scenarios.foraging(seed=3, log_path=self.log_file)
+        headless = Scenarios.foraging(seed=3, log_path=self.log_file, headless=True)
+        a = observed.run(max_ticks=25)
+        b = headless.run(max_ticks=25)
+        for key in ("ticks", "alive", "food_eaten", "coop_extractions", "deaths", "decisions"):
+            self.assertEqual(a[key], b[key])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+import os
+from src.scenarios import Scenarios
+from src.profiler import StageProfiler
+from src.sim import Simulation
+from src.entity import Agent
+from src.physics import Action, ActionType
+
+class TestPhase27(unittest.TestCase):
+    def test_stage_timers(self):
+        """Verify tick stages and decide sub-stages are timed."""
+        profiler = StageProfiler(per_agent=True)
+        sim = Scenarios.foraging(seed=4, headless=True, profiler=profiler)
+        summary = sim.run(max_ticks=15)
+        
+        stats = summary["profile"]
+        for stage in ("tick", "metabolism", "process_messages", "perceive", "decide",
+                      "decide.goal", "decide.plan", "apply_action", "apply_effect", "reflect"):
+            self.assertIn(stage, stats)
+        self.assertEqual(stats["tick"]["count"], summary["ticks"])
+        self.assertEqual(stats["decide"]["count"], summary["decisions"])
+        self.assertEqual(sum(stats["decide"]["histogram"]), stats["decide"]["count"])
+        self.assertIn("Agent0", stats["decide"]["agents"])
+        self.assertIn("decide.plan", profiler.report())
+        # Profiler is only active while the Simulation ticks
+        self.assertIsNone(StageProfiler.current())
+
+    def test_disabled_by_default(self):
+        """Verify no timing happens without a profiler."""
+        sim = Scenarios.foraging(seed=4, headless=True)
+        summary = sim.run(max_ticks=5)
+        self.assertNotIn("profile", summary)
+
+    def test_repair_has_own_stage(self):
+        """Verify plan repair after a failed move is timed as "repair", not as broadcast."""
+        profiler = StageProfiler()
+        sim = Simulation(log_path=os.devnull, headless=True, profiler=profiler)
+        sim.world.add_location("A", ["B"])
+        sim.world.add_location("B", ["A"])
+        agent = Agent(id="Me", location_id="A")
+        sim.world.add_entity(agent)
+        agent.plan_queue = [Action(ActionType.MOVE, target_id="B")]
+        sim._apply_action(agent, Action(ActionType.MOVE, target_id="Nowhere"))
+        self.assertEqual(profiler.stats()["repair"]["count"], 1)
+        self.assertNotIn("broadcast", profiler.stats())
+
+if __name__ == '__main__':
+    unittest.main()
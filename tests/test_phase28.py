@@ -0,0 +1,71 @@
+import unittest
+import os
+import json
+from src.scenarios import Scenarios
+from src.trace_recorder import TraceRecorder
+
+class TestPhase28(unittest.TestCase):
+    def setUp(self):
+        self.trace_file = "test_phase28_trace.json"
+
+    def tearDown(self):
+        if os.path.exists(self.trace_file):
+            os.remove(self.trace_file)
+
+    def test_trace_event_export(self):
+        """Verify a run produces a loadable Trace Event Format file."""
+        recorder = TraceRecorder(self.trace_file)
+        sim = Scenarios.foraging(seed=8, agents=3, headless=True, profiler=recorder)
+        sim.run(max_ticks=10)
+        
+        with open(self.trace_file) as f:
+            trace = json.load(f)
+        events = trace["traceEvents"]
+        spans = [e for e in events if e["ph"] == "X"]
+        counters = [e for e in events if e["ph"] == "C"]
+        names = {e["args"]["name"] for e in events if e["ph"] == "M"}
+        
+        self.assertIn("simulation", names)
+        self.assertIn("Agent0", names)
+        self.assertEqual(len([e for e in spans if e["name"] == "tick"]), 10)
+        for stage in ("agent", "perceive", "decide", "decide.plan", "apply_action"):
+            self.assertTrue(any(e["name"] == stage for e in spans), stage)
+        self.assertTrue(any(e["name"].startswith("message_queue") for e in counters))
+        self.assertTrue(any(e["name"].startswith("plan_length") for e in counters))
+        # Spans are well-formed and nested inside their tick
+        ticks = [(e["ts"] - 1e-3, e["ts"] + e["dur"] + 1e-3) for e in spans if e["name"] == "tick"] # Float slack, in µs
+        for e in spans:
+            self.assertGreaterEqual(e["dur"], 0)
+            if e["name"] != "tick":
+                self.assertTrue(any(start <= e["ts"] and e["ts"] + e["dur"] <= end for start, end in ticks), e)
+
+    def test_parallel_trace_has_mind_stages(self):
+        """Verify a decision_workers run traces each mind's stages, inside the pool round trip."""
+        recorder = TraceRecorder(self.trace_file)
+        sim = Scenarios.foraging(seed=8, agents=3, headless=True, profiler=recorder, decision_workers=1)
+        try:
+            sim.run(max_ticks=5)
+        finally:
+            sim.close()
+        spans = [e for e in recorder.events if e["ph"] == "X"]
+        pools = [(e["ts"] - 1e-3, e["ts"] + e["dur"] + 1e-3) for e in spans if e["name"] == "decide.pool"]
+        self.assertEqual(len(pools), 5)
+        agent_track = recorder.tracks["Agent0"]
+        for stage in ("perceive", "decide", "decide.plan", "process_messages"):
+            mine = [e for e in spans if e["name"] == stage and e["tid"] == agent_track]
+            self.assertTrue(mine, stage)
+            for e in mine:
+                self.assertTrue(any(start <= e["ts"] and e["ts"] + e["dur"] <= end for start, end in pools), e)
+        self.assertEqual(recorder.stats()["decide"]["count"], sim.metrics["decisions"])
+
+    def test_event_cap(self):
+        """Verify max_events bounds memory but keeps aggregates."""
+        recorder = TraceRecorder(self.trace_file, max_events=50)
+        sim = Scenarios.foraging(seed=8, agents=3, headless=True, profiler=recorder)
+        sim.run(max_ticks=10)
+        self.assertLessEqual(len(recorder.events), 50)
+        self.assertGreater(recorder.dropped, 0)
+        self.assertEqual(recorder.stats()["tick"]["count"], 10)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+import os
+import json
+from src.scenarios import Scenarios
+from src.memory_probe import MemoryProbe
+
+class TestPhase29(unittest.TestCase):
+    def setUp(self):
+        self.log_file = "test_phase29.jsonl"
+        self.mem_file = "test_phase29.mem.jsonl"
+
+    def tearDown(self):
+        for path in (self.log_file, self.mem_file):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_memory_time_series(self):
+        """Verify periodic per-agent structure sizes are written next to the log."""
+        probe = MemoryProbe(interval=5, top_allocations=3)
+        sim = Scenarios.foraging(seed=2, log_path=self.log_file, food=30, food_value=60, memory_probe=probe)
+        sim.run(max_ticks=20)
+        
+        with open(self.mem_file) as f:
+            samples = [json.loads(line) for line in f]
+        self.assertEqual([s["tick"] for s in samples][:4], [5, 10, 15, 20])
+        first, last = samples[0], samples[-1]
+        for field in ("cognitive_map", "action_history", "stories", "social_map", "message_queue", "spatial_patterns"):
+            self.assertIn(field, last["agent_totals"])
+            self.assertIn(field, last["agents"]["Agent0"])
+        # action_history grows every tick
+        self.assertGreater(last["agent_totals"]["action_history"], first["agent_totals"]["action_history"])
+        self.assertIn("traced_bytes", last)
+        self.assertTrue(last["top"])
+
+    def test_devnull_run_keeps_samples_in_memory(self):
+        """Verify a run logging to os.devnull writes no series file."""
+        probe = MemoryProbe(interval=5, top_allocations=0)
+        sim = Scenarios.foraging(seed=2, log_path=os.devnull, headless=True, memory_probe=probe)
+        sim.run(max_ticks=10)
+        self.assertIsNone(probe.path)
+        self.assertEqual([s["tick"] for s in probe.samples], [5, 10])
+
+    def test_deep_sizeof_counts_shared_once(self):
+        """Verify shared sub-structures are not double counted."""
+        shared = list(range(100))
+        once = MemoryProbe.deep_sizeof({"a": shared})
+        twice = MemoryProbe.deep_sizeof({"a": shared, "b": shared})
+        self.assertLess(twice - once, MemoryProbe.deep_sizeof(shared))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+import unittest
+from benchmarks.bench_engine import run_case, compare, PRESETS
+from src.scenarios import Scenarios
+
+class TestPhase30(unittest.TestCase):
+    def test_run_case_metrics(self):
+        """Verify a benchmark case reports throughput, stages, memory and log volume."""
+        result = run_case(Scenarios.scaling, {"agents": 3, "locations": 16, "objects": 4}, ticks=3)
+        self.assertEqual(result["ticks_run"], 3)
+        self.assertGreater(result["ticks_per_sec"], 0)
+        self.assertIn("perceive", result["stage_mean_us"])
+        self.assertGreater(result["peak_memory_bytes"], 0)
+        self.assertGreater(result["log_bytes_per_tick"], 0)
+
+    def test_compare_flags_regressions(self):
+        """Verify slower throughput or bigger memory beyond tolerance is a regression."""
+        baseline = {"cases": {"c": {"ticks_per_sec": 100.0, "peak_memory_bytes": 1000, "log_bytes_per_tick": 50}}}
+        ok = {"cases": {"c": {"ticks_per_sec": 90.0, "peak_memory_bytes": 1100, "log_bytes_per_tick": 50}}}
+        bad = {"cases": {"c": {"ticks_per_sec": 50.0, "peak_memory_bytes": 2000, "log_bytes_per_tick": 50}}}
+        self.assertEqual(compare(ok, baseline), [])
+        self.assertEqual(len(compare(bad, baseline)), 2)
+
+    def test_presets_cover_scales(self):
+        """Verify the presets span the agent/location scales we track."""
+        params = [p for preset in PRESETS.values() for (_, p, _) in preset.values()]
+        self.assertTrue(any(p.get("agents") == 10_000 for p in params))
+        self.assertTrue(any(p.get("locations") == 1_000_000 for p in params))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+from debug_planner import make_map, bench, check_plan, reference_distances
+from src.entity import Agent
+from src.physics import Action, ActionType
+
+class TestPhase31(unittest.TestCase):
+    def test_synthetic_maps(self):
+        """Verify chain/grid/random maps are connected with the requested densities."""
+        chain = make_map("chain", 50, food=0.0)
+        self.assertEqual(chain["L10"]["neighbors"], ["L9", "L11"])
+        self.assertFalse(any("FOOD" in d["objects"] for d in chain.values()))
+        grid = make_map("grid", 100, food=1.0, stale=1.0)
+        self.assertEqual(sorted(grid["L11"]["neighbors"]), ["L1", "L10", "L12", "L21"])
+        self.assertTrue(all("FOOD" in d["objects"] and d["last_tick"] == 0 for d in grid.values()))
+        random_map = make_map("random", 500, seed=3)
+        agent = Agent(location_id="L0")
+        agent.cognitive_map = random_map
+        self.assertEqual(len(reference_distances(agent)), 500)
+
+    def test_optimality_check(self):
+        """Verify the reference check accepts shortest plans and rejects detours."""
+        agent = Agent(location_id="L0")
+        agent.cognitive_map = make_map("chain", 5)
+        dist = reference_distances(agent)
+        direct = [Action(ActionType.MOVE, target_id=t) for t in ["L1", "L2"]]
+        detour = [Action(ActionType.MOVE, target_id=t) for t in ["L1", "L0", "L1"]]
+        self.assertIsNone(check_plan(agent, direct, dist))
+        self.assertIn("shortest", check_plan(agent, detour, dist))
+
+    def test_bench_reports(self):
+        """Verify a benchmark run reports percentiles, memory and no optimality failures."""
+        result = bench("grid", 400, calls=5, food=0.02, stale=0.1)
+        self.assertEqual(result["calls"], 5)
+        self.assertLessEqual(result["p50_ms"], result["max_ms"])
+        self.assertGreater(result["peak_memory_bytes"], 0)
+        self.assertEqual(result["failures"], [])
+
+if __name__ == '__main__':
+    unittest.main()
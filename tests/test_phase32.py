@@ -0,0 +1,75 @@
+import os
+import unittest
+from src.digest import StateDigest, compare_runs
+from src.cognitive_map import CognitiveMap
+from src.agent_communication import AgentCommunication
+from src.scenarios import Scenarios
+from src.entity import Agent, Object, ObjectType
+from src.physics import Physics
+
+class TestPhase32(unittest.TestCase):
+    def test_digest_stable_across_runs(self):
+        """Verify identical runs give identical digest sequences and observing doesn't change them."""
+        runs = []
+        for headless in (True, False):
+            digest = StateDigest()
+            sim = Scenarios.foraging(seed=5, log_path=os.devnull, headless=headless, digest=digest)
+            for _ in range(15):
+                sim.tick()
+            runs.append(digest.ticks)
+        self.assertEqual(len(runs[0]), 15)
+        self.assertEqual(runs[0], runs[1])
+        self.assertTrue(compare_runs(Scenarios.foraging, 15, seed=5)["equivalent"])
+
+    def test_incremental_matches_full_hash(self):
+        """Verify the running total equals a from-scratch hash of every entity, edits and removals included."""
+        digest = StateDigest()
+        sim = Scenarios.foraging(seed=5, log_path=os.devnull, headless=True, digest=digest)
+        def full_total():
+            return sum(int(StateDigest._hash(repr((e_id, StateDigest.entity_state(e)))), 16)
+                       for e_id, e in sim.world.entities.items()) & StateDigest.MASK
+        for tick in range(20):
+            sim.tick()
+            self.assertEqual(digest.total, full_total())
+            if tick == 5:
+                food = next(e for e in sim.world.entities.values() if isinstance(e, Object))
+                food.value += 7 # Edited in place, outside any tick
+            if tick == 10:
+                sim.world.remove_object(next(e.id for e in sim.world.entities.values() if isinstance(e, Object)))
+                sim.world.add_entity(Object(id="Late", type=ObjectType.HAZARD, location_id=next(iter(sim.world.locations))))
+        self.assertIn("Late", digest.entities)
+
+    def test_class_overrides(self):
+        """Verify compare_runs applies Class.ATTR options to one side only, and restores them."""
+        result = compare_runs(Scenarios.foraging, 30, candidate={"Physics.MOVE_COST": 9}, seed=5)
+        self.assertFalse(result["equivalent"])
+        self.assertEqual(Physics.MOVE_COST, 5)
+        same = compare_runs(Scenarios.social, 10, reference={"AgentCommunication.DELTA_SYNC": False}, seed=5, agents=12)
+        self.assertTrue(same["equivalent"]) # Delta sync only changes what is sent, not what is known
+        self.assertTrue(AgentCommunication.DELTA_SYNC)
+
+    def test_divergence_reports_entities(self):
+        """Verify the first differing tick and the differing entities are reported."""
+        result = compare_runs(Scenarios.foraging, 20, candidate={"decision_workers": 0}, seed=5)
+        self.assertFalse(result["equivalent"])
+        self.assertEqual(result["divergent_tick"], result["ticks"] - 1)
+        self.assertTrue(result["entities"])
+        for states in result["entities"].values():
+            self.assertNotEqual(states["reference"], states["candidate"])
+
+    def test_map_version_tracks_content(self):
+        """Verify map_version moves on content changes only."""
+        agent = Agent(location_id="A")
+        CognitiveMap.observe(agent, "A", ["B"], [], {"tools": [], "obstacles": []}, 0)
+        self.assertEqual(agent.map_version, 1)
+        CognitiveMap.observe(agent, "A", ["B"], [], {"tools": [], "obstacles": []}, 1) # Only last_tick moves
+        self.assertEqual(agent.map_version, 1)
+        CognitiveMap.add_object(agent, "B", "FOOD")
+        self.assertEqual(agent.map_version, 3) # New entry + new tag
+        AgentCommunication._merge_map(agent, {"A": {"neighbors": ["B"], "objects": []}})
+        self.assertEqual(agent.map_version, 3)
+        AgentCommunication._merge_map(agent, {"A": {"neighbors": ["C"]}})
+        self.assertEqual(agent.map_version, 4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import os
+import json
+import pickle
+import tempfile
+import unittest
+from src.world import World
+from src.entity import Agent, Object, ObjectType
+from src.agent_mind import AgentMind
+from src.perception import Perception
+from src.logger import Logger
+
+class TestPhase33(unittest.TestCase):
+    def setUp(self):
+        self.world = World()
+        self.world.add_location("A", ["B"])
+        self.world.add_location("B", ["A"])
+        self.food = Object(type=ObjectType.FOOD, location_id="A")
+        self.world.add_entity(self.food)
+        self.agent = Agent(location_id="A")
+        self.world.add_entity(self.agent)
+
+    def test_perception_reads_like_a_dict(self):
+        """Verify a Perception is an immutable Mapping that copies, pickles and replaces."""
+        p = AgentMind.perceive(self.world, self.agent)
+        self.assertIsInstance(p, Perception)
+        self.assertEqual(p["visible_food"], [self.food.id])
+        self.assertEqual(p.get("missing", 7), 7)
+        self.assertEqual(dict(p)["location"], "A")
+        self.assertEqual(pickle.loads(pickle.dumps(p)), p)
+        with self.assertRaises(TypeError):
+            p["energy"] = 1
+        q = p.replace(energy=1)
+        self.assertEqual((q["energy"], p["energy"]), (1, self.agent.energy))
+
+    def test_room_cache_invalidation(self):
+        """Verify the room is re-sensed only after the World or an Object changed."""
+        p1 = AgentMind.perceive(self.world, self.agent)
+        p2 = AgentMind.perceive(self.world, self.agent)
+        self.assertIs(p1["visible_food"], p2["visible_food"]) # Shared, not re-sensed
+        self.world.unlist_object(self.food.id)
+        self.assertEqual(AgentMind.perceive(self.world, self.agent)["visible_food"], [])
+        tool = Object(type=ObjectType.TOOL, location_id="A", tool_type="KEY")
+        self.world.add_entity(tool)
+        self.assertEqual(AgentMind.perceive(self.world, self.agent)["visible_tools"][0]["tool_type"], "KEY")
+        tool.tool_type = "AXE" # Edited in place, no World call
+        self.assertEqual(AgentMind.perceive(self.world, self.agent)["visible_tools"][0]["tool_type"], "AXE")
+
+    def test_unchanged_room_keeps_map_entry(self):
+        """Verify revisiting an unchanged room only moves last_tick, and an edit still shows up."""
+        AgentMind.perceive(self.world, self.agent)
+        entry = self.agent.cognitive_map["A"]
+        objects, version = entry["objects"], self.agent.map_version
+        self.agent.last_tick_updated = 5
+        AgentMind.perceive(self.world, self.agent)
+        self.assertIs(self.agent.cognitive_map["A"]["objects"], objects)
+        self.assertEqual((entry["last_tick"], self.agent.map_version), (5, version))
+        self.food.type = ObjectType.HAZARD
+        AgentMind.perceive(self.world, self.agent)
+        self.assertEqual(self.agent.cognitive_map["A"]["objects"], ["HAZARD"])
+        self.assertGreater(self.agent.map_version, version)
+
+    def test_nearby_agents_follow_moves(self):
+        """Verify arrivals and departures through move_agent show up, and energies stay fresh."""
+        other = Agent(location_id="C")
+        self.world.add_location("C", ["B"])
+        self.world.add_entity(other)
+        self.assertEqual(AgentMind.perceive(self.world, self.agent)["visible_agents"], [])
+        self.world.move_agent(other.id, "B")
+        seen = AgentMind.perceive(self.world, self.agent)["visible_agents"]
+        self.assertEqual([(a["id"], a["distance"]) for a in seen], [(other.id, 1)])
+        other.energy = 42
+        self.assertEqual(AgentMind.perceive(self.world, self.agent)["visible_agents"][0]["energy"], 42)
+        self.world.move_agent(other.id, "A")
+        self.assertEqual(AgentMind.perceive(self.world, self.agent)["visible_agents"][0]["distance"], 0)
+        other.is_alive = False
+        self.assertEqual(AgentMind.perceive(self.world, self.agent)["visible_agents"], [])
+
+    def test_logged_as_dict(self):
+        """Verify perceptions are written to the log like the dicts they replace."""
+        fd, path = tempfile.mkstemp(suffix=".log")
+        os.close(fd)
+        try:
+            Logger(path).log(0, "PERCEPTION", {"perception": AgentMind.perceive(self.world, self.agent)})
+            with open(path) as f:
+                entry = json.loads(f.readline())
+            self.assertEqual(entry["perception"]["visible_food"], [self.food.id])
+        finally:
+            os.remove(path)
+
+if __name__ == '__main__':
+    unittest.main()
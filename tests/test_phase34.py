@@ -0,0 +1,88 @@
+import os
+import unittest
+from src.world import World
+from src.entity import Agent, Object, ObjectType
+from src.agent_mind import AgentMind
+from src.mind_pool import MindPool
+from src.scenarios import Scenarios
+
+class TestPhase34(unittest.TestCase):
+    def setUp(self):
+        # Line of rooms A - B - C - D
+        self.world = World()
+        for loc, neighbors in [("A", ["B"]), ("B", ["A", "C"]), ("C", ["B", "D"]), ("D", ["C"])]:
+            self.world.add_location(loc, neighbors)
+        self.agent = Agent(id="Me", location_id="A")
+        self.far = Agent(id="Far", location_id="C")
+        self.world.add_entity(self.agent)
+        self.world.add_entity(self.far)
+
+    def visible(self):
+        return [(a["id"], a["distance"]) for a in AgentMind.perceive(self.world, self.agent)["visible_agents"]]
+
+    def test_neighborhood_cache(self):
+        """Verify k-hop neighborhoods and their invalidation on topology changes."""
+        self.assertEqual(self.world.neighborhood("A", 2), {"A": 0, "B": 1, "C": 2})
+        self.assertIs(self.world.neighborhood("A", 2), self.world.neighborhood("A", 2))
+        self.world.add_location("A", ["B", "D"])
+        self.assertEqual(self.world.neighborhood("A", 1), {"A": 0, "B": 1, "D": 1})
+        self.assertEqual(set(self.world.neighborhood("D", 1, reverse=True)), {"D", "C", "A"})
+
+    def test_neighborhood_cache_bound(self):
+        """Verify at most HOOD_CACHE neighborhoods are kept, least recently used first out."""
+        previous = World.HOOD_CACHE
+        World.HOOD_CACHE = 2
+        try:
+            first = self.world.neighborhood("A", 2)
+            self.world.neighborhood("B", 2)
+            self.world.neighborhood("A", 2)
+            self.world.neighborhood("C", 2)
+            self.assertEqual(list(self.world._hoods), [("A", 2, False), ("C", 2, False)])
+            self.assertIs(self.world.neighborhood("A", 2), first)
+        finally:
+            World.HOOD_CACHE = previous
+
+    def test_radius(self):
+        """Verify agents are visible up to perception_radius hops, with hop distance."""
+        self.assertEqual(self.visible(), [])
+        self.world.perception_radius = 2
+        self.assertEqual(self.visible(), [("Far", 2)])
+        self.world.move_agent("Far", "D")
+        self.assertEqual(self.visible(), [])
+        self.world.move_agent("Far", "B")
+        self.assertEqual(self.visible(), [("Far", 1)])
+
+    def test_distant_objects(self):
+        """Verify objects within object_radius are reported and tagged on the map."""
+        food = Object(id="F", type=ObjectType.FOOD, location_id="C")
+        self.world.add_entity(food)
+        self.assertEqual(AgentMind.perceive(self.world, self.agent)["distant_objects"], ())
+        self.world.object_radius = 2
+        p = AgentMind.perceive(self.world, self.agent)
+        self.assertEqual(p["distant_objects"], [{"id": "F", "type": "FOOD", "location": "C", "distance": 2}])
+        self.assertEqual(p["visible_food"], [])
+        self.assertIn("FOOD", self.agent.cognitive_map["C"]["objects"])
+
+    def test_direct_assignment_reindexed(self):
+        """Verify agents teleported by assigning location_id are picked up by refresh_occupancy."""
+        self.far.location_id = "A"
+        self.world.refresh_occupancy()
+        self.assertEqual(self.visible(), [("Far", 0)])
+
+    def test_parallel_view_matches(self):
+        """Verify the MindPool view sees the same neighborhood as the real World."""
+        sim = Scenarios.scaling(seed=3, log_path=os.devnull, headless=True, agents=30, locations=64,
+                                objects=30, perception_radius=2, object_radius=2)
+        pool = MindPool(0)
+        try:
+            agents = list(sim.world.agents.values())
+            results = pool.decide(sim.world, agents)
+            for agent, result in zip(agents, results):
+                expected = AgentMind.perceive(sim.world, agent)
+                for key in ("visible_agents", "visible_food", "neighbors", "distant_objects"):
+                    self.assertEqual(result["perception"][key], expected[key])
+        finally:
+            pool.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+from src.entity import Agent, Object, ObjectType
+from src.agent_planner import AgentPlanner
+from src.agent_meta import AgentMeta
+from src.cognitive_map import CognitiveMap
+
+def chain(n, food_at=None):
+    cmap = {}
+    for i in range(n):
+        neighbors = [f"L{j}" for j in (i - 1, i + 1) if 0 <= j < n]
+        cmap[f"L{i}"] = {"neighbors": neighbors, "objects": ["FOOD"] if i == food_at else [], "last_tick": 0}
+    return cmap
+
+class TestPhase35(unittest.TestCase):
+    def make_agent(self, cmap, loc="L0"):
+        agent = Agent(location_id=loc)
+        agent.cognitive_map = cmap
+        return agent
+
+    def test_shortest_path_and_lazy_tree(self):
+        """Verify parent-pointer paths and that the tree stops growing once no goal can win."""
+        agent = self.make_agent(chain(500, food_at=3))
+        plan = AgentPlanner.generate_plan(agent)
+        self.assertEqual([a.target_id for a in plan], ["L1", "L2", "L3"])
+        self.assertLess(len(agent.plan_cache["tree"]["dist"]), 150)
+
+    def test_cache_reuse_and_invalidation(self):
+        """Verify the tree is reused on hits and rebuilt on map, location or reflection changes."""
+        cmap = chain(10, food_at=5)
+        agent = self.make_agent(cmap)
+        AgentPlanner.generate_plan(agent)
+        tree = agent.plan_cache["tree"]
+        AgentPlanner.generate_plan(agent)
+        self.assertIs(agent.plan_cache["tree"], tree)
+
+        CognitiveMap.add_object(agent, "L2", "FOOD")
+        self.assertEqual([a.target_id for a in AgentPlanner.generate_plan(agent)], ["L1", "L2"])
+        self.assertIsNot(agent.plan_cache["tree"], tree)
+
+        AgentMeta.update_score(agent, "L1", -1.0) # L1 is now avoided, nothing is reachable
+        self.assertEqual(AgentPlanner.generate_plan(agent), [])
+
+        agent.location_id = "L9"
+        self.assertEqual([a.target_id for a in AgentPlanner.generate_plan(agent)], ["L8", "L7", "L6", "L5"])
+
+    def test_goals_rescored_on_hit(self):
+        """Verify inventory changes re-rank goals even when the map (and cache) is unchanged."""
+        cmap = chain(6)
+        cmap["L4"]["objects"] = ["OBSTACLE"]
+        cmap["L4"]["metadata"] = {"obstacles": [{"id": "Gate", "tool_required": "KEY"}], "tools": []}
+        cmap["L2"]["objects"] = ["TOOL"]
+        cmap["L2"]["metadata"] = {"obstacles": [], "tools": [{"id": "Key", "tool_type": "KEY"}]}
+        agent = self.make_agent(cmap)
+        self.assertEqual(AgentPlanner.generate_plan(agent)[-1].target_id, "L2") # Fetch the key first
+        tree = agent.plan_cache["tree"]
+        agent.inventory.append(Object(id="Key", type=ObjectType.TOOL, tool_type="KEY"))
+        self.assertEqual(AgentPlanner.generate_plan(agent)[-1].target_id, "L4") # Go open the gate
+        self.assertIs(agent.plan_cache["tree"], tree)
+
+    def test_goals_survive_moves(self):
+        """Verify a move rebuilds the tree but keeps the goal candidates, minus the room left behind."""
+        agent = self.make_agent(chain(8, food_at=3))
+        AgentPlanner.generate_plan(agent)
+        goals, tree = agent.plan_cache["goals"], agent.plan_cache["tree"]
+        agent.location_id = "L3"
+        self.assertEqual(AgentPlanner.generate_plan(agent), []) # Standing on the only food
+        self.assertIs(agent.plan_cache["goals"], goals)
+        self.assertIsNot(agent.plan_cache["tree"], tree)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+from src.entity import Agent
+from src.map_index import MapIndex
+from src.cognitive_map import CognitiveMap
+from src.agent_communication import AgentCommunication
+from src.agent_planner import AgentPlanner
+
+class TestPhase36(unittest.TestCase):
+    def setUp(self):
+        self.agent = Agent(location_id="A")
+        self.agent.cognitive_map = {
+            "A": {"neighbors": ["B"], "objects": [], "last_tick": 10},
+            "B": {"neighbors": ["A", "C", "X"], "objects": ["ObjectType.FOOD"], "last_tick": 0},
+            "C": {"neighbors": ["B", "Y"], "objects": ["OBSTACLE"], "last_tick": 10,
+                  "metadata": {"tools": [{"id": "K", "tool_type": "KEY"}], "obstacles": []}},
+        }
+
+    def test_queries(self):
+        """Verify tag, tool, frontier and staleness lookups."""
+        index = MapIndex.get(self.agent)
+        self.assertEqual(index.rooms_with(["FOOD"]), ["B"])
+        self.assertEqual(index.rooms_with(["FOOD", "OBSTACLE"]), ["B", "C"])
+        self.assertEqual(index.first_tool_room("KEY"), "C")
+        self.assertEqual(index.frontiers(), ["X", "Y"])
+        self.assertEqual(index.stale(5), ["B"])
+
+    def test_maintained_on_write(self):
+        """Verify CognitiveMap writes, observations and merges keep the index current."""
+        MapIndex.get(self.agent)
+        CognitiveMap.add_object(self.agent, "X", "FOOD") # New entry, frontier becomes known
+        CognitiveMap.observe(self.agent, "B", ["A", "C", "X"], [], {"tools": [], "obstacles": []}, 20)
+        AgentCommunication._merge_map(self.agent, {"Z": {"neighbors": ["C", "W"], "objects": ["COOP_FOOD"], "last_tick": 1}})
+        index = MapIndex.get(self.agent)
+        self.assertEqual(index.rooms_with(["FOOD", "COOP_FOOD"]), ["X", "Z"])
+        self.assertEqual(index.frontiers(), ["Y", "W"])
+        self.assertEqual(index.stale(5), ["X", "Z"])
+        self.agent.cognitive_map = {"A": {"neighbors": []}} # Replaced wholesale -> rebuilt
+        self.assertEqual(MapIndex.get(self.agent).frontiers(), [])
+
+    def test_frontier_order_kept(self):
+        """Verify the kept frontier list matches a fresh first-mention sort after writes."""
+        def first_mentions(index):
+            return sorted(index.referrers, key=lambda n: min((index.position[loc], i) for loc, i in index.referrers[n].items()))
+        self.agent.cognitive_map["A"]["neighbors"] = ["B", "Y", "W"]
+        index = MapIndex.get(self.agent)
+        self.assertEqual(index.frontiers(), ["Y", "W", "X"])
+        self.assertIs(index.frontiers(), index.frontiers())
+        CognitiveMap.observe(self.agent, "C", ["B"], [], {"tools": [], "obstacles": []}, 20) # Y still listed by A
+        AgentCommunication._merge_map(self.agent, {"Y": {"neighbors": ["A", "V"]}, "D": {"neighbors": ["X", "U"]}})
+        index = MapIndex.get(self.agent)
+        self.assertEqual(index.frontiers(), first_mentions(index))
+        self.assertEqual(index.frontiers(), ["W", "X", "V", "U"])
+        self.assertEqual(index.first_mention, MapIndex(self.agent.cognitive_map).first_mention)
+
+    def test_stale_threshold_moves(self):
+        """Verify stale() follows a rising and a falling threshold and refreshed rooms."""
+        self.agent.cognitive_map = {f"R{i}": {"neighbors": [], "last_tick": i} for i in range(6)}
+        index = MapIndex.get(self.agent)
+        self.assertEqual(index.stale(2), ["R0", "R1"])
+        self.assertEqual(index.stale(4), ["R0", "R1", "R2", "R3"])
+        CognitiveMap.observe(self.agent, "R1", [], [], {"tools": [], "obstacles": []}, 9)
+        self.assertEqual(MapIndex.get(self.agent).stale(4), ["R0", "R2", "R3"])
+        self.assertEqual(index.stale(1), ["R0"])
+        self.assertEqual(index.stale(10), ["R0", "R1", "R2", "R3", "R4", "R5"])
+
+    def test_merge_copies_entries(self):
+        """Verify merged entries are not shared with the sender."""
+        sender = Agent(location_id="Q")
+        CognitiveMap.observe(sender, "Q", ["A"], ["FOOD"], {"tools": [], "obstacles": []}, 1)
+        AgentCommunication._merge_map(self.agent, sender.cognitive_map)
+        self.assertIsNot(self.agent.cognitive_map["Q"], sender.cognitive_map["Q"])
+        CognitiveMap.observe(sender, "Q", ["A"], [], {"tools": [], "obstacles": []}, 2)
+        self.assertEqual(self.agent.cognitive_map["Q"]["objects"], ["FOOD"])
+        self.assertIn("Q", MapIndex.get(self.agent).rooms_with(["FOOD"]))
+
+    def test_planner_uses_index(self):
+        """Verify goals come from the index (food at B, then stale and frontier rooms)."""
+        plan = AgentPlanner.generate_plan(self.agent)
+        self.assertEqual([a.target_id for a in plan], ["B"])
+        self.assertIs(self.agent.map_index, MapIndex.get(self.agent))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+from src.entity import Agent
+from src.agent_planner import AgentPlanner
+
+def diamond(hazard_on_short=False):
+    """A->B->D (short) and A->C1->C2->D (long), FOOD at D."""
+    cmap = {
+        "A": {"neighbors": ["B", "C1"], "objects": []},
+        "B": {"neighbors": ["A", "D"], "objects": ["HAZARD"] if hazard_on_short else []},
+        "C1": {"neighbors": ["A", "C2"], "objects": []},
+        "C2": {"neighbors": ["C1", "D"], "objects": []},
+        "D": {"neighbors": ["B", "C2"], "objects": ["FOOD"]},
+    }
+    for entry in cmap.values():
+        entry["last_tick"] = 0
+    return cmap
+
+class TestPhase37(unittest.TestCase):
+    def setUp(self):
+        AgentPlanner.MODE = "weighted"
+
+    def tearDown(self):
+        AgentPlanner.MODE = "bfs"
+
+    def plan_for(self, cmap, loc="A", **fields):
+        agent = Agent(location_id=loc, **fields)
+        agent.cognitive_map = cmap
+        return agent, [a.target_id for a in AgentPlanner.generate_plan(agent)]
+
+    def test_detours_around_known_hazard(self):
+        """Verify the weighted planner pays an extra step to avoid a known hazard."""
+        _, steps = self.plan_for(diamond(hazard_on_short=True))
+        self.assertEqual(steps, ["C1", "C2", "D"])
+        _, steps = self.plan_for(diamond())
+        self.assertEqual(steps, ["B", "D"])
+
+    def test_detours_around_distrusted_room(self):
+        """Verify negative reflection scores above the safety cut-off still cost extra."""
+        _, steps = self.plan_for(diamond(), reflection_score={"B": -0.4})
+        self.assertEqual(steps, ["C1", "C2", "D"])
+        self.assertAlmostEqual(AgentPlanner.step_cost(Agent(reflection_score={"B": -0.4}), "B"), 2.6)
+
+    def test_stops_once_best_goal_is_settled(self):
+        """Verify the search settles only rooms that could still beat the best goal."""
+        cmap = {f"L{i}": {"neighbors": [f"L{j}" for j in (i - 1, i + 1) if 0 <= j < 500],
+                          "objects": ["FOOD"] if i == 3 else [], "last_tick": 0} for i in range(500)}
+        agent, steps = self.plan_for(cmap, loc="L0")
+        self.assertEqual(steps, ["L1", "L2", "L3"])
+        self.assertLess(len(agent.plan_cache["tree"]["dist"]), 150)
+
+    def test_bfs_mode_ignores_costs(self):
+        """Verify the default mode still plans by hop count."""
+        AgentPlanner.MODE = "bfs"
+        _, steps = self.plan_for(diamond(hazard_on_short=True))
+        self.assertEqual(steps, ["B", "D"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import pickle
+import unittest
+from debug_planner import make_map, reference_distances
+from src.entity import Agent
+from src.agent_planner import AgentPlanner
+from src.region_map import RegionMap
+from src.cognitive_map import CognitiveMap
+from src.agent_communication import AgentCommunication
+
+class TestPhase38(unittest.TestCase):
+    def setUp(self):
+        self.size = RegionMap.REGION_SIZE
+        RegionMap.REGION_SIZE = 16
+        AgentPlanner.MODE = "hierarchical"
+        self.agent = Agent(location_id="L0")
+        self.agent.cognitive_map = make_map("grid", 400, food=0.0, coop_food=0.0, obstacle=0.0, tool=0.0)
+
+    def tearDown(self):
+        RegionMap.REGION_SIZE = self.size
+        AgentPlanner.MODE = "bfs"
+
+    def test_regions_partition_the_map(self):
+        """Verify every known room is in exactly one bounded region with gates to its neighbors."""
+        regions = RegionMap.get(self.agent, set())
+        self.assertEqual(sorted(regions.region_of), sorted(self.agent.cognitive_map))
+        self.assertTrue(all(0 < len(m) <= 16 for m in regions.members))
+        for rid in range(len(regions.members)):
+            for u, v in regions.gates(rid):
+                self.assertEqual(regions.region_of[u], rid)
+                self.assertNotEqual(regions.region_of[v], rid)
+                self.assertIn(v, self.agent.cognitive_map[u]["neighbors"])
+
+    def test_merged_rooms_join_regions(self):
+        """Verify rooms merged later are assigned and their region's tables are rebuilt."""
+        regions = RegionMap.get(self.agent, set())
+        rid = regions.region_of["L19"]
+        self.assertEqual(len(regions.members[rid]), 16) # Full: N0 must open a new region
+        version = regions.versions[rid]
+        CognitiveMap.observe(self.agent, "L19", ["L18", "L39", "N0"], [], {"tools": [], "obstacles": []}, 1)
+        AgentCommunication._merge_map(self.agent, {"N0": {"neighbors": ["L19", "N1"], "objects": [], "last_tick": 1}})
+        regions = RegionMap.get(self.agent, set())
+        self.assertEqual(regions.members[regions.region_of["N0"]], ["N0"])
+        self.assertGreater(regions.versions[rid], version)
+        self.assertIn(("L19", "N0"), regions.gates(rid))
+        self.assertEqual(regions.table("N0")[0], {"N0": 0, "N1": 1}) # N1 unknown: reached, not expanded
+        self.assertIsNone(pickle.loads(pickle.dumps(self.agent)).region_map)
+
+    def test_far_goal_planned_over_regions(self):
+        """Verify a goal beyond the local radius gets a valid, near-shortest walk."""
+        CognitiveMap.add_object(self.agent, "L399", "FOOD")
+        plan = [a.target_id for a in AgentPlanner.generate_plan(self.agent)]
+        self.assertEqual(plan[-1], "L399")
+        here = "L0"
+        for step in plan:
+            self.assertIn(step, self.agent.cognitive_map[here]["neighbors"])
+            here = step
+        shortest = reference_distances(self.agent)["L399"]
+        self.assertLessEqual(len(plan), shortest * 1.5)
+        self.assertTrue(self.agent.plan_cache["tree"]["settled"])
+
+    def test_near_goal_planned_exactly(self):
+        """Verify goals within the local radius skip the region search."""
+        CognitiveMap.add_object(self.agent, "L42", "FOOD")
+        plan = [a.target_id for a in AgentPlanner.generate_plan(self.agent)]
+        self.assertEqual(len(plan), reference_distances(self.agent)["L42"])
+        self.assertFalse(self.agent.plan_cache["tree"]["settled"])
+
+if __name__ == '__main__':
+    unittest.main()
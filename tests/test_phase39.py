@@ -0,0 +1,56 @@
+import os
+import unittest
+from src.sim import Simulation
+from src.entity import Agent
+from src.agent_planner import AgentPlanner
+from src.agent_mind import AgentMind
+from src.physics import Action, ActionType
+
+def moves(*rooms):
+    return [Action(ActionType.MOVE, target_id=r) for r in rooms]
+
+class TestPhase39(unittest.TestCase):
+    def setUp(self):
+        # Two routes from A to E: A-B-D-E and A-C-D-E
+        self.agent = Agent(location_id="A", energy=100)
+        self.agent.cognitive_map = {
+            "A": {"neighbors": ["B", "C"], "objects": []},
+            "B": {"neighbors": ["A", "D"], "objects": []},
+            "C": {"neighbors": ["A", "D"], "objects": []},
+            "D": {"neighbors": ["B", "C", "E"], "objects": []},
+            "E": {"neighbors": ["D"], "objects": ["FOOD"]},
+        }
+
+    def test_detour_around_distrusted_room(self):
+        """Verify the plan is rerouted around a room that became unsafe, keeping its tail."""
+        self.agent.reflection_score["B"] = -0.9
+        repaired = AgentPlanner.repair_plan(self.agent, moves("B", "D", "E"))
+        self.assertEqual([a.target_id for a in repaired], ["C", "D", "E"])
+        self.agent.reflection_score["E"] = -0.9 # The goal itself is unsafe: nothing to repair
+        self.assertEqual(AgentPlanner.repair_plan(self.agent, moves("C", "D", "E")), [])
+
+    def test_decide_repairs_instead_of_clearing(self):
+        """Verify decide keeps following a repaired plan instead of dropping it."""
+        self.agent.plan_queue = moves("B", "D", "E")
+        self.agent.reflection_score["B"] = -0.9
+        perception = {"energy": 100, "visible_food": [], "visible_tools": [], "visible_obstacles": [],
+                      "visible_agents": [], "visible_coop_food": [], "visible_hazards": [],
+                      "location": "A", "neighbors": ["B", "C"]}
+        action = AgentMind.decide(self.agent, perception)
+        self.assertEqual((action.type, action.target_id), (ActionType.MOVE, "C"))
+        self.assertEqual([a.target_id for a in self.agent.plan_queue], ["D", "E"])
+
+    def test_failed_move_is_routed_around(self):
+        """Verify a move along an edge the world does not have is repaired in the Simulation."""
+        sim = Simulation(log_path=os.devnull, headless=True)
+        for loc, neighbors in [("A", ["C"]), ("C", ["A", "D"]), ("D", ["C", "E"]), ("E", ["D"])]:
+            sim.world.add_location(loc, neighbors)
+        sim.world.add_entity(self.agent)
+        self.agent.plan_queue = moves("D", "E") # "B" already popped this tick
+        effect = sim._apply_action(self.agent, Action(ActionType.MOVE, target_id="B"))
+        self.assertFalse(effect.success)
+        self.assertIn("Plan Repaired", effect.message)
+        self.assertEqual([a.target_id for a in self.agent.plan_queue], ["C", "D", "E"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import os
+import tempfile
+import unittest
+from src.entity import Agent
+from src.agent_planner import AgentPlanner
+from src.agent_mind import AgentMind
+from src.physics import ActionType
+from src.scenarios import Scenarios
+from src.digest import StateDigest
+from src.sweep import SweepRunner
+
+def chain(n, food_at):
+    return {f"L{i}": {"neighbors": [f"L{j}" for j in (i - 1, i + 1) if 0 <= j < n],
+                      "objects": ["FOOD"] if i == food_at else [], "last_tick": 0} for i in range(n)}
+
+class TestPhase40(unittest.TestCase):
+    def tearDown(self):
+        AgentPlanner.BUDGET = None
+
+    def test_search_resumes_across_calls(self):
+        """Verify a budgeted search returns nothing until done, then the unbudgeted plan."""
+        full = Agent(location_id="L0")
+        full.cognitive_map = chain(100, food_at=40)
+        expected = [a.target_id for a in AgentPlanner.generate_plan(full)]
+
+        AgentPlanner.BUDGET = 10
+        agent = Agent(location_id="L0")
+        agent.cognitive_map = chain(100, food_at=40)
+        calls = 1
+        plan = AgentPlanner.generate_plan(agent)
+        while AgentPlanner.pending(agent):
+            self.assertEqual(plan, [])
+            plan = AgentPlanner.generate_plan(agent)
+            calls += 1
+        self.assertEqual([a.target_id for a in plan], expected)
+        self.assertEqual(agent.plan_budget_hits, calls - 1)
+        self.assertGreaterEqual(calls, 4)
+
+    def test_waits_while_pending(self):
+        """Verify the agent waits in place instead of wandering while its search is pending."""
+        AgentPlanner.BUDGET = 5
+        agent = Agent(location_id="L0", energy=50)
+        agent.cognitive_map = chain(100, food_at=60)
+        perception = {"energy": 50, "visible_food": [], "visible_tools": [], "visible_obstacles": [],
+                      "visible_agents": [], "visible_coop_food": [], "visible_hazards": [],
+                      "location": "L0", "neighbors": ["L1"], "tick": 0}
+        self.assertEqual(AgentMind.decide(agent, perception).type, ActionType.WAIT)
+        self.assertTrue(AgentPlanner.pending(agent))
+
+    def test_budget_hits_reported(self):
+        """Verify both engines report budget hits in the run summary."""
+        AgentPlanner.BUDGET = 2
+        for workers in (None, 0):
+            sim = Scenarios.scaling(seed=7, log_path=os.devnull, headless=True, agents=10,
+                                    locations=100, objects=30, decision_workers=workers)
+            for _ in range(30):
+                sim.tick()
+            self.assertGreater(sim.summary()["plan_budget_hits"], 0)
+            if sim.mind_pool:
+                sim.mind_pool.close()
+
+    def test_budgeted_runs_independent_of_worker_count(self):
+        """Verify a budgeted run has the same digests for any worker count, and repeats exactly."""
+        AgentPlanner.BUDGET = 3
+        chains = {}
+        for workers in (None, None, 0, 1, 3):
+            digest = StateDigest()
+            sim = Scenarios.scaling(seed=3, log_path=os.devnull, headless=True, agents=20, locations=300,
+                                    objects=60, decision_workers=workers, digest=digest)
+            try:
+                for _ in range(40):
+                    sim.tick()
+            finally:
+                sim.close()
+            self.assertGreater(sim.summary()["plan_budget_hits"], 0)
+            # None is the sequential engine, whose tick order differs from the pool's
+            chains.setdefault(workers is None, set()).add(digest.chain)
+        self.assertEqual([len(found) for found in chains.values()], [1, 1])
+
+    def test_budget_sweepable(self):
+        """Verify AgentPlanner.BUDGET can be swept like other class constants."""
+        fd, path = tempfile.mkstemp(suffix=".jsonl")
+        os.close(fd)
+        try:
+            grid = {"AgentPlanner.BUDGET": [None, 2], "agents": [8], "locations": [100], "objects": [30]}
+            results = SweepRunner(Scenarios.scaling, grid, seeds=[7], max_ticks=20, workers=0).run(path)
+        finally:
+            os.remove(path)
+        hits = {r["params"]["AgentPlanner.BUDGET"]: r["plan_budget_hits"] for r in results}
+        self.assertEqual(hits[None], 0)
+        self.assertGreater(hits[2], 0)
+        self.assertIsNone(AgentPlanner.BUDGET) # Restored after the runs
+
+if __name__ == '__main__':
+    unittest.main()
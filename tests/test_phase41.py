@@ -0,0 +1,106 @@
+import os
+import copy
+import unittest
+from src.entity import Agent
+from src.agent_planner import AgentPlanner
+from src.plan_cache import SharedPlanCache
+from src.map_index import MapIndex
+from src.cognitive_map import CognitiveMap
+from src.scenarios import Scenarios
+
+def grid_map():
+    cmap = {}
+    for i in range(25):
+        neighbors = [f"L{j}" for j in (i - 5, i + 5, i - 1 if i % 5 else -1, i + 1 if i % 5 < 4 else -1) if 0 <= j < 25]
+        cmap[f"L{i}"] = {"neighbors": neighbors, "objects": ["FOOD"] if i == 24 else [], "last_tick": 0}
+    return cmap
+
+class TestPhase41(unittest.TestCase):
+    def setUp(self):
+        self.cache = SharedPlanCache(capacity=4)
+        self.previous = SharedPlanCache.activate(self.cache)
+        self.first, self.second = Agent(location_id="L0"), Agent(location_id="L0")
+        self.first.cognitive_map, self.second.cognitive_map = grid_map(), grid_map()
+
+    def tearDown(self):
+        SharedPlanCache.activate(self.previous)
+
+    def test_equal_knowledge_shares_search(self):
+        """Verify agents with equal maps, rooms and blocked sets share one tree and plan alike."""
+        third = Agent(location_id="L0")
+        third.cognitive_map = grid_map()
+        third.skills["EXTRACT"] = 2.0 # Scores are per agent, not part of the key
+        plan = AgentPlanner.generate_plan(self.first)
+        self.assertEqual(self.cache.stats()["size"], 0) # A single lookup is not stored
+        self.assertEqual(AgentPlanner.generate_plan(self.second), plan)
+        self.assertEqual(AgentPlanner.generate_plan(third), plan)
+        self.assertIs(third.plan_cache["tree"], self.second.plan_cache["tree"])
+        self.assertEqual((third.plan_cache_hits, self.cache.stats()["hits"], self.cache.stats()["misses"]), (1, 1, 2))
+
+    def test_different_knowledge_misses(self):
+        """Verify map content, blocked rooms and start room are part of the key."""
+        AgentPlanner.generate_plan(self.first)
+        CognitiveMap.add_object(self.second, "L3", "FOOD")
+        AgentPlanner.generate_plan(self.second)
+        third = Agent(location_id="L0", reflection_score={"L1": -0.9})
+        third.cognitive_map = grid_map()
+        AgentPlanner.generate_plan(third)
+        fourth = Agent(location_id="L1")
+        fourth.cognitive_map = grid_map()
+        AgentPlanner.generate_plan(fourth)
+        self.assertEqual(self.cache.stats()["hits"], 0)
+
+    def test_fingerprint_follows_writes(self):
+        """Verify the incremental fingerprint equals a fresh one after writes, ignoring last_tick."""
+        index = MapIndex.get(self.first)
+        before = index.fingerprint()
+        CognitiveMap.observe(self.first, "L7", ["L2", "L12"], ["TOOL"], {"tools": [{"id": "K", "tool_type": "KEY"}], "obstacles": []}, 9)
+        CognitiveMap.add_object(self.first, "N0", "FOOD")
+        after = MapIndex.get(self.first).fingerprint()
+        self.assertNotEqual(after, before)
+        self.assertEqual(after, MapIndex(copy.deepcopy(self.first.cognitive_map)).fingerprint())
+        CognitiveMap.observe(self.first, "L7", ["L2", "L12"], ["TOOL"], {"tools": [{"id": "K", "tool_type": "KEY"}], "obstacles": []}, 50)
+        self.assertEqual(MapIndex.get(self.first).fingerprint(), after)
+
+    def test_lru_eviction(self):
+        """Verify the least recently used entry goes first."""
+        cache = SharedPlanCache(capacity=2, min_lookups=0)
+        cache.put("a", {})
+        cache.put("b", {})
+        cache.get("a")
+        cache.put("c", {})
+        self.assertEqual(list(cache.entries), ["a", "c"])
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_run_summary(self):
+        """Verify a run reports its shared cache hit rate as an engine counter, outside summary()."""
+        SharedPlanCache.activate(self.previous)
+        sim = Scenarios.social(seed=7, log_path=os.devnull, headless=True, agents=30)
+        summary = sim.run(max_ticks=30)
+        self.assertGreater(summary["engine"]["plan_cache_hits"], 0)
+        self.assertEqual(summary["engine"]["plan_cache_hits"], sim.plan_cache.hits)
+        self.assertNotIn("plan_cache_hits", sim.summary())
+
+    def test_sharing_does_not_change_budgeted_search(self):
+        """Verify an agent reusing a shared tree is charged the budget of its own search."""
+        AgentPlanner.BUDGET = 3
+        try:
+            runs = []
+            for share in (False, True):
+                SharedPlanCache.activate(SharedPlanCache(min_lookups=0) if share else None)
+                agents = [Agent(location_id="L0") for _ in range(3)]
+                trace = []
+                for agent in agents:
+                    agent.cognitive_map = grid_map()
+                    plan = AgentPlanner.generate_plan(agent)
+                    while AgentPlanner.pending(agent):
+                        plan = AgentPlanner.generate_plan(agent)
+                    trace.append((agent.plan_budget_hits, [a.target_id for a in plan]))
+                runs.append(trace)
+            self.assertEqual(runs[0], runs[1])
+            self.assertGreater(runs[1][2][0], 0) # Replaying the shared tree still costs budget
+        finally:
+            AgentPlanner.BUDGET = None
+
+if __name__ == '__main__':
+    unittest.main()
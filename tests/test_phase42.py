@@ -0,0 +1,41 @@
+import random
+import pickle
+import unittest
+from src.entity import Agent
+from src.physics import Action, ActionType
+from src.agent_imagination import ForwardModel
+
+KINDS = [ActionType.MOVE, ActionType.MOVE, ActionType.CONSUME, ActionType.COMMUNICATE, ActionType.WAIT]
+
+class TestPhase42(unittest.TestCase):
+    def test_matches_traced_check(self):
+        """Verify the prefix-sum check agrees with the simulated trace, stalls and suffixes included."""
+        rng = random.Random(42)
+        for _ in range(2000):
+            agent = Agent(location_id="A", energy=rng.randint(1, 60))
+            plan = [Action(rng.choice(KINDS), target_id="B") for _ in range(rng.randint(1, 12))]
+            agent.plan_queue = plan
+            threshold = rng.choice([2.0, 5.0])
+            while plan:
+                self.assertEqual(ForwardModel.is_plan_safe(agent, plan, threshold),
+                                 ForwardModel._traced_safety(agent, plan, threshold))
+                plan.pop(0)
+                agent.energy = rng.randint(1, 60)
+
+    def test_executing_plan_reuses_profile(self):
+        """Verify re-checking the executing plan keeps its profile; a new plan replaces it."""
+        agent = Agent(location_id="A", energy=100)
+        agent.plan_queue = [Action(ActionType.MOVE, target_id=r) for r in "BCDE"]
+        self.assertTrue(ForwardModel.is_plan_safe(agent, agent.plan_queue))
+        profile = agent.plan_profile
+        agent.plan_queue.pop(0)
+        agent.energy = 18 # Three moves left: 18 - 3*6 = 0
+        self.assertFalse(ForwardModel.is_plan_safe(agent, agent.plan_queue))
+        self.assertIs(agent.plan_profile, profile)
+        agent.plan_queue = [Action(ActionType.CONSUME, target_id="F")] + agent.plan_queue
+        self.assertTrue(ForwardModel.is_plan_safe(agent, agent.plan_queue))
+        self.assertIsNot(agent.plan_profile, profile)
+        self.assertIsNone(pickle.loads(pickle.dumps(agent)).plan_profile)
+
+if __name__ == '__main__':
+    unittest.main()
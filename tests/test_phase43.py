@@ -0,0 +1,73 @@
+import random
+import unittest
+from src.entity import Agent
+from src.physics import Action, ActionType
+from unittest import mock
+from src.agent_imagination import ForwardModel, np
+from src.agent_mind import AgentMind
+from src.profiler import StageProfiler
+
+class TestPhase43(unittest.TestCase):
+    def setUp(self):
+        self.use_numpy = ForwardModel.USE_NUMPY
+        rng = random.Random(43)
+        self.agents, self.plans = [], []
+        for i in range(300): # Includes empty plans, stalls, starvation and a dead agent
+            self.agents.append(Agent(location_id="A", energy=rng.randint(1, 40), is_alive=i != 7))
+            self.plans.append([Action(rng.choice(list(ActionType)), target_id="B") for _ in range(rng.randint(0, 10))])
+
+    def tearDown(self):
+        ForwardModel.USE_NUMPY = self.use_numpy
+
+    def check_batch(self):
+        batch = ForwardModel.imagine_batch([a.energy for a in self.agents], ForwardModel.encode(self.plans),
+                                           [a.is_alive for a in self.agents])
+        for i, (agent, plan) in enumerate(zip(self.agents, self.plans)):
+            trace = [s.energy for s in ForwardModel.simulate_plan(agent, plan)]
+            self.assertEqual(list(batch.energy[i][:len(trace)]), trace)
+            self.assertEqual(batch.final[i], trace[-1])
+            self.assertEqual(batch.safe()[i], ForwardModel.is_plan_safe(agent, plan))
+
+    def test_rows_match_simulate_plan(self):
+        """Verify the pure-Python batch reproduces simulate_plan and is_plan_safe per row."""
+        ForwardModel.USE_NUMPY = False
+        self.check_batch()
+
+    @unittest.skipIf(np is None, "NumPy not installed")
+    def test_arrays_match_simulate_plan(self):
+        """Verify the NumPy batch reproduces simulate_plan and is_plan_safe per row."""
+        ForwardModel.USE_NUMPY = True
+        self.assertGreaterEqual(len(self.plans), ForwardModel.NUMPY_MIN_ROWS)
+        self.check_batch()
+
+    def test_assess_plans(self):
+        """Verify one agent's candidates are judged together, in order."""
+        agent = Agent(location_id="A", energy=8)
+        plans = [[Action(ActionType.MOVE, target_id="B")], [Action(ActionType.WAIT)], []]
+        self.assertEqual(ForwardModel.assess_plans(agent, plans, survival_threshold=2.0), [True, True, True])
+        self.assertEqual(ForwardModel.assess_plans(agent, plans), [False, True, True])
+        self.assertEqual(ForwardModel.assess_plans(agent, []), [])
+        mixed = self.plans[:40] # One-step plans take is_plan_safe, the rest one batch
+        self.assertEqual(ForwardModel.assess_plans(agent, mixed), [ForwardModel.is_plan_safe(agent, p) for p in mixed])
+        profiler = StageProfiler()
+        previous = StageProfiler.activate(profiler)
+        try:
+            ForwardModel.assess_plans(agent, plans)
+        finally:
+            StageProfiler.activate(previous)
+        self.assertIn("decide.imagine", profiler.stats())
+
+    def test_choose_move_uses_assess_plans(self):
+        """Verify fallback moves are judged in one batch, one verdict per distinct plan shape."""
+        agent = Agent(location_id="A", energy=10)
+        perception = {"neighbors": ["B", "C", "D"]}
+        with mock.patch.object(ForwardModel, "assess_plans", wraps=ForwardModel.assess_plans) as assess, \
+                mock.patch.object(ForwardModel, "is_plan_safe", wraps=ForwardModel.is_plan_safe) as single:
+            action = AgentMind._choose_move(agent, perception)
+        self.assertEqual(assess.call_count, 1)
+        self.assertEqual([plan[0].target_id for plan in assess.call_args.args[1]], ["B", "C", "D"])
+        self.assertEqual(single.call_count, 1)
+        self.assertIn(action.target_id, perception["neighbors"])
+
+if __name__ == '__main__':
+    unittest.main()
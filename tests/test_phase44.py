@@ -0,0 +1,93 @@
+import os
+import pickle
+import unittest
+from src.entity import Agent
+from src.compact_map import CompactCognitiveMap
+from src.cognitive_map import CognitiveMap
+from src.agent_communication import AgentCommunication
+from src.digest import StateDigest
+from src.scenarios import Scenarios
+from src.sim import Simulation
+from src.memory_probe import MemoryProbe
+
+ENTRIES = {
+    "A": {"neighbors": ["B", "C"], "objects": ["FOOD", "TOOL"], "last_tick": 3,
+          "metadata": {"tools": [{"id": "K", "tool_type": "KEY"}], "obstacles": []}},
+    "B": {"neighbors": ["A"], "objects": ["OBSTACLE", "FOOD", "FOOD"], "requester_id": "agent-1"},
+    "C": {"neighbors": [], "objects": ["ObjectType.COOP_FOOD", "GLOWING"], "metadata": {"tools": [], "obstacles": []}},
+}
+
+class TestPhase44(unittest.TestCase):
+    def test_round_trip(self):
+        """Verify entries read back exactly (order, repeats, unknown tags, side fields) and survive pickling."""
+        cmap = CompactCognitiveMap(ENTRIES)
+        self.assertEqual(cmap.to_dict(), ENTRIES)
+        self.assertEqual(list(cmap), ["A", "B", "C"])
+        self.assertEqual(list(reversed(cmap)), ["C", "B", "A"])
+        self.assertEqual(pickle.loads(pickle.dumps(cmap)).to_dict(), ENTRIES)
+        self.assertTrue(cmap.has_tag("B", "OBSTACLE"))
+        self.assertIsNone(cmap.get("D"))
+        self.assertNotIn("last_tick", cmap["B"])
+
+    def test_view_writes(self):
+        """Verify writes through an entry view re-encode the row; read values are copies."""
+        cmap = CompactCognitiveMap(ENTRIES)
+        entry = cmap["B"]
+        entry["objects"].append("HAZARD") # A copy: no effect
+        entry["neighbors"] = entry["neighbors"] + ["D"]
+        entry["last_tick"] = 9
+        del entry["requester_id"]
+        self.assertEqual(dict(cmap["B"]), {"neighbors": ["A", "D"], "objects": ["OBSTACLE", "FOOD", "FOOD"], "last_tick": 9})
+        cmap["B"] = cmap["A"]
+        self.assertEqual(cmap["B"], ENTRIES["A"])
+
+    def test_cognitive_map_helpers(self):
+        """Verify observe, add_object and map merges work on a compact map and keep the index in step."""
+        agent = Agent(location_id="A")
+        agent.cognitive_map = CompactCognitiveMap()
+        CognitiveMap.observe(agent, "A", ["B"], ["FOOD"], {"tools": [], "obstacles": []}, 1)
+        CognitiveMap.add_object(agent, "B", "HAZARD")
+        AgentCommunication._merge_map(agent, CompactCognitiveMap(ENTRIES))
+        self.assertEqual(agent.cognitive_map["A"]["objects"], ["FOOD", "TOOL"])
+        self.assertEqual(sorted(agent.cognitive_map["A"]["neighbors"]), ["B", "C"])
+        self.assertEqual(agent.cognitive_map["C"]["objects"], ["ObjectType.COOP_FOOD", "GLOWING"])
+
+    def test_interning_scope(self):
+        """Verify each Simulation numbers rooms in its own Interner and leaves other maps alone."""
+        old = CompactCognitiveMap(ENTRIES)
+        first = Scenarios.social(seed=7, log_path=os.devnull, headless=True, agents=2, map_type="compact")
+        second = Scenarios.social(seed=7, log_path=os.devnull, headless=True, agents=2, map_type="compact")
+        self.assertIsNot(first.interner, second.interner)
+        first.tick()
+        self.assertTrue(all(a.cognitive_map.interner is first.interner for a in first.world.agents.values()))
+        new = CompactCognitiveMap({"Z": {"neighbors": ["Y"]}}) # Outside any tick: private tables
+        self.assertNotIn(new.interner, (old.interner, first.interner, second.interner))
+        self.assertEqual(new.interner.names, ["Y"])
+        self.assertEqual(second.interner.names, [])
+        self.assertEqual(old.to_dict(), ENTRIES)
+        AgentCommunication._merge_map(Agent(location_id="Z", cognitive_map=new), old) # Across interners, by name
+        self.assertEqual(new["A"], ENTRIES["A"])
+        with self.assertRaises(ValueError):
+            Simulation(log_path=os.devnull, headless=True, map_type="columns")
+
+    def test_same_run_as_dict_maps(self):
+        """Verify map_type="compact" reproduces the dict-map run tick for tick, in less memory."""
+        for workers in (None, 0):
+            chains, sizes = [], []
+            for map_type in ("dict", "compact"):
+                digest = StateDigest(keep_history=False)
+                sim = Scenarios.scaling(seed=7, log_path=os.devnull, headless=True, agents=60, locations=50,
+                                        objects=30, digest=digest, map_type=map_type, decision_workers=workers)
+                for _ in range(30):
+                    sim.tick()
+                sim.sync_minds()
+                maps = [agent.cognitive_map for agent in sim.world.agents.values()]
+                self.assertTrue(all(type(m) is (dict if map_type == "dict" else CompactCognitiveMap) for m in maps))
+                chains.append(digest.chain)
+                sizes.append(MemoryProbe.deep_sizeof(maps))
+                sim.close()
+            self.assertEqual(chains[0], chains[1])
+            self.assertLess(sizes[1], sizes[0] / 2)
+
+if __name__ == '__main__':
+    unittest.main()
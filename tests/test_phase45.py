@@ -0,0 +1,70 @@
+import os
+import pickle
+import unittest
+from src.entity import Agent
+from src.shared_map import SharedCognitiveMap
+from src.cognitive_map import CognitiveMap
+from src.agent_communication import AgentCommunication
+from src.digest import StateDigest
+from src.scenarios import Scenarios
+from src.memory_probe import MemoryProbe
+
+def agent_with(entries):
+    agent = Agent(location_id="A")
+    agent.cognitive_map = SharedCognitiveMap(entries)
+    return agent
+
+class TestPhase45(unittest.TestCase):
+    def setUp(self):
+        self.sender = agent_with({
+            "A": {"neighbors": ["B"], "objects": ["FOOD"], "last_tick": 1},
+            "B": {"neighbors": ["A", "C"], "objects": [], "last_tick": 1},
+        })
+        self.receiver = agent_with({"B": {"neighbors": ["A", "C"], "objects": ["FOOD"], "last_tick": 1}})
+
+    def test_merge_shares_entries(self):
+        """Verify unknown rooms are adopted by reference, read-only on both sides."""
+        AgentCommunication._merge_map(self.receiver, self.sender.cognitive_map)
+        sent, received = self.sender.cognitive_map, self.receiver.cognitive_map
+        self.assertIs(received.entries["A"], sent.entries["A"])
+        self.assertEqual(list(received), ["B", "A"])
+        self.assertIs(received.entries["B"], sent.entries["B"]) # Equal once merged: shared too
+        with self.assertRaises(TypeError):
+            sent["A"]["objects"] = []
+        sent["A"]["objects"].append("HAZARD") # Nested values read back as copies
+        self.assertEqual(received.entries["A"]["objects"], ["FOOD"])
+        version = self.receiver.map_version
+        AgentCommunication._merge_map(self.receiver, sent)
+        self.assertEqual(self.receiver.map_version, version)
+
+    def test_copy_on_write(self):
+        """Verify writing a shared room gives the writer a private copy."""
+        AgentCommunication._merge_map(self.receiver, self.sender.cognitive_map)
+        CognitiveMap.add_object(self.receiver, "A", "HAZARD")
+        CognitiveMap.observe(self.sender, "A", ["B"], ["FOOD"], {"tools": [], "obstacles": []}, 7)
+        self.assertEqual(self.receiver.cognitive_map["A"]["objects"], ["FOOD", "HAZARD"])
+        self.assertEqual(self.sender.cognitive_map["A"]["objects"], ["FOOD"])
+        self.assertEqual(self.receiver.cognitive_map["A"]["last_tick"], 1)
+        self.assertIsNot(self.receiver.cognitive_map.entries["A"], self.sender.cognitive_map.entries["A"])
+        copy = pickle.loads(pickle.dumps(self.receiver.cognitive_map))
+        self.assertEqual((dict(copy.items()), copy.frozen), (dict(self.receiver.cognitive_map.items()), {"B"}))
+
+    def test_same_run_as_dict_maps(self):
+        """Verify map_type="shared" reproduces the dict-map run tick for tick, in less memory."""
+        chains, sizes = [], []
+        for map_type in ("dict", "shared"):
+            digest = StateDigest(keep_history=False)
+            sim = Scenarios.scaling(seed=7, log_path=os.devnull, headless=True, agents=60, locations=50,
+                                    objects=30, digest=digest, map_type=map_type)
+            for _ in range(30):
+                sim.tick()
+            maps = [agent.cognitive_map for agent in sim.world.agents.values()]
+            self.assertTrue(all(type(m) is (dict if map_type == "dict" else SharedCognitiveMap) for m in maps))
+            chains.append(digest.chain)
+            sizes.append(MemoryProbe.deep_sizeof(maps)) # Shared entries are counted once
+        self.assertEqual(chains[0], chains[1])
+        self.assertLess(sizes[1], sizes[0])
+        self.assertTrue(any(m.frozen for m in maps))
+
+if __name__ == '__main__':
+    unittest.main()
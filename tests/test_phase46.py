@@ -0,0 +1,77 @@
+import os
+import json
+import tempfile
+import unittest
+from src.sim import Simulation
+from src.world import World
+from src.entity import Agent
+from src.cognitive_map import CognitiveMap
+from src.agent_communication import AgentCommunication
+
+def chain(n):
+    return {f"L{i}": {"neighbors": [f"L{j}" for j in (i - 1, i + 1) if 0 <= j < n], "objects": []} for i in range(n)}
+
+class TestPhase46(unittest.TestCase):
+    def setUp(self):
+        self.world = World()
+        self.sender, self.first, self.second = (Agent(location_id="L0") for _ in range(3))
+        self.sender.cognitive_map = chain(10)
+
+    def tearDown(self):
+        AgentCommunication.DELTA_SYNC = True
+
+    def sent_to(self, receiver):
+        return list(receiver.message_queue.pop()["payload"])
+
+    def test_only_changes_since_last_send(self):
+        """Verify each peer gets the whole map first, then only rooms changed since its last update."""
+        self.assertEqual(AgentCommunication.share_map(self.world, self.sender, [self.sender, self.first]), (10, 10))
+        self.assertEqual(len(self.sent_to(self.first)), 10)
+        CognitiveMap.add_object(self.sender, "L4", "FOOD")
+        CognitiveMap.observe(self.sender, "L11", ["L10"], [], {"tools": [], "obstacles": []}, 3)
+        CognitiveMap.add_object(self.sender, "L4", "HAZARD")
+        self.assertEqual(AgentCommunication.share_map(self.world, self.sender, [self.first, self.second]), (13, 22))
+        self.assertEqual(self.sent_to(self.first), ["L11", "L4"]) # In order of last change
+        self.assertEqual(len(self.sent_to(self.second)), 11)
+        AgentCommunication.share_map(self.world, self.sender, [self.first])
+        self.assertEqual(self.sent_to(self.first), [])
+        AgentCommunication.DELTA_SYNC = False
+        AgentCommunication.share_map(self.world, self.sender, [self.first])
+        self.assertEqual(len(self.sent_to(self.first)), 11)
+
+    def test_deltas_converge(self):
+        """Verify merging deltas leaves the receiver with the sender's map."""
+        for step in range(5):
+            CognitiveMap.add_object(self.sender, f"L{step * 2}", "FOOD")
+            CognitiveMap.observe(self.sender, f"N{step}", [f"L{step}"], [], {"tools": [], "obstacles": []}, step)
+            AgentCommunication.share_map(self.world, self.sender, [self.first])
+            AgentCommunication.process_messages(self.first)
+        self.assertEqual(self.first.cognitive_map, self.sender.cognitive_map)
+        self.assertEqual(self.first.map_rooms_merged, 11 + 4 * 2) # Whole map first
+
+    def test_events_report_sizes(self):
+        """Verify COMMUNICATION reports the rooms sent and INFO_UPDATE the merge."""
+        fd, path = tempfile.mkstemp(suffix=".log")
+        os.close(fd)
+        try:
+            sim = Simulation(log_path=path)
+            for i in range(10):
+                sim.world.add_location(f"L{i}", chain(10)[f"L{i}"]["neighbors"])
+            self.first.energy = 100
+            sim.world.add_entity(self.sender)
+            sim.world.add_entity(self.first)
+            sim._handle_communication(self.sender, "MAP")
+            sim._handle_communication(self.sender, "MAP")
+            sim.tick()
+            with open(path) as f:
+                events = [json.loads(line) for line in f]
+            sizes = [(e["payload_size"], e["full_payload_size"]) for e in events if e["type"] == "COMMUNICATION"]
+            self.assertEqual(sizes[:2], [(10, 10), (0, 10)])
+            info = next(e for e in events if e["type"] == "INFO_UPDATE" and e["agent_id"] == self.first.id)
+            self.assertEqual((info["msgs"], info["merged_rooms"]), (2, 10))
+            self.assertGreater(info["merge_ms"], 0)
+        finally:
+            os.remove(path)
+
+if __name__ == '__main__':
+    unittest.main()
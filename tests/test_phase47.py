@@ -0,0 +1,83 @@
+import os
+import unittest
+from src.world import World
+from src.entity import Agent
+from src.message_bus import MessageBus
+from src.scenarios import Scenarios
+from src.sim import Simulation
+
+class TestPhase47(unittest.TestCase):
+    def setUp(self):
+        # Line of rooms A - B - C - D - E
+        self.world = World()
+        rooms = ["A", "B", "C", "D", "E"]
+        for i, loc in enumerate(rooms):
+            self.world.add_location(loc, [rooms[j] for j in (i - 1, i + 1) if 0 <= j < len(rooms)])
+        self.agents = {}
+        for agent_id, loc in [("Me", "A"), ("Mate", "A"), ("Near", "C"), ("Far", "E")]:
+            self.agents[agent_id] = Agent(id=agent_id, location_id=loc)
+            self.world.add_entity(self.agents[agent_id])
+        self.me = self.agents["Me"]
+        self.bus = MessageBus()
+
+    def ids(self, scope, radius=1):
+        return [a.id for a in self.bus.receivers(self.world, self.me, scope, radius)]
+
+    def test_scopes(self):
+        """Verify room, radius, trusted and all scopes, in World order, without the sender."""
+        self.assertEqual(self.ids(MessageBus.ROOM), ["Mate"])
+        self.assertEqual(self.ids(MessageBus.RADIUS, 2), ["Mate", "Near"])
+        self.assertEqual(self.ids(MessageBus.ALL), ["Mate", "Near", "Far"])
+        self.me.trust_scores = {"Far": 0.9, "Near": 0.2}
+        self.assertEqual(self.ids(MessageBus.TRUSTED), ["Far"])
+        with self.assertRaises(ValueError):
+            self.ids("everywhere")
+
+    def test_dead_agents_skipped(self):
+        """Verify dead agents receive nothing, whatever the scope."""
+        self.agents["Mate"].is_alive = False
+        self.me.trust_scores = {"Mate": 1.0}
+        self.assertEqual(self.ids(MessageBus.ROOM), [])
+        self.assertEqual(self.ids(MessageBus.TRUSTED), [])
+        self.assertEqual(self.ids(MessageBus.ALL), ["Near", "Far"])
+
+    def test_publish_stores_once(self):
+        """Verify ALARM defaults to a 3-hop radius and every receiver holds the same message."""
+        delivered = self.bus.publish(self.world, self.me, "ALARM", {"location_id": "A"})
+        self.assertEqual(delivered, 2)
+        mate, near = self.agents["Mate"].message_queue, self.agents["Near"].message_queue
+        self.assertIs(mate[0], near[0])
+        self.assertEqual(self.agents["Far"].message_queue, [])
+        self.bus.publish(self.world, self.me, "STORY", {}, to=[self.agents["Far"]])
+        self.assertEqual(self.bus.tick_stats, {"ALARM": [1, 2], "STORY": [1, 1]})
+        self.bus.begin_tick()
+        self.bus.record("MAP_UPDATE", 3)
+        self.assertEqual(self.bus.tick_stats, {"MAP_UPDATE": [1, 3]})
+        self.assertEqual((self.bus.published, self.bus.delivered), (3, 6))
+
+    def test_targeted_sends(self):
+        """Verify targeted sends skip dead agents and the sender, and only deliveries are counted."""
+        self.agents["Mate"].is_alive = False
+        self.assertEqual(self.bus.publish(self.world, self.me, "STORY", {}, to=[self.agents["Mate"], self.me]), 0)
+        self.assertEqual(self.agents["Mate"].message_queue, [])
+        sim = Simulation(log_path=os.devnull, headless=True)
+        sim.world = self.world
+        sim._handle_communication(self.me, "Me")   # Map share to itself
+        sim._handle_communication(self.me, "Mate") # ... and to a dead agent
+        self.assertEqual(sim.message_bus.tick_stats, {})
+        sim._handle_communication(self.me, "Far")
+        self.assertEqual(sim.message_bus.tick_stats, {"MAP_UPDATE": [1, 1]})
+        self.assertEqual(len(self.agents["Far"].message_queue), 1)
+
+    def test_run_summary(self):
+        """Verify a run reports the bus totals."""
+        sim = Scenarios.social(seed=7, log_path=os.devnull, headless=True, agents=30)
+        for _ in range(20):
+            sim.tick()
+        summary = sim.summary()
+        self.assertGreater(summary["messages_delivered"], 0)
+        self.assertEqual((summary["messages_sent"], summary["messages_delivered"]),
+                         (sim.message_bus.published, sim.message_bus.delivered))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -40,7 +40,7 @@ class TestPhase7(unittest.TestCase):
         # Perception showing critical hunger
         perception = AgentMind.perceive(self.sim.world, agent)
         agent.energy = 10 # Force hunger AFTER perception for the test or use modified perception
-        perception["energy"] = 10
+        perception = perception.replace(energy=10) # Perceptions are immutable (Phase 33)
         
         # Decide should trigger GoalManager -> Goal Switch -> Clear Queue
         AgentMind.decide(agent, perception)